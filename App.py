@@ -1,7 +1,43 @@
 import streamlit as st
 import pandas as pd
-import hashlib
-import random
+import numpy as np
+import asyncio
+import html
+import os
+
+from anonymize import (
+    build_count_cube,
+    dataset_columns,
+    generalize_age_series,
+    generalize_zip_series,
+    global_recoding_summary,
+    load_dataset,
+    mondrian_partition,
+    rollup_privacy_metrics,
+    search_generalization,
+)
+from he_packing import compare_paillier as compare_packing_paillier
+from he_packing import compare_toy as compare_packing_toy
+from he_server import run_demo as run_aggregation_demo
+from linkage import LINK_METHODS, link_files
+from paillier import RandomnessPool
+from paillier import benchmark as benchmark_paillier
+from paillier import generate_keypair as generate_paillier_keypair
+from pseudonym import (
+    collision_probability,
+    make_pseudo_id,
+    mask_name,
+    mask_phone,
+    mask_rrn,
+    pseudo_key_column_to_hex,
+    pseudonymize_frame,
+)
+from pseudonym_stream import DEFAULT_CHUNK_ROWS, run_pipeline
+from pseudonym_vault import PseudonymVault
+from risk_sketch import RiskSketch
+from synthetic_data import generate as generate_synthetic
+from toy_he import benchmark as benchmark_toy_he
+from toy_he import random_r
 
 # -------------------------------------------------
 # 기본 설정 & 공통 스타일
@@ -86,6 +122,32 @@ code {
 """
 st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
 
+# -------------------------------------------------
+# 서버 파일 경로 (1탭 ⑤ 스트리밍 · ⑥ 결합 카드)
+#  화면에서 입력한 경로는 APP_DATA_DIR(기본 ./data) 안의 CSV/Parquet 파일로만 쓴다.
+#  realpath로 ../ · 절대 경로 · 심볼릭 링크를 풀어 폴더 밖을 가리키면 거부한다.
+# -------------------------------------------------
+DATA_DIR = os.path.realpath(os.environ.get("APP_DATA_DIR", "data"))
+DATA_SUFFIXES = (".csv", ".parquet", ".pq")
+
+
+def data_path(name: str) -> str:
+    """데이터 폴더 기준 파일 이름을 실제 경로로 바꾼다. 폴더 밖이거나 CSV/Parquet이 아니면 ValueError."""
+    path = os.path.realpath(os.path.join(DATA_DIR, name.strip()))
+    if path == DATA_DIR or os.path.commonpath([path, DATA_DIR]) != DATA_DIR:
+        raise ValueError(f"데이터 폴더({DATA_DIR}) 안의 파일만 사용할 수 있습니다: {name}")
+    if not path.lower().endswith(DATA_SUFFIXES):
+        raise ValueError(f"CSV 또는 Parquet 파일만 사용할 수 있습니다: {name}")
+    return path
+
+
+def require_columns(path: str, columns) -> None:
+    """파일 머리글에 columns가 모두 있는지 확인한다. 빠진 컬럼이 있으면 ValueError."""
+    header = set(dataset_columns(path, path))
+    missing = [c for c in columns if c and c not in header]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)}에 없는 컬럼: {', '.join(missing)}")
+
 # -------------------------------------------------
 # 상단 타이틀 + 전체 학습 가이드
 # -------------------------------------------------
@@ -179,29 +241,18 @@ with tab1:
         st.caption("같은 주민번호라도 salt를 바꾸면 다른 가명 ID가 생성됩니다.")
         st.markdown("</div>", unsafe_allow_html=True)
 
-    # 함수 정의
-    def mask_name(n: str) -> str:
-        if len(n) <= 1:
-            return "*"
-        return n[0] + "*" * (len(n) - 1)
-
-    def mask_rrn(r: str) -> str:
-        if len(r) >= 8:
-            return r[:8] + "******"
-        return r
-
-    def mask_phone(p: str) -> str:
-        if "-" in p:
-            parts = p.split("-")
-            if len(parts) == 3:
-                return f"{parts[0]}-****-{parts[2]}"
-        if len(p) > 4:
-            return "*" * (len(p) - 4) + p[-4:]
-        return p
-
-    def make_pseudo_id(text: str, salt_value: str = "") -> str:
-        base = (text + salt_value).encode("utf-8")
-        return hashlib.sha256(base).hexdigest()
+    # 가명 ID 저장 형식 → 압축 키 바이트 수 (None이면 64자 hex 문자열)
+    PSEUDO_ID_FORMATS = {
+        "hex 문자열(64자)": None,
+        "8바이트 키(uint64)": 8,
+        "16바이트 키": 16,
+        "32바이트 다이제스트": 32,
+    }
+
+    @st.cache_resource
+    def open_vault(salt_value: str, version: str) -> PseudonymVault:
+        # 세션이 바뀌어도 같은 (salt, 버전)이면 같은 금고·LRU 캐시를 공유
+        return PseudonymVault("pseudonym_vault.db", salt_value, version)
 
     # 실행 영역
     st.markdown('<div class="card">', unsafe_allow_html=True)
@@ -235,6 +286,184 @@ with tab1:
         st.caption("버튼을 눌러 가명처리 결과를 확인해 보세요.")
     st.markdown("</div>", unsafe_allow_html=True)
 
+    # 대량 가명처리 (CSV 일괄 처리)
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**④ 대량 가명처리 (CSV 파일 일괄 처리)**")
+    st.caption("위 ③과 같은 규칙을 컬럼 단위로 한 번에 적용합니다. 수백만 행도 수 초 안에 처리됩니다.")
+    bulk_file = st.file_uploader("고객 데이터 CSV 업로드", type=["csv"], key="bulk_csv")
+    if bulk_file is not None:
+        bulk_df = pd.read_csv(bulk_file, dtype=str, keep_default_na=False)
+        col_options = ["(없음)"] + list(bulk_df.columns)
+        col_n, col_r, col_p = st.columns(3)
+        with col_n:
+            bulk_name_col = st.selectbox("이름 컬럼", col_options, key="bulk_name_col")
+        with col_r:
+            bulk_rrn_col = st.selectbox("주민번호 컬럼", col_options, key="bulk_rrn_col")
+        with col_p:
+            bulk_phone_col = st.selectbox("전화번호 컬럼", col_options, key="bulk_phone_col")
+
+        add_pseudo_id = st.checkbox(
+            "주민번호+전화번호로 가명 ID 컬럼 추가 (위 ②의 salt 사용, 멀티코어 해시)",
+            value=True,
+            disabled=bulk_rrn_col == "(없음)" or bulk_phone_col == "(없음)",
+        )
+        id_format = st.radio(
+            "가명 ID 저장 형식",
+            list(PSEUDO_ID_FORMATS),
+            horizontal=True,
+            help="압축 키는 SHA-256 결과의 앞부분만 고정 폭 바이너리로 보관해 메모리를 줄이고 조인을 빠르게 합니다.",
+        )
+        id_width = PSEUDO_ID_FORMATS[id_format]
+        if id_width is not None:
+            st.caption(
+                f"※ {id_width}바이트 키 충돌 확률(근사): 100만 명 {collision_probability(10**6, id_width):.1e} · "
+                f"1억 명 {collision_probability(10**8, id_width):.1e}"
+            )
+        col_v1, col_v2 = st.columns([2, 1])
+        with col_v1:
+            use_vault = st.checkbox("가명 ID 금고(vault) 사용 – 이전 실행에서 본 사람은 조회로 같은 ID 재사용", value=False)
+        with col_v2:
+            salt_version = st.text_input("salt 버전", value="v1", disabled=not use_vault)
+
+        if st.button("📦 전체 행 마스킹 실행"):
+            with_id = add_pseudo_id and bulk_rrn_col != "(없음)" and bulk_phone_col != "(없음)"
+            vault = open_vault(salt, salt_version) if with_id and use_vault else None
+            masked_df = pseudonymize_frame(
+                bulk_df,
+                name_col=None if bulk_name_col == "(없음)" else bulk_name_col,
+                rrn_col=None if bulk_rrn_col == "(없음)" else bulk_rrn_col,
+                phone_col=None if bulk_phone_col == "(없음)" else bulk_phone_col,
+                salt_value=salt,
+                id_col="가명ID" if with_id else None,
+                id_width=id_width,
+                vault=vault,
+            )
+            if vault is not None:
+                vault_stats = vault.stats()
+                st.caption(
+                    f"금고 통계 · 캐시 적중 {vault_stats['cache_hits']:,} · 디스크 적중 {vault_stats['disk_hits']:,} · "
+                    f"신규 해시 {vault_stats['misses']:,} · LRU 방출 {vault_stats['evictions']:,} · "
+                    f"적중률 {vault_stats['hit_rate']:.1%}"
+                )
+            st.write(f"총 {len(masked_df):,}행 처리 완료 (미리보기: 앞 100행)")
+            if with_id:
+                st.caption(f"가명 ID 컬럼 메모리: {masked_df['가명ID'].memory_usage(deep=True) / 1024**2:,.1f} MB")
+            export_df = masked_df.copy()
+            if with_id:
+                export_df["가명ID"] = pseudo_key_column_to_hex(masked_df["가명ID"])
+            st.dataframe(export_df.head(100), use_container_width=True)
+            st.download_button(
+                "⬇️ 마스킹 결과 CSV 다운로드",
+                export_df.to_csv(index=False).encode("utf-8-sig"),
+                file_name="masked.csv",
+                mime="text/csv",
+            )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # 대용량 파일 스트리밍 가명처리
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**⑤ 대용량 파일 스트리밍 가명처리 (서버에 있는 CSV/Parquet)**")
+    st.caption(
+        "파일을 청크 단위로 읽고 → 가명처리하고 → 바로 이어 써서, 파일이 메모리보다 커도 "
+        "메모리 사용량이 일정합니다. 같은 작업을 `python pseudonym_stream.py 입력 출력 --rrn-col ...`로 "
+        "화면 없이 실행할 수도 있습니다."
+    )
+    st.caption(f"파일 이름은 서버의 데이터 폴더(`{DATA_DIR}`) 기준입니다. 폴더 밖의 파일은 읽거나 쓸 수 없습니다.")
+    col_in, col_out = st.columns(2)
+    with col_in:
+        stream_in = st.text_input("입력 파일 (데이터 폴더 기준)", value="customers.csv")
+    with col_out:
+        stream_out = st.text_input("출력 파일 (데이터 폴더 기준)", value="customers_pseudo.parquet")
+    col_sn, col_sr, col_sp, col_sc = st.columns(4)
+    with col_sn:
+        stream_name_col = st.text_input("이름 컬럼", value="이름", key="stream_name_col")
+    with col_sr:
+        stream_rrn_col = st.text_input("주민번호 컬럼", value="주민번호", key="stream_rrn_col")
+    with col_sp:
+        stream_phone_col = st.text_input("전화번호 컬럼", value="전화번호", key="stream_phone_col")
+    with col_sc:
+        stream_chunk_rows = st.number_input("청크 행 수", min_value=1_000, value=DEFAULT_CHUNK_ROWS, step=50_000)
+
+    if st.button("🚚 스트리밍 가명처리 실행"):
+        try:
+            stream_in_path = data_path(stream_in)
+            stream_out_path = data_path(stream_out)
+            if stream_in_path == stream_out_path:
+                raise ValueError("입력 파일과 출력 파일이 같습니다. 다른 출력 파일 이름을 입력하세요.")
+            if not os.path.exists(stream_in_path):
+                raise ValueError(f"입력 파일을 찾을 수 없습니다: {stream_in}")
+            require_columns(stream_in_path, [stream_name_col, stream_rrn_col, stream_phone_col])
+        except ValueError as exc:
+            st.error(str(exc))
+        else:
+            os.makedirs(os.path.dirname(stream_out_path), exist_ok=True)
+            progress_bar = st.progress(0.0, text="준비 중...")
+            total_rows = run_pipeline(
+                stream_in_path,
+                stream_out_path,
+                name_col=stream_name_col or None,
+                rrn_col=stream_rrn_col or None,
+                phone_col=stream_phone_col or None,
+                salt_value=salt,
+                chunk_rows=int(stream_chunk_rows),
+                on_progress=lambda n, p: progress_bar.progress(p, text=f"{n:,}행 처리 중..."),
+            )
+            progress_bar.progress(1.0, text="완료")
+            st.success(f"총 {total_rows:,}행을 처리해 데이터 폴더의 `{stream_out}`에 저장했습니다.")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # 가명 데이터 결합
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**⑥ 가명 데이터 결합 (같은 salt로 만든 두 파일을 가명 ID로 연결)**")
+    st.caption(
+        "주민번호를 공유하지 않아도, 같은 salt로 만든 가명 ID끼리는 값이 같으므로 두 기관의 데이터를 "
+        "이어 붙일 수 있습니다. 이것이 가명처리에 salt·해시를 쓰는 이유입니다."
+    )
+    st.caption(f"파일 이름은 서버의 데이터 폴더(`{DATA_DIR}`) 기준입니다.")
+    col_l, col_r = st.columns(2)
+    with col_l:
+        link_left = st.text_input("왼쪽 파일 (데이터 폴더 기준)", value="customers_pseudo.parquet")
+    with col_r:
+        link_right = st.text_input("오른쪽 파일 (데이터 폴더 기준)", value="claims_pseudo.parquet")
+    col_id, col_m = st.columns(2)
+    with col_id:
+        link_id_col = st.text_input("가명 ID 컬럼", value="가명ID")
+    with col_m:
+        link_method = st.radio(
+            "결합 방식",
+            LINK_METHODS,
+            format_func=lambda m: {"hash": "해시 조인", "sort": "정렬-병합 조인"}[m],
+            horizontal=True,
+        )
+
+    if st.button("🔗 가명 ID로 결합"):
+        try:
+            link_paths = [data_path(name) for name in (link_left, link_right)]
+            missing = [name for name, path in zip((link_left, link_right), link_paths) if not os.path.exists(path)]
+            if missing:
+                raise ValueError(f"파일을 찾을 수 없습니다: {', '.join(missing)}")
+            for path in link_paths:
+                require_columns(path, [link_id_col])
+            # 가명 ID가 16진수가 아니거나 너무 짧은 값도 ValueError로 알려 준다
+            linked_df, link_stats = link_files(*link_paths, link_id_col, link_method)
+        except ValueError as exc:
+            st.error(str(exc))
+        else:
+            col_s1, col_s2, col_s3 = st.columns(3)
+            col_s1.metric("왼쪽 행 수", f"{link_stats['left_rows']:,}")
+            col_s2.metric("오른쪽 행 수", f"{link_stats['right_rows']:,}")
+            col_s3.metric("결합된 쌍", f"{link_stats['matched_pairs']:,}")
+            st.caption(
+                f"결합된 왼쪽 행 {link_stats['matched_left_rows']:,} · 오른쪽 행 {link_stats['matched_right_rows']:,} · "
+                f"앞 8바이트 충돌로 제외된 쌍 {link_stats['prefix_collisions']:,}"
+            )
+            st.dataframe(
+                pd.DataFrame({"단계": list(link_stats["seconds"]), "시간(초)": list(link_stats["seconds"].values())}),
+                use_container_width=True,
+            )
+            st.dataframe(linked_df.head(100), use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
     # 미니 퀴즈
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("**🧩 미니 퀴즈: 해시와 가명처리 이해 점검**")
@@ -286,9 +515,13 @@ with tab2:
             - **익명·비식별화**: 개별 인물을 특정하기 어렵도록 정보(나이, 주소 등)를 일반화하거나 제거하는 것  
             - **준식별자**: 단독으로는 애매하지만, 몇 개 조합하면 개인을 추론할 수 있는 정보 (나이, 성별, 우편번호 등)  
             - **k-익명성**: 어떤 속성 조합에 속한 사람이 최소 k명 이상이면, 그 중 누가 누구인지 알아보기 어려운 상태  
+            - **l-다양성**: 같은 그룹 안에 민감 정보(질병)가 최소 l가지 이상 섞여 있어, 그룹만으로 질병을 특정하기 어려운 상태  
+            - **t-근접성**: 각 그룹의 민감 정보 분포가 전체 분포와 t 이내로 비슷해, 그룹 소속만으로 새로 알게 되는 것이 적은 상태  
             """
         )
 
+    DETAIL_PREVIEW_ROWS = 1_000
+
     # 예시 데이터
     raw_data = pd.DataFrame(
         {
@@ -309,10 +542,85 @@ with tab2:
         }
     )
 
+    # 원본 행은 여기서 한 번만 훑고, 이후 화면은 집계 큐브와 미리보기 행만 사용
+    @st.cache_data(max_entries=4)
+    def cached_dataset(dataset_key: str, _source, filename, age_col: str, zip_col: str, sensitive_col: str):
+        df = _source if filename is None else load_dataset(_source, filename, [age_col], [zip_col, sensitive_col])
+        cube = build_count_cube(df, age_col, zip_col, sensitive_col=sensitive_col)
+        return cube, df.head(DETAIL_PREVIEW_ROWS), len(df)
+
+    @st.cache_data(max_entries=4)
+    def cached_synthetic(n_rows: int, seed: int):
+        df = generate_synthetic(n_rows, seed)
+        cube = build_count_cube(df, sensitive_col="질병")
+        return cube, df.head(DETAIL_PREVIEW_ROWS), len(df)
+
     st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown("**① 원본 데이터 (작은 의료 데이터 예시)**")
-    st.dataframe(raw_data, use_container_width=True)
-    st.caption("※ 실제 의료 데이터는 훨씬 더 크고, 더 많은 속성을 포함합니다.")
+    st.markdown("**① 원본 데이터**")
+    data_source = st.radio(
+        "데이터 선택",
+        ["작은 의료 데이터 예시", "내 파일 업로드 (CSV/Parquet)", "합성 데이터 (부하 테스트)"],
+        horizontal=True,
+    )
+    age_col, zip_col, sensitive_col = "나이", "우편번호", "질병"
+    dataset = None
+    dataset_key = "raw_data"
+    if data_source.startswith("내 파일"):
+        anon_file = st.file_uploader("CSV 또는 Parquet 파일", type=["csv", "parquet"], key="anon_file")
+        if anon_file is not None:
+            file_cols = dataset_columns(anon_file, anon_file.name)
+            col_q1, col_q2, col_s = st.columns(3)
+            with col_q1:
+                up_age_col = st.selectbox("준식별자 ① 숫자 구간화 (예: 나이)", file_cols, index=0)
+            with col_q2:
+                up_zip_col = st.selectbox(
+                    "준식별자 ② 앞자리 보존 (예: 우편번호)", file_cols, index=min(1, len(file_cols) - 1)
+                )
+            with col_s:
+                up_sensitive_col = st.selectbox("민감 속성 (예: 질병)", file_cols, index=min(2, len(file_cols) - 1))
+            if len({up_age_col, up_zip_col, up_sensitive_col}) < 3:
+                st.error("준식별자 두 개와 민감 속성은 서로 다른 컬럼이어야 합니다. 예시 데이터로 계속합니다.")
+            else:
+                try:
+                    upload_key = f"{anon_file.file_id}:{anon_file.size}"
+                    dataset = cached_dataset(
+                        upload_key,
+                        anon_file,
+                        anon_file.name,
+                        up_age_col,
+                        up_zip_col,
+                        up_sensitive_col,
+                    )
+                    age_col, zip_col, sensitive_col = up_age_col, up_zip_col, up_sensitive_col
+                    dataset_key = upload_key
+                except ValueError as exc:
+                    st.error(f"파일을 읽을 수 없습니다: {exc}")
+            st.caption(
+                "※ 고른 세 컬럼만 열 단위로 읽고, 문자열은 범주형·숫자는 가장 좁은 정수형으로 저장해 "
+                "큰 파일도 메모리에 들어갑니다. ②번 컬럼은 앞자리 0을 지키도록 문자열로 읽습니다."
+            )
+    if data_source.startswith("합성"):
+        col_rows, col_seed = st.columns(2)
+        with col_rows:
+            synthetic_rows = st.select_slider(
+                "행 수", options=[100_000, 1_000_000, 5_000_000], value=100_000, format_func="{:,}".format
+            )
+        with col_seed:
+            synthetic_seed = st.number_input("seed", min_value=0, value=0, step=1)
+        dataset = cached_synthetic(synthetic_rows, int(synthetic_seed))
+        dataset_key = f"synthetic:{synthetic_rows}:{synthetic_seed}"
+        st.caption(
+            "※ 인구 피라미드 모양의 나이, 일부 동네에 몰린 우편번호, 나이대별 질병 분포와 희귀질환을 가진 가짜 데이터입니다. "
+            "같은 seed면 언제나 같은 데이터가 나오며, 더 큰 파일은 `python synthetic_data.py 출력.parquet --rows 100000000`으로 만들 수 있습니다."
+        )
+    if dataset is None:
+        dataset = cached_dataset(dataset_key, raw_data, None, age_col, zip_col, sensitive_col)
+    count_cube, preview_df, n_rows = dataset
+    st.dataframe(preview_df, use_container_width=True)
+    if n_rows > len(preview_df):
+        st.caption(f"전체 {n_rows:,}행 중 앞 {len(preview_df):,}행 · 서로 다른 (준식별자, 민감 속성) 조합 {len(count_cube):,}개")
+    else:
+        st.caption("※ 실제 의료 데이터는 훨씬 더 크고, 더 많은 속성을 포함합니다.")
     st.markdown("</div>", unsafe_allow_html=True)
 
     # 설정
@@ -337,46 +645,30 @@ with tab2:
     st.caption("※ 나이 구간을 넓게 하고 우편번호 자릿수를 줄일수록 그룹이 커지고 k 값이 커지는 경향이 있습니다.")
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # 일반화 함수
-    def generalize_age(age: int, group_size: int) -> str:
-        base = (age // group_size) * group_size
-        return f"{base}~{base + group_size - 1}"
-
-    def generalize_zip(zipcode: str, keep: int) -> str:
-        if len(zipcode) <= keep:
-            return zipcode
-        return zipcode[:keep] + "*" * (len(zipcode) - keep)
-
-    anon_df = raw_data.copy()
-    anon_df["나이_구간"] = anon_df["나이"].apply(lambda x: generalize_age(x, age_group_size))
-    anon_df["우편번호_일반화"] = anon_df["우편번호"].apply(lambda x: generalize_zip(x, zip_keep))
-
-    group_cols = ["나이_구간", "우편번호_일반화"]
-    group_k = (
-        anon_df.groupby(group_cols)
-        .size()
-        .reset_index(name="k")
-        .sort_values("k", ascending=False)
-    )
+    # 슬라이더 변경 시에는 원본 행이 아니라 집계 큐브만 다시 합산
+    qi_cols = {"age_col": age_col, "zip_col": zip_col}
+    age_label, zip_label = f"{age_col}_구간", f"{zip_col}_일반화"
+    group_k = rollup_privacy_metrics(count_cube, age_group_size, zip_keep, sensitive_col, **qi_cols)
     min_k = int(group_k["k"].min())
 
-    # k가 작으면 자동 보정
+    # k가 작으면 자동 보정: 일반화 격자에서 목표 k를 만족하는 가장 덜 일반화된 설정을 탐색
     target_k = 3
     auto_adjusted = False
+    search_result = None
     if min_k < target_k:
+        search_result = search_generalization(count_cube, target_k, count_col="n", **qi_cols)
+    if search_result is not None:
         auto_adjusted = True
-        age_group_size = max(age_group_size, 15)
-        zip_keep = min(zip_keep, 2)
-        anon_df["나이_구간"] = anon_df["나이"].apply(lambda x: generalize_age(x, age_group_size))
-        anon_df["우편번호_일반화"] = anon_df["우편번호"].apply(lambda x: generalize_zip(x, zip_keep))
-        group_k = (
-            anon_df.groupby(group_cols)
-            .size()
-            .reset_index(name="k")
-            .sort_values("k", ascending=False)
-        )
+        age_group_size = search_result["age_group_size"]
+        zip_keep = search_result["zip_keep"]
+        group_k = rollup_privacy_metrics(count_cube, age_group_size, zip_keep, sensitive_col, **qi_cols)
         min_k = int(group_k["k"].min())
 
+    # 상세 테이블은 화면에 보여 줄 앞부분만 일반화
+    anon_df = preview_df.copy()
+    anon_df[age_label] = generalize_age_series(anon_df[age_col], age_group_size)
+    anon_df[zip_label] = generalize_zip_series(anon_df[zip_col], zip_keep)
+
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("**③ 익명화(일반화) 결과 – 그룹별 k 값**")
 
@@ -385,36 +677,158 @@ with tab2:
             f"초기 설정에서 일부 그룹의 k 값이 {target_k} 미만이라, 자동으로 나이 구간과 우편번호 자릿수를 조정했습니다.\n"
             f"→ 현재 기준: 나이 {age_group_size}살 단위, 우편번호 앞 {zip_keep}자리"
         )
+        st.caption(
+            f"일반화 격자 {search_result['lattice_size']}개 설정 중 {search_result['evaluations']}개만 직접 계산했습니다 "
+            f"(k-익명성의 단조성으로 나머지는 추론). 목표 k를 만족하는 경계: "
+            + ", ".join(f"{a}살·{z}자리" for a, z in search_result["frontier"])
+        )
+    elif min_k < target_k:
+        st.error(f"어떤 일반화 설정으로도 k ≥ {target_k}를 만족할 수 없습니다 (데이터가 너무 적음).")
 
-    for _, row in group_k.iterrows():
-        k_val = int(row["k"])
-        age_r = row["나이_구간"]
-        zip_r = row["우편번호_일반화"]
-
-        if k_val < 3:
-            badge = f"<span class='k-badge-small'>k={k_val}</span>"
-        elif k_val < 5:
-            badge = f"<span class='k-badge-mid'>k={k_val}</span>"
-        else:
-            badge = f"<span class='k-badge-good'>k={k_val}</span>"
+    # 그룹 목록은 한 번에 HTML 문자열로 만들어 하나의 요소로 보낸다 (그룹 수만큼 st.markdown 호출 X)
+    def render_group_badges(groups: pd.DataFrame) -> str:
+        if groups.empty:
+            return ""
+        k_vals = groups["k"].to_numpy()
+        badge_cls = np.select([k_vals < 3, k_vals < 5], ["k-badge-small", "k-badge-mid"], "k-badge-good")
+        k_str = groups["k"].astype(str)
+        lines = (
+            f'<div style="margin-bottom:8px;"><b>{html.escape(age_col)} 구간:</b> '
+            + groups[age_label].astype(str).map(html.escape)
+            + f" &nbsp; | &nbsp; <b>{html.escape(zip_col)}:</b> "
+            + groups[zip_label].astype(str).map(html.escape)
+            + " &nbsp; | &nbsp; <b>그룹 크기:</b> <span class='"
+            + pd.Series(badge_cls, index=groups.index)
+            + "'>k="
+            + k_str
+            + "</span> &nbsp; | &nbsp; <b>l:</b> "
+            + groups["l_distinct"].astype(str)
+            + " (엔트로피 "
+            + groups["l_entropy"].map("{:.2f}".format)
+            + ") &nbsp; | &nbsp; <b>t:</b> "
+            + groups["t"].map("{:.2f}".format)
+            + "</div>"
+        )
+        return "".join(lines.tolist())
 
-        st.markdown(
-            f"""
-            <div style="margin-bottom:8px;">
-                <b>나이 구간:</b> {age_r} &nbsp; | &nbsp;
-                <b>우편번호:</b> {zip_r} &nbsp; | &nbsp;
-                <b>그룹 크기:</b> {badge}
-            </div>
-            """,
-            unsafe_allow_html=True,
+    n_groups = len(group_k)
+    col_view, col_size = st.columns([2, 1])
+    with col_view:
+        group_view = st.radio(
+            "그룹 목록 보기",
+            ["위험한 그룹부터 (k가 작은 순)", "전체 목록 (페이지)"],
+            horizontal=True,
         )
+    with col_size:
+        page_size = st.selectbox("한 번에 보여 줄 그룹 수", [20, 50, 100], index=1)
+
+    if group_view.startswith("위험한"):
+        shown_groups = group_k.sort_values(["k", "l_distinct"], kind="stable").head(page_size)
+        st.caption(f"전체 {n_groups:,}개 그룹 중 k가 가장 작은 {len(shown_groups):,}개")
+    else:
+        n_pages = max(1, -(-n_groups // page_size))
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+        shown_groups = group_k.iloc[(page - 1) * page_size : page * page_size]
+        st.caption(f"전체 {n_groups:,}개 그룹 · {page}/{n_pages} 페이지")
+    st.markdown(render_group_badges(shown_groups), unsafe_allow_html=True)
 
     st.success(f"🔒 최종 최소 k 값: **{min_k}** (k가 클수록 재식별 위험이 낮습니다)")
+    st.info(
+        f"🩺 최소 l-다양성: **{int(group_k['l_distinct'].min())}** "
+        f"(엔트로피 l {group_k['l_entropy'].min():.2f}) · 최대 t-근접성 거리: **{group_k['t'].max():.2f}**\n\n"
+        "l은 한 그룹 안의 서로 다른 질병 수로, 작으면 그룹만 알아도 질병을 짐작할 수 있습니다. "
+        "t는 그룹의 질병 분포가 전체 분포와 얼마나 다른지(0~1)로, 클수록 그룹 소속만으로 새로운 정보가 드러납니다."
+    )
     with st.expander("📊 익명화된 상세 데이터 테이블"):
+        if n_rows > len(anon_df):
+            st.caption(f"전체 {n_rows:,}행 중 앞 {len(anon_df):,}행 미리보기")
+        st.dataframe(
+            anon_df[[age_label, zip_label, sensitive_col]],
+            use_container_width=True,
+        )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Mondrian 다차원 분할 비교
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**④ 다른 방식과 비교: Mondrian 다차원 분할**")
+    st.caption(
+        "고정 폭 구간(전역 재코딩)은 데이터가 몰린 곳과 드문 곳을 똑같이 넓게 묶습니다. "
+        "Mondrian은 중앙값에서 반씩 잘라 가며, 양쪽이 모두 k명 이상일 때만 나누므로 "
+        "같은 k에서 정보 손실이 더 적은 경우가 많습니다."
+    )
+    # Mondrian 분할은 슬라이더와 무관하므로 데이터셋 · 컬럼 조합마다 한 번만 계산
+    @st.cache_data(max_entries=4)
+    def cached_mondrian(dataset_key: str, _cube: pd.DataFrame, k: int, age_col: str, zip_col: str):
+        return mondrian_partition(_cube, k, age_col=age_col, zip_col=zip_col)
+
+    mondrian_result = cached_mondrian(dataset_key, count_cube, target_k, **qi_cols)
+    if mondrian_result is None:
+        st.error(f"전체 인원이 {target_k}명보다 적어 Mondrian 분할을 할 수 없습니다.")
+    else:
+        mondrian_table, mondrian_summary = mondrian_result
+        global_summary = global_recoding_summary(count_cube, age_group_size, zip_keep, **qi_cols)
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "방식": [f"전역 재코딩 (나이 {age_group_size}살 · 우편번호 {zip_keep}자리)", "Mondrian 다차원 분할"],
+                    "최소 k": [global_summary["min_k"], mondrian_summary["min_k"]],
+                    "동질 집합 수": [global_summary["classes"], mondrian_summary["classes"]],
+                    "정보 손실(NCP)": [f"{global_summary['ncp']:.1%}", f"{mondrian_summary['ncp']:.1%}"],
+                }
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(
+            "※ 정보 손실(NCP): 각 사람의 값이 원래 값 대신 얼마나 넓은 범위로 바뀌었는지의 평균 (0%가 원본). "
+            "전역 재코딩은 구간 라벨이 뜻하는 범위(예: 10살 구간이면 10살 폭) 기준입니다."
+        )
+        if mondrian_summary["missing_rows"]:
+            st.caption(
+                f"※ 나이 또는 우편번호가 비어 있는 {mondrian_summary['missing_rows']:,}명은 두 방식 모두 "
+                "결측끼리 따로 묶었습니다 (값을 공개하지 않으므로 그 축의 정보 손실은 100%)."
+            )
+        with st.expander("📊 Mondrian 동질 집합 목록"):
+            st.dataframe(mondrian_table, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Count-Min 스케치 사전 점검
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**⑤ 거대 파일 사전 점검: Count-Min 스케치**")
+    st.caption(
+        "정확한 groupby가 어려울 만큼 큰 파일은, 고정 크기 표 하나에 그룹 크기를 근사해 한 번만 훑어 봅니다. "
+        "추정값은 항상 실제 이상이라 추정 k가 목표보다 작은 그룹은 확실히 위험합니다. "
+        "청크·파일별 스케치를 합칠 수 있어 `python risk_sketch.py 파일1 파일2 ...`로 여러 프로세스에서 나눠 훑을 수 있습니다."
+    )
+    sketch_width = st.select_slider("스케치 칸 수 (width)", options=[2**p for p in range(8, 21, 2)], value=2**16)
+    if st.button("🧮 스케치로 위험 점검"):
+        sketch = RiskSketch(age_group_size, zip_keep, width=sketch_width)
+        sketch.update(count_cube, age_col, zip_col, count_col="n")
+        sketch_summary, sketch_table = sketch.report(target_k)
+        exact_below = int((group_k["k"] < target_k).sum())
         st.dataframe(
-            anon_df[["나이_구간", "우편번호_일반화", "질병"]],
+            pd.DataFrame(
+                {
+                    "항목": ["그룹 수", f"k < {target_k} 그룹 수", "메모리"],
+                    "스케치 추정": [
+                        f"{sketch_summary['classes_est']:,}",
+                        f"{sketch_summary['below_k_classes_est']:,} (확실) · "
+                        f"{sketch_summary['maybe_below_k_share']:.0%} (가능)",
+                        f"{sketch_summary['memory_bytes'] / 1e6:.1f} MB",
+                    ],
+                    "정확한 값": [f"{len(group_k):,}", f"{exact_below:,}", "-"],
+                }
+            ),
             use_container_width=True,
+            hide_index=True,
         )
+        st.caption(
+            f"확률 {sketch_summary['confidence']:.0%} 이상으로 과대추정은 최대 {sketch_summary['error_bound']:.1f}명입니다."
+        )
+        if sketch_summary["saturated"]:
+            st.warning("그룹 수에 비해 칸 수가 부족해 작은 그룹을 구분하지 못합니다. 칸 수를 늘려 보세요.")
+        with st.expander("🔎 표본 그룹별 추정 k"):
+            st.dataframe(sketch_table.head(DETAIL_PREVIEW_ROWS), use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     # 미니 퀴즈
@@ -493,8 +907,7 @@ with tab3:
     st.markdown("**② 암호화 · 연산 · 복호화 과정 보기**")
 
     if st.button("🧮 동형암호(장난감) 연산 시뮬레이션"):
-        r1 = random.randint(1, 10)
-        r2 = random.randint(1, 10)
+        r1, r2 = random_r(2, 10).tolist()
 
         C1 = m1 + r1 * key
         C2 = m2 + r2 * key
@@ -561,6 +974,188 @@ C_sum mod K = {C_sum} mod {key} = {m_sum_dec}
         st.caption("버튼을 눌러 암호화·복호화 과정을 단계별로 확인해 보세요.")
     st.markdown("</div>", unsafe_allow_html=True)
 
+    # 배치 암호화 · 암호문 컬럼 합
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**③ 대량 암호문 집계 (한 컬럼 전체를 암호 상태로 더하기)**")
+    st.caption(
+        "같은 규칙(C = m + r·K)을 값 하나씩이 아니라 배열 전체에 한 번에 적용합니다. "
+        "r은 운영체제의 암호학적 난수 생성기에서 뽑고, 서버는 암호문 컬럼의 합만 계산합니다."
+    )
+    col_n, col_k = st.columns(2)
+    with col_n:
+        he_rows = st.select_slider(
+            "평문 개수", options=[10_000, 100_000, 1_000_000], value=1_000_000, format_func="{:,}".format
+        )
+    with col_k:
+        he_big_key = st.checkbox("아주 큰 키 K = 2^70 (int64를 넘어 파이썬 큰 정수로 계산)", value=False)
+    if st.button("⚡ 배치 암호화 · 합산 실행"):
+        bench = benchmark_toy_he(he_rows, key=2**70 if he_big_key else None)
+        st.code(
+            f"""
+평문 {bench['n']:,}개 (각 0~20), 키 K = {bench['key']:,}
+계산 방식: {'int64 벡터 연산' if bench['int64'] else '파이썬 큰 정수 배열'}
+
+암호문 합 ΣC          = {bench['encrypted_sum']:,}
+복호화 ΣC mod K       = {bench['decrypted_sum']:,}
+평문 합 Σm (검산)     = {bench['plain_sum']:,}
+""",
+            language="text",
+        )
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "단계": list(bench["seconds"]),
+                    "시간(초)": [round(s, 4) for s in bench["seconds"].values()],
+                    "처리량(개/초)": [f"{bench['n'] / max(s, 1e-9):,.0f}" for s in bench["seconds"].values()],
+                }
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if bench["decrypted_sum"] == bench["plain_sum"] and bench["roundtrip_ok"]:
+            st.success("✅ 암호문만 더한 결과를 복호화해도 평문 합과 정확히 같습니다.")
+        else:
+            st.warning("⚠ 평문 합이 K 이상이라 mod K에서 값이 넘쳤습니다. 더 큰 K가 필요합니다.")
+        st.caption("※ 반복문 시간은 예전처럼 random.randint로 한 개씩 암호화해 더하는 방식을 최대 10만 개로 재서 환산한 값입니다.")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # 실제 Paillier 엔진
+    @st.cache_resource
+    def paillier_keys(bits: int):
+        # 키 생성과 고정 밑 거듭제곱 표 준비는 느리므로 키 크기마다 한 번만
+        public_key, private_key = generate_paillier_keypair(bits)
+        return public_key, private_key, RandomnessPool(public_key, private_key=private_key)
+
+    @st.cache_data
+    def paillier_benchmark_table(key_sizes: tuple) -> pd.DataFrame:
+        table = pd.DataFrame(benchmark_paillier(key_sizes, ops=100))
+        toy = benchmark_toy_he(100_000)
+        toy_row = {
+            "키 크기(bit)": "장난감 (C = m + rK, 배치)",
+            "암호화(고정 밑)": toy["n"] / toy["seconds"]["암호화"],
+            "암호문 덧셈": toy["n"] / toy["seconds"]["암호문 합"],
+            "복호화(CRT)": toy["n"] / toy["seconds"]["복호화"],
+        }
+        table = pd.concat([table, pd.DataFrame([toy_row])], ignore_index=True)
+        table["키 크기(bit)"] = table["키 크기(bit)"].astype(str)
+        return table.round(1)
+
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**④ 실제 동형암호 맛보기: Paillier**")
+    st.caption(
+        "Paillier는 암호문끼리 곱하면 평문이 더해지고(E(a)·E(b) = E(a+b)), "
+        "암호문을 k제곱하면 평문이 k배가 되는(E(a)^k = E(k·a)) 실제 덧셈 동형암호입니다. "
+        "위 ①의 m1, m2를 그대로 사용합니다."
+    )
+    col_bits, col_scalar = st.columns(2)
+    with col_bits:
+        paillier_bits = st.selectbox("키 크기 (bit)", [1024, 2048], index=0)
+    with col_scalar:
+        paillier_k = st.number_input("스칼라 곱 k", min_value=-100, max_value=100, value=3, step=1)
+    if st.button("🔐 Paillier로 암호화 · 연산 · 복호화"):
+        pk, sk, pool = paillier_keys(paillier_bits)
+        c1 = pk.encrypt(int(m1), pool)
+        c2 = pk.encrypt(int(m2), pool)
+        c_add = pk.add(c1, c2)
+        c_mul = pk.mul_plain(c1, int(paillier_k))
+        digits = len(str(pk.n2))
+        st.code(
+            f"""
+공개키 n: {pk.n.bit_length()}비트, 암호문은 n² 미만의 약 {digits}자리 정수
+
+E(m1) = {str(c1)[:40]}… ({digits}자리)
+E(m2) = {str(c2)[:40]}…
+
+서버: E(m1)·E(m2) mod n² = {str(c_add)[:40]}…
+서버: E(m1)^{paillier_k} mod n² = {str(c_mul)[:40]}…
+
+복호화(CRT): E(m1)·E(m2) → {sk.decrypt(c_add)}   (m1 + m2 = {m1 + m2})
+복호화(CRT): E(m1)^{paillier_k} → {sk.decrypt(c_mul)}   ({paillier_k} × m1 = {paillier_k * m1})
+""",
+            language="text",
+        )
+        st.caption("※ 같은 평문도 암호화할 때마다 난수 r이 달라 암호문이 매번 바뀝니다 (장난감 모형과 같은 원리).")
+    if st.button("📊 키 크기별 속도 비교 (1~2분 걸릴 수 있음)"):
+        st.dataframe(paillier_benchmark_table((1024, 2048)), use_container_width=True, hide_index=True)
+        st.caption(
+            "단위: 초당 연산 수. 고정 밑은 h의 거듭제곱 표를 미리 만들어 두고 암호화마다 새 난수 지수 x로 h^x를 곱해 쓰는 방식, "
+            "CRT 복호화는 p², q²에서 따로 계산해 합치는 방식입니다. 장난감 모형은 보안이 없는 대신 훨씬 빠릅니다."
+        )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # 슬롯 패킹
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**⑤ 슬롯 패킹: 암호문 하나에 값 수십~수백 개 담기**")
+    st.caption(
+        "0~20 같은 작은 값 하나에 1024비트 암호문을 통째로 쓰면 공간 대부분이 낭비됩니다. "
+        "값 여러 개를 고정 폭 비트 칸(슬롯)에 이어 붙여 한 번에 암호화하면, 암호문 덧셈 한 번이 슬롯 수만큼의 값을 더합니다. "
+        "슬롯 폭은 (값 최댓값 × 덧셈 횟수)가 넘치지 않도록 여유 비트를 두고 정합니다."
+    )
+    col_engine, col_rows = st.columns(2)
+    with col_engine:
+        pack_engine = st.radio("엔진", ["Paillier (1024비트)", "장난감 모형 (K = 2^1024)"], horizontal=True)
+    with col_rows:
+        pack_rows = st.select_slider("값 개수 (각 0~20)", options=[2_000, 20_000], value=2_000, format_func="{:,}".format)
+    if st.button("📦 패킹 전후 암호문 합 비교"):
+        pack_values = np.frombuffer(os.urandom(4 * pack_rows), dtype=np.uint32) % 21
+        if pack_engine.startswith("Paillier"):
+            pk, sk, pool = paillier_keys(1024)
+            packing = compare_packing_paillier(pack_values, pk, sk, pool)
+        else:
+            packing = compare_packing_toy(pack_values, 1 << 1024)
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "방식": ["값마다 암호문 하나", f"슬롯 패킹 ({packing['slots']}슬롯 × {packing['slot_bits']}비트)"],
+                    "암호문 수": list(packing["ciphertexts"]),
+                    "복호화한 합": list(packing["sums"][:2]),
+                    "시간(초)": [round(s, 4) for s in packing["seconds"]],
+                    "처리량(값/초)": [f"{packing['n'] / max(s, 1e-9):,.0f}" for s in packing["seconds"]],
+                }
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.success(
+            f"⚡ 패킹으로 {packing['gain']:.1f}배 빨라졌습니다. "
+            f"(평문 합 검산: {packing['sums'][2]:,}, 슬롯마다 여유 {packing['headroom_bits']}비트)"
+        )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # 로컬 집계 서버
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("**⑥ 집계 서버 흉내 내기: 여러 클라이언트가 동시에 암호문 보내기**")
+    st.caption(
+        "이 컴퓨터(127.0.0.1)에 작은 asyncio 서버를 띄우고, 여러 클라이언트가 동시에 암호문 묶음을 보냅니다. "
+        "서버는 키 없이 암호문만 받아 여러 코어에서 트리 방식으로 합치고, 마지막에 키를 가진 쪽이 합계만 복호화합니다. "
+        "`python he_server.py serve`로 서버만 따로 띄울 수도 있습니다."
+    )
+    col_srv_engine, col_clients, col_batch = st.columns(3)
+    with col_srv_engine:
+        server_engine = st.radio("서버 엔진", ["paillier", "toy"], format_func={"paillier": "Paillier", "toy": "장난감"}.get)
+    with col_clients:
+        server_clients = st.slider("동시 클라이언트 수", min_value=1, max_value=64, value=16)
+    with col_batch:
+        server_batch = st.select_slider("요청당 암호문 수", options=[16, 64, 256, 1024], value=256)
+    if st.button("🖥️ 서버 띄우고 부하 테스트"):
+        with st.spinner("암호문을 준비하고 요청을 보내는 중..."):
+            load = asyncio.run(
+                run_aggregation_demo(
+                    engine=server_engine, clients=server_clients, batches_per_client=5, batch_size=server_batch
+                )
+            )
+        col_t, col_p50, col_p95, col_p99 = st.columns(4)
+        col_t.metric("처리량 (암호문/초)", f"{load['ciphertexts_per_sec']:,.0f}")
+        col_p50.metric("지연 p50", f"{load['latency_ms']['p50']:.1f} ms")
+        col_p95.metric("지연 p95", f"{load['latency_ms']['p95']:.1f} ms")
+        col_p99.metric("지연 p99", f"{load['latency_ms']['p99']:.1f} ms")
+        st.caption(f"요청 {load['requests']:,}건 · 암호문 {load['ciphertexts']:,}개 · {load['seconds']:.2f}초")
+        if load["decrypted_total"] == load["plain_total"]:
+            st.success(f"✅ 서버가 돌려준 암호문 합을 복호화한 값 {load['decrypted_total']:,} = 평문 합")
+        else:
+            st.error(f"복호화 합 {load['decrypted_total']:,} ≠ 평문 합 {load['plain_total']:,}")
+    st.markdown("</div>", unsafe_allow_html=True)
+
     # 미니 퀴즈
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("**🧩 미니 퀴즈: 동형암호 개념 점검**")
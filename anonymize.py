@@ -0,0 +1,551 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 일반화 함수 (2탭 학습 화면 · 대량 처리 공용)
+# -------------------------------------------------
+
+
+def generalize_age(age: int, group_size: int) -> str:
+    base = (age // group_size) * group_size
+    return f"{base}~{base + group_size - 1}"
+
+
+def generalize_zip(zipcode: str, keep: int) -> str:
+    if len(zipcode) <= keep:
+        return zipcode
+    return zipcode[:keep] + "*" * (len(zipcode) - keep)
+
+
+# -------------------------------------------------
+# 컬럼 단위 일반화
+#  - 행마다 .apply(lambda ...)를 부르지 않고 정수 나눗셈 / 고유값 단위 문자열 처리
+#  - 결과는 Categorical이라 뒤이은 groupby가 문자열 해시 대신 정수 코드로 묶는다
+# -------------------------------------------------
+
+
+def generalize_age_series(ages: pd.Series, group_size: int) -> pd.Series:
+    """generalize_age와 같은 라벨("20~29")을 Categorical로 돌려준다."""
+    values = pd.to_numeric(ages, errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    bases = np.zeros(len(values), dtype=np.int64)
+    bases[valid] = (values[valid].astype(np.int64) // group_size) * group_size
+
+    # 라벨 문자열은 서로 다른 구간 수만큼만 만든다
+    uniq, codes = np.unique(bases[valid], return_inverse=True)
+    labels = [f"{b}~{b + group_size - 1}" for b in uniq.tolist()]
+    all_codes = np.full(len(values), -1, dtype=np.int64)
+    all_codes[valid] = codes
+    return pd.Series(pd.Categorical.from_codes(all_codes, categories=labels, ordered=True), index=ages.index)
+
+
+def generalize_zip_series(zips: pd.Series, keep: int) -> pd.Series:
+    """generalize_zip과 같은 라벨("123**")을 Categorical로 돌려준다."""
+    if isinstance(zips.dtype, pd.CategoricalDtype):
+        codes = zips.cat.codes.to_numpy()
+        uniques = pd.Series(zips.cat.categories.astype(str))
+    else:
+        codes, uniq = pd.factorize(zips, use_na_sentinel=True)
+        uniques = pd.Series(np.asarray(uniq, dtype=object)).astype(str)
+
+    # 자르기 + '*' 채우기는 고유 우편번호(많아야 수만 개)에만 적용
+    length = uniques.str.len()
+    stars = pd.Series(["*" * max(n - keep, 0) for n in length.tolist()], index=uniques.index)
+    generalized = uniques.where(length <= keep, uniques.str.slice(0, keep) + stars)
+
+    # 서로 다른 우편번호가 같은 라벨로 합쳐지므로 라벨 기준으로 다시 코드를 매긴다
+    label_codes, labels = pd.factorize(generalized, sort=True)
+    new_codes = np.append(label_codes, -1)[codes]
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=labels, ordered=True), index=zips.index)
+
+
+def group_sizes(df: pd.DataFrame, group_cols: list) -> pd.DataFrame:
+    """준식별자 조합별 그룹 크기(k)를 큰 순서로 돌려준다. 결측 준식별자도 하나의 그룹으로 센다."""
+    return (
+        df.groupby(group_cols, observed=True, dropna=False)
+        .size()
+        .reset_index(name="k")
+        .sort_values("k", ascending=False)
+    )
+
+
+# -------------------------------------------------
+# 최적 일반화 탐색 (나이 구간 × 우편번호 자릿수 격자)
+#  - 격자의 각 축은 위로 갈수록 더 거칠어지고, 위 단계가 아래 단계를 포함(중첩)한다
+#    (나이 구간 1 ⊂ 5 ⊂ 10 ⊂ 20 ⊂ 40 ⊂ 120, 우편번호 5자리 ⊃ 4 ⊃ … ⊃ 0자리)
+#  - k-익명성의 단조성: 어떤 설정이 k를 만족하면 그보다 거친 설정도 모두 만족하고,
+#    만족하지 못하면 그보다 세밀한 설정도 모두 만족하지 못한다
+#  - 계단(staircase) 탐색으로 우편번호 단계마다 k를 만족하는 가장 세밀한 나이 구간을 찾으므로
+#    평가 횟수는 (나이 단계 수 + 우편번호 단계 수) 이하
+#  - 각 평가는 groupby 대신 미리 만든 정수 코드의 np.bincount 한 번
+# -------------------------------------------------
+
+AGE_LEVELS = (1, 5, 10, 20, 40, 120)
+ZIP_LEVELS = (5, 4, 3, 2, 1, 0)
+
+
+def _dense_codes(cat: pd.Series) -> tuple:
+    # Categorical 코드(결측 -1)를 0..n-1 범위로 옮기고 결측은 별도 그룹 하나로 취급
+    codes = cat.cat.codes.to_numpy().astype(np.int64)
+    n = len(cat.cat.categories)
+    return np.where(codes < 0, n, codes), n + 1
+
+
+def _min_k(age_codes: tuple, zip_codes: tuple, weights=None) -> int:
+    a, _ = age_codes
+    z, nz = zip_codes
+    counts = np.bincount(a * nz + z, weights=weights)
+    return int(counts[counts > 0].min())
+
+
+def search_generalization(
+    df: pd.DataFrame,
+    target_k: int,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    age_levels=AGE_LEVELS,
+    zip_levels=ZIP_LEVELS,
+    count_col: str | None = None,
+):
+    """target_k를 만족하는 가장 덜 일반화된 (나이 구간 크기, 우편번호 자릿수)를 찾는다.
+
+    "덜 일반화"는 두 축의 정규화된 일반화 높이의 합이 가장 작은 것으로 정한다.
+    df 대신 build_count_cube 결과와 count_col을 넘기면 행 대신 집계표 위에서 탐색한다.
+    어떤 설정으로도 target_k를 만족할 수 없으면 None을 돌려준다.
+    """
+    if any(b % a for a, b in zip(age_levels, age_levels[1:])):
+        raise ValueError("age_levels는 앞 단계가 뒤 단계를 나누어떨어지게 하는 중첩 구간이어야 합니다.")
+    if list(zip_levels) != sorted(zip_levels, reverse=True):
+        raise ValueError("zip_levels는 보존 자릿수가 줄어드는 순서여야 합니다.")
+
+    n_age, n_zip = len(age_levels), len(zip_levels)
+    weights = None if count_col is None else df[count_col].to_numpy(dtype=np.float64)
+    age_codes, zip_codes = {}, {}
+    known = {}
+    evaluations = 0
+
+    def satisfies(ai: int, zi: int) -> bool:
+        nonlocal evaluations
+        if (ai, zi) in known:
+            return known[(ai, zi)]
+        # 이미 평가한 설정으로부터 단조성으로 결과를 추론할 수 있으면 groupby를 건너뜀
+        for (a, z), ok in known.items():
+            if ok and a <= ai and z <= zi:
+                return True
+            if not ok and a >= ai and z >= zi:
+                return False
+        if ai not in age_codes:
+            age_codes[ai] = _dense_codes(generalize_age_series(df[age_col], age_levels[ai]))
+        if zi not in zip_codes:
+            zip_codes[zi] = _dense_codes(generalize_zip_series(df[zip_col], zip_levels[zi]))
+        evaluations += 1
+        known[(ai, zi)] = _min_k(age_codes[ai], zip_codes[zi], weights) >= target_k
+        return known[(ai, zi)]
+
+    frontier = []
+    ai = n_age - 1
+    for zi in range(n_zip):
+        if not satisfies(ai, zi):
+            continue
+        while ai > 0 and satisfies(ai - 1, zi):
+            ai -= 1
+        # 나이 단계가 그대로면 (ai, zi)는 앞의 경계점보다 거칠기만 하므로 경계에 넣지 않음
+        if not frontier or ai < frontier[-1][0]:
+            frontier.append((ai, zi))
+
+    if not frontier:
+        return None
+
+    def loss(node):
+        a, z = node
+        return a / (n_age - 1) + z / (n_zip - 1)
+
+    best_ai, best_zi = min(frontier, key=loss)
+    return {
+        "age_group_size": age_levels[best_ai],
+        "zip_keep": zip_levels[best_zi],
+        "min_k": _min_k(age_codes[best_ai], zip_codes[best_zi], weights),
+        "evaluations": evaluations,
+        "lattice_size": n_age * n_zip,
+        "frontier": [(age_levels[a], zip_levels[z]) for a, z in frontier],
+    }
+
+
+# -------------------------------------------------
+# 집계 큐브 (Count Cube)
+#  원본 행을 가장 세밀한 단위(정확한 나이 × 우편번호 전체)로 한 번만 센 뒤,
+#  슬라이더 설정이 바뀌면 이 작은 집계표만 다시 일반화해 합산(roll-up)한다.
+#  → 설정 변경 비용이 행 수가 아니라 서로 다른 (나이, 우편번호) 조합 수에 비례
+# -------------------------------------------------
+
+
+def build_count_cube(
+    df: pd.DataFrame,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    count_col: str = "n",
+    sensitive_col: str | None = None,
+) -> pd.DataFrame:
+    """(나이, 우편번호[, 민감 속성]) 조합별 행 수 집계표를 만든다. 행 전체를 훑는 것은 이 한 번뿐이다."""
+    keys = [age_col, zip_col] if sensitive_col is None else [age_col, zip_col, sensitive_col]
+    return df.groupby(keys, observed=True, dropna=False).size().reset_index(name=count_col)
+
+
+def rollup_group_sizes(
+    cube: pd.DataFrame,
+    group_size: int,
+    keep: int,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    count_col: str = "n",
+) -> pd.DataFrame:
+    """집계표를 일반화 설정에 맞게 합산해 group_sizes와 같은 모양의 표를 돌려준다."""
+    age_label, zip_label = f"{age_col}_구간", f"{zip_col}_일반화"
+    keys = pd.DataFrame(
+        {
+            age_label: generalize_age_series(cube[age_col], group_size),
+            zip_label: generalize_zip_series(cube[zip_col], keep),
+            "k": cube[count_col],
+        }
+    )
+    return (
+        # 결측(나이 · 우편번호 없음)도 _dense_codes · search_generalization처럼 별도 그룹으로 남긴다
+        keys.groupby([age_label, zip_label], observed=True, dropna=False)["k"]
+        .sum()
+        .reset_index()
+        .sort_values("k", ascending=False)
+    )
+
+
+# -------------------------------------------------
+# l-다양성 · t-근접성
+#  동질 집합(일반화된 나이 × 우편번호)마다
+#    - k          : 사람 수
+#    - l(고유값)  : 서로 다른 민감 속성(질병) 값의 수
+#    - l(엔트로피): exp(민감 속성 분포의 엔트로피)
+#    - t          : 전체 질병 분포와의 거리 (범주형이므로 모든 값 사이 거리를 1로 보는
+#                   EMD = 전체 변동 거리 ½·Σ|p - q|)
+#  (집합, 질병) 쌍 단위 개수 하나만 만들고, 나머지는 모두 그 위의 np.bincount로 계산한다.
+#  집합 × 질병 전체 행렬을 만들지 않으므로 집합이 수백만 개여도 메모리가 쌍 수에 비례한다.
+# -------------------------------------------------
+
+
+def rollup_privacy_metrics(
+    cube: pd.DataFrame,
+    group_size: int,
+    keep: int,
+    sensitive_col: str = "질병",
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    count_col: str = "n",
+) -> pd.DataFrame:
+    """rollup_group_sizes 결과에 l-다양성(고유값/엔트로피)과 t-근접성 컬럼을 더한 표를 돌려준다."""
+    age_label, zip_label = f"{age_col}_구간", f"{zip_col}_일반화"
+    ages = generalize_age_series(cube[age_col], group_size)
+    zips = generalize_zip_series(cube[zip_col], keep)
+    a, _ = _dense_codes(ages)
+    z, nz = _dense_codes(zips)
+    _, first_row, cls = np.unique(a * nz + z, return_index=True, return_inverse=True)
+    n_cls = len(first_row)
+
+    sens_codes, _ = pd.factorize(cube[sensitive_col], use_na_sentinel=False)
+    n_sens = int(sens_codes.max()) + 1
+    weights = cube[count_col].to_numpy(dtype=np.float64)
+
+    # (집합, 질병) 쌍별 인원
+    pairs, pair_inv = np.unique(cls * n_sens + sens_codes, return_inverse=True)
+    pair_n = np.bincount(pair_inv, weights=weights)
+    pair_cls, pair_sens = pairs // n_sens, pairs % n_sens
+
+    k = np.bincount(pair_cls, weights=pair_n, minlength=n_cls)
+    q = np.bincount(pair_sens, weights=pair_n, minlength=n_sens) / pair_n.sum()
+    p = pair_n / k[pair_cls]
+
+    l_distinct = np.bincount(pair_cls, minlength=n_cls)
+    l_entropy = np.exp(-np.bincount(pair_cls, weights=p * np.log(p), minlength=n_cls))
+    # ½·Σ|p - q| 에서 집합에 없는 질병은 |0 - q| = q 이므로, 전체 합 1에서 있는 질병의 q를 바꿔 끼운다
+    gap = np.abs(p - q[pair_sens]) - q[pair_sens]
+    t_close = 0.5 * (np.bincount(pair_cls, weights=gap, minlength=n_cls) + 1.0)
+
+    return pd.DataFrame(
+        {
+            age_label: ages.iloc[first_row].to_numpy(),
+            zip_label: zips.iloc[first_row].to_numpy(),
+            "k": k.astype(np.int64),
+            "l_distinct": l_distinct,
+            "l_entropy": l_entropy,
+            "t": t_close,
+        }
+    ).sort_values("k", ascending=False, ignore_index=True)
+
+
+# -------------------------------------------------
+# Mondrian 다차원 분할
+#  고정 폭 구간(전역 재코딩) 대신, 데이터가 몰린 곳은 잘게·드문 곳은 넓게 나누는 방식.
+#  - 분할 조각마다 (정규화) 폭이 가장 넓은 준식별자를 골라 가중 중앙값에서 둘로 자르고,
+#    양쪽 모두 k 이상일 때만 자른다 (더 이상 못 자르면 그 조각이 하나의 동질 집합)
+#  - 가중 중앙값은 정렬 대신 np.partition 선택(quickselect)으로 찾아 조각마다 O(조각 크기)
+#  - 행 대신 집계 큐브의 서로 다른 (나이, 우편번호) 점 위에서 개수를 가중치로 분할하므로
+#    분할 횟수와 선택 크기가 행 수가 아니라 고유 조합 수에 비례한다
+#  - 우편번호는 정렬된 고유값의 순위(서열)로 바꿔 수치 축으로 다룬다
+#  - 나이·우편번호가 비어 있는 행은 결측 패턴(나이만 · 우편번호만 · 둘 다)마다 따로 분할해
+#    결측 값을 다른 값과 한 집합으로 섞지 않는다 (집계표 · 전역 재코딩처럼 결측도 하나의 값)
+#  - 정보 손실(NCP)은 공개하는 범위 기준: Mondrian은 집합 안 실제 범위, 전역 재코딩은 구간 라벨이
+#    뜻하는 범위(나이 구간 폭, 같은 앞자리의 우편번호 전체), 결측(공개 안 함)은 1
+# -------------------------------------------------
+
+
+def _ordinal(values: pd.Series) -> tuple:
+    # 정렬된 고유값 기준 순위와 그 고유값 배열
+    codes, uniques = pd.factorize(values.astype(str), sort=True)
+    return codes.astype(np.float64), np.asarray(uniques, dtype=object)
+
+
+def _weighted_median(vals: np.ndarray, weights: np.ndarray) -> float:
+    # 누적 가중치가 처음 절반 이상이 되는 값 (정렬 없이, 가중치 없는 중앙값을 기준값 삼아 범위를 좁혀 간다)
+    half = weights.sum() / 2
+    below = 0.0
+    while True:
+        pivot = np.partition(vals, len(vals) // 2)[len(vals) // 2]
+        less, equal = vals < pivot, vals == pivot
+        less_w = below + weights[less].sum()
+        if less_w >= half:
+            vals, weights = vals[less], weights[less]
+        elif less_w + weights[equal].sum() >= half:
+            return pivot
+        else:
+            below = less_w + weights[equal].sum()
+            greater = ~(less | equal)
+            vals, weights = vals[greater], weights[greater]
+
+
+def _weighted_split(vals: np.ndarray, weights: np.ndarray, k: int):
+    # 가중 중앙값에서 자른 왼쪽 마스크를 돌려주고, 양쪽 모두 k 이상이 안 되면 None
+    median = _weighted_median(vals, weights)
+    total = weights.sum()
+
+    # 같은 값은 한쪽으로만 보낸다: 중앙값을 왼쪽에 넣는 경우 → 오른쪽에 넣는 경우 순으로 시도
+    for left in (vals <= median, vals < median):
+        if left.all() or not left.any():
+            continue
+        left_w = weights[left].sum()
+        if left_w >= k and total - left_w >= k:
+            return left
+    return None
+
+
+def _ncp(widths: np.ndarray, weights: np.ndarray) -> float:
+    # 정규화 확실성 손실(NCP): 점마다 (공개 범위 / 전체 범위)의 축 평균을 행 수로 가중 평균
+    return float((widths.mean(axis=1) * weights).sum() / weights.sum())
+
+
+def _cube_points(cube: pd.DataFrame, age_col: str, zip_col: str, count_col: str):
+    # (나이, 우편번호 순위) 점 · 우편번호 고유값 · 가중치 · 축별 전체 범위. 결측은 NaN
+    ages = pd.to_numeric(cube[age_col], errors="coerce").to_numpy(dtype=np.float64)
+    zip_present = cube[zip_col].notna().to_numpy()
+    zip_rank = np.full(len(cube), np.nan)
+    zip_rank[zip_present], zip_values = _ordinal(cube[zip_col][zip_present])
+    points = np.column_stack([ages, zip_rank])
+    span = np.array([np.ptp(col[~np.isnan(col)]) if not np.isnan(col).all() else 0.0 for col in points.T])
+    span[span == 0] = 1
+    return points, zip_values, cube[count_col].to_numpy(dtype=np.int64), span
+
+
+def mondrian_partition(
+    cube: pd.DataFrame,
+    k: int,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    count_col: str = "n",
+):
+    """집계 큐브를 Mondrian 방식으로 분할해 (동질 집합 표, 요약 dict)를 돌려준다."""
+    points, zip_values, weights, span = _cube_points(cube, age_col, zip_col, count_col)
+    if weights.sum() < k:
+        return None
+
+    missing = np.isnan(points)
+    # 결측 축은 상수로 채워 폭이 0이 되므로 그 축으로는 자르지 않는다
+    filled = np.where(missing, 0.0, points)
+    pattern = missing[:, 0] + 2 * missing[:, 1]
+    leaf = np.empty(len(points), dtype=np.int64)
+    n_leaves = 0
+    stack = [np.flatnonzero(pattern == p) for p in np.unique(pattern)[::-1]]
+    while stack:
+        idx = stack.pop()
+        sub, sub_w = filled[idx], weights[idx]
+        widths = (sub.max(axis=0) - sub.min(axis=0)) / span
+        left = None
+        for d in np.argsort(-widths, kind="stable"):
+            if widths[d] == 0:
+                break
+            left = _weighted_split(sub[:, d], sub_w, k)
+            if left is not None:
+                break
+        if left is None:
+            leaf[idx] = n_leaves
+            n_leaves += 1
+        else:
+            stack.append(idx[~left])
+            stack.append(idx[left])
+
+    frame = pd.DataFrame(
+        {
+            "leaf": leaf,
+            "age": filled[:, 0],
+            "zip": filled[:, 1].astype(np.int64),
+            "age_missing": missing[:, 0],
+            "zip_missing": missing[:, 1],
+            "k": weights,
+        }
+    )
+    classes = frame.groupby("leaf").agg(
+        age_min=("age", "min"),
+        age_max=("age", "max"),
+        zip_min=("zip", "min"),
+        zip_max=("zip", "max"),
+        age_missing=("age_missing", "first"),
+        zip_missing=("zip_missing", "first"),
+        k=("k", "sum"),
+    )
+
+    def span_label(lo, hi, absent):
+        return np.where(absent, "결측", np.where(lo == hi, lo.astype(str), lo.astype(str) + "~" + hi.astype(str)))
+
+    age_lo = classes["age_min"].to_numpy().astype(np.int64)
+    age_hi = classes["age_max"].to_numpy().astype(np.int64)
+    # 우편번호가 모두 결측이어도 인덱싱할 수 있게 끝에 자리 하나를 더 둔다 (결측 집합 라벨은 어차피 "결측")
+    zip_names = np.append(zip_values, "").astype(str)
+    zip_lo = zip_names[classes["zip_min"].to_numpy()]
+    zip_hi = zip_names[classes["zip_max"].to_numpy()]
+    table = pd.DataFrame(
+        {
+            f"{age_col}_범위": span_label(age_lo, age_hi, classes["age_missing"].to_numpy()),
+            f"{zip_col}_범위": span_label(zip_lo, zip_hi, classes["zip_missing"].to_numpy()),
+            "k": classes["k"].to_numpy(),
+        }
+    ).sort_values("k", ascending=False, ignore_index=True)
+
+    # 집합 안 실제 범위가 공개 범위. 결측 축은 값을 공개하지 않으므로 손실 1
+    lo = classes[["age_min", "zip_min"]].to_numpy(dtype=np.float64)
+    hi = classes[["age_max", "zip_max"]].to_numpy(dtype=np.float64)
+    widths = np.where(missing, 1.0, ((hi - lo) / span)[leaf])
+    summary = {
+        "min_k": int(table["k"].min()),
+        "classes": len(table),
+        "ncp": _ncp(widths, weights),
+        "missing_rows": int(weights[missing.any(axis=1)].sum()),
+    }
+    return table, summary
+
+
+def global_recoding_summary(
+    cube: pd.DataFrame,
+    group_size: int,
+    keep: int,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    count_col: str = "n",
+) -> dict:
+    """고정 폭 전역 재코딩 결과를 Mondrian과 같은 기준(min k, 집합 수, NCP)으로 요약한다."""
+    points, _, weights, span = _cube_points(cube, age_col, zip_col, count_col)
+    missing = np.isnan(points)
+    ages = generalize_age_series(cube[age_col], group_size)
+    zips = generalize_zip_series(cube[zip_col], keep)
+
+    # 집합은 rollup_group_sizes와 같이 나눈다 (결측도 하나의 그룹)
+    a, _ = _dense_codes(ages)
+    z, nz = _dense_codes(zips)
+    sizes = np.bincount(pd.factorize(a * nz + z)[0], weights=weights)
+
+    # 공개 범위: 나이는 구간 폭(group_size - 1), 우편번호는 같은 라벨(앞자리)로 묶이는 모든 우편번호의 순위 범위
+    age_width = np.full(len(points), min((group_size - 1) / span[0], 1.0))
+    zip_codes = zips.cat.codes.to_numpy()
+    rank_lo = np.full(len(zips.cat.categories), np.inf)
+    rank_hi = np.full(len(zips.cat.categories), -np.inf)
+    present = zip_codes >= 0
+    np.minimum.at(rank_lo, zip_codes[present], points[present, 1])
+    np.maximum.at(rank_hi, zip_codes[present], points[present, 1])
+    zip_width = np.ones(len(points))
+    zip_width[present] = (rank_hi - rank_lo)[zip_codes[present]] / span[1]
+    widths = np.where(missing, 1.0, np.column_stack([age_width, zip_width]))
+    return {
+        "min_k": int(sizes.min()),
+        "classes": int(len(sizes)),
+        "ncp": _ncp(widths, weights),
+        "missing_rows": int(weights[missing.any(axis=1)].sum()),
+    }
+
+
+# -------------------------------------------------
+# 데이터셋 읽기 (열 지향)
+#  업로드한 CSV/Parquet을 pyarrow로 읽는다.
+#  - 고른 컬럼만 읽는다 (나머지 컬럼은 파싱도, 메모리 적재도 하지 않음)
+#  - 문자열 컬럼은 사전 인코딩 → pandas Categorical (고유값만 한 번 저장, groupby는 정수 코드로)
+#  - 숫자 컬럼은 값 범위에 맞는 가장 좁은 정수형(uint8, int16 …)으로 줄인다
+# -------------------------------------------------
+
+
+def _is_parquet(filename: str) -> bool:
+    return filename.lower().endswith((".parquet", ".pq"))
+
+
+def dataset_columns(source, filename: str) -> list:
+    """파일 전체를 읽지 않고 컬럼 이름만 돌려준다 (CSV는 첫 블록, Parquet은 메타데이터)."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    if _is_parquet(filename):
+        import pyarrow.parquet as pq
+
+        return list(pq.ParquetFile(source).schema_arrow.names)
+
+    import pyarrow.csv as pacsv
+
+    with pacsv.open_csv(source) as reader:
+        return list(reader.schema.names)
+
+
+def _narrow_number(col: pd.Series) -> pd.Series:
+    values = pd.to_numeric(col, errors="coerce")
+    if values.isna().any() or not np.array_equal(values, np.floor(values)):
+        return values.astype(np.float32)
+    kind = "unsigned" if len(values) == 0 or values.min() >= 0 else "integer"
+    return pd.to_numeric(values.astype(np.int64), downcast=kind)
+
+
+def load_dataset(source, filename: str, numeric_cols=(), text_cols=()) -> pd.DataFrame:
+    """numeric_cols · text_cols에 해당하는 컬럼만 좁은 dtype으로 읽어 DataFrame을 돌려준다.
+
+    text_cols는 파일 안에서 숫자처럼 보여도 문자열로 읽는다 (우편번호 앞자리 0 보존).
+    """
+    import pyarrow as pa
+
+    columns = list(dict.fromkeys([*numeric_cols, *text_cols]))
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    if _is_parquet(filename):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(source, columns=columns)
+        for name in text_cols:
+            col = table.column(name)
+            if not pa.types.is_dictionary(col.type):
+                col = col.cast(pa.string()).dictionary_encode()
+            table = table.set_column(table.schema.get_field_index(name), name, col)
+    else:
+        import pyarrow.csv as pacsv
+
+        table = pacsv.read_csv(
+            source,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={name: dict_string for name in text_cols},
+                strings_can_be_null=True,
+            ),
+        )
+
+    df = table.to_pandas()
+    for name in numeric_cols:
+        df[name] = _narrow_number(df[name])
+    return df
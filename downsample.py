@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 시계열 다운샘플링: LTTB (Largest-Triangle-Three-Buckets)
+#  점 n개를 n_out개로 줄이되 모양(꼭짓점 · 급등락)을 살린다
+#  - 처음 · 마지막 점은 그대로, 나머지를 n_out-2개 구간(bucket)으로 나눈다
+#  - 구간마다 "앞에서 고른 점 A - 이 구간의 후보 B - 다음 구간 평균 C" 삼각형 넓이가 가장 큰 B를 고른다
+#  - 다음 구간 평균은 누적합으로 한꺼번에 계산하고, 구간 순서대로 도는 반복 안에서는
+#    여러 종목(열)을 한 번에 계산한다 → 종목이 수백 개여도 반복 횟수는 n_out번
+#  - x는 실제 시각(ns)을 써서 장중 · 휴장처럼 간격이 고르지 않아도 넓이가 맞다
+#  차트 가로 픽셀 수 정도로 n_out을 잡으면 데이터 길이와 상관없이 그리는 점 수(전송량)가 일정하다
+# -------------------------------------------------
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 고른 점의 행 번호. y가 (n,)이면 (n_out,), (n, k)이면 열마다 따로 고른 (n_out, k)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    flat = y.ndim == 1
+    y2 = y[:, None] if flat else y
+    n, k = y2.shape
+    n_out = max(n_out, 3)
+    if n_out >= n:
+        idx = np.repeat(np.arange(n)[:, None], k, axis=1)
+        return idx[:, 0] if flat else idx
+
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+
+    # 구간별 평균 (결측은 빼고). 마지막 구간의 "다음 구간"은 마지막 점 하나
+    valid = ~np.isnan(y2)
+    sums = np.add.reduceat(np.where(valid, y2, 0.0)[:-1], edges[:-1], axis=0)
+    counts = np.add.reduceat(valid[:-1], edges[:-1], axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_y = np.vstack([sums / counts, y2[-1:]])
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges), x[-1])
+
+    out = np.empty((n_out, k), dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    cols = np.arange(k)
+    a = np.zeros(k, dtype=np.int64)
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y2[a, cols]
+        cx, cy = mean_x[b + 1], mean_y[b + 1]
+        seg_x = x[lo:hi, None]
+        area = np.abs((ax - cx) * (y2[lo:hi] - ay) - (ax - seg_x) * (cy - ay))
+        # 결측이 끼어 넓이를 못 구하는 점은 고르지 않는다 (구간 전체가 결측이면 첫 점)
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + area.argmax(axis=0)
+        out[b + 1] = a
+    return out[:, 0] if flat else out
+
+
+def downsample_frame(frame: pd.DataFrame, n_out: int) -> dict:
+    """날짜 인덱스 × 종목 열 표를 종목마다 LTTB로 줄여 {열 이름: Series}로 돌려준다."""
+    x = frame.index.asi8 if isinstance(frame.index, pd.DatetimeIndex) else frame.index.to_numpy()
+    idx = lttb_indices(x, frame.to_numpy(dtype=np.float64), n_out)
+    return {column: frame[column].iloc[idx[:, j]] for j, column in enumerate(frame.columns)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="LTTB 다운샘플링 속도 측정 (랜덤워크)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--out", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    walk = pd.DataFrame(
+        rng.standard_normal((args.rows, args.cols)).cumsum(axis=0),
+        index=pd.date_range("2020-01-01", periods=args.rows, freq="min"),
+    )
+    t0 = time.perf_counter()
+    series = downsample_frame(walk, args.out)
+    print(f"{args.rows:,}행 × {args.cols}열 → {args.out}점: {time.perf_counter() - t0:.3f}초")
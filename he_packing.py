@@ -0,0 +1,162 @@
+import math
+import time
+
+import numpy as np
+
+# -------------------------------------------------
+# 암호문 슬롯 패킹 (Slot Packing)
+#  작은 평문(예: 0~20) 하나에 1024비트 암호문 하나를 쓰면 공간 대부분이 빈다.
+#  평문 여러 개를 고정 폭 비트 칸(슬롯)에 이어 붙여 큰 정수 하나로 만들고 그것을 암호화하면,
+#  암호문 덧셈 한 번이 슬롯 수만큼의 값을 한꺼번에 더한다.
+#  - 슬롯 폭 = 한 슬롯에 쌓일 최댓값(값 최댓값 × 덧셈 횟수)의 비트 수
+#    → 여유(headroom)가 부족하면 옆 슬롯으로 올림이 넘어가 결과가 깨진다
+#  - 덧셈 횟수는 슬롯 수에 따라 달라지므로 (슬롯 폭 ↔ 슬롯 수)를 번갈아 맞춰 고정점을 찾는다
+#  - 패킹/언패킹은 비트 배열(np.unpackbits/np.packbits)로 한꺼번에 처리한다
+#  장난감 모형(C = m + rK)과 Paillier 양쪽에 같은 패커를 쓴다
+# -------------------------------------------------
+
+
+def plan_slots(capacity_bits: int, value_max: int, n_values: int):
+    """capacity_bits 비트 평문에 값 n_values개(각 0~value_max)를 모두 더해도 넘치지 않는 (슬롯 폭, 슬롯 수)."""
+    additions = max(n_values, 1)
+    while True:
+        slot_bits = max((value_max * additions).bit_length(), 1)
+        slots = capacity_bits // slot_bits
+        if slots < 1:
+            raise ValueError("평문 공간이 너무 작아 슬롯 하나도 만들 수 없습니다.")
+        # 슬롯 하나에 실제로 쌓이는 값 수 = 패킹된 평문 개수
+        needed = math.ceil(n_values / slots)
+        if needed >= additions:
+            return slot_bits, slots
+        additions = needed
+
+
+class SlotPacker:
+    def __init__(self, slot_bits: int, slots: int):
+        if slot_bits > 64:
+            raise ValueError("슬롯 폭은 64비트 이하여야 합니다.")
+        self.slot_bits = slot_bits
+        self.slots = slots
+        self._pad = -(slot_bits * slots) % 8
+
+    @property
+    def capacity_bits(self) -> int:
+        return self.slot_bits * self.slots
+
+    def pack(self, values) -> list:
+        """0 이상 값 배열을 슬롯 수만큼씩 묶어 큰 정수 목록으로 만든다 (슬롯 0이 가장 낮은 비트)."""
+        values = np.asarray(values, dtype=np.uint64)
+        if len(values) and int(values.max()).bit_length() > self.slot_bits:
+            raise ValueError("슬롯 폭보다 큰 값이 있습니다.")
+        groups = -(-len(values) // self.slots)
+        padded = np.zeros(groups * self.slots, dtype=">u8")
+        padded[: len(values)] = values
+
+        # 값마다 하위 slot_bits 비트만 남기고, 한 묶음 안에서는 높은 슬롯부터 이어 붙인다
+        bits = np.unpackbits(padded.view(np.uint8).reshape(-1, 8), axis=1)[:, 64 - self.slot_bits :]
+        rows = bits.reshape(groups, self.slots, self.slot_bits)[:, ::-1].reshape(groups, -1)
+        rows = np.pad(rows, ((0, 0), (self._pad, 0)))
+        raw = np.packbits(rows, axis=1)
+        return [int.from_bytes(row.tobytes(), "big") for row in raw]
+
+    def unpack(self, packed, count: int | None = None) -> np.ndarray:
+        """pack의 반대. count를 주면 앞에서부터 count개만 돌려준다."""
+        width = (self.capacity_bits + self._pad) // 8
+        raw = np.frombuffer(b"".join(int(p).to_bytes(width, "big") for p in packed), dtype=np.uint8)
+        bits = np.unpackbits(raw.reshape(len(packed), width), axis=1)[:, self._pad :]
+        slots = bits.reshape(len(packed), self.slots, self.slot_bits)[:, ::-1].reshape(-1, self.slot_bits)
+        full = np.zeros((len(slots), 64), dtype=np.uint8)
+        full[:, 64 - self.slot_bits :] = slots
+        values = np.packbits(full, axis=1).view(">u8").ravel().astype(np.uint64)
+        return values if count is None else values[:count]
+
+    def sum_slots(self, packed_total: int) -> int:
+        """모든 묶음을 더한 결과(정수 하나)에서 슬롯별 합을 꺼내 다시 모두 더한다."""
+        return int(self.unpack([packed_total]).sum(dtype=np.uint64))
+
+
+# -------------------------------------------------
+# 엔진별 패킹 합산 + 처리량 비교
+# -------------------------------------------------
+
+
+def toy_capacity(key: int) -> int:
+    # C = m + rK 에서 평문 합이 K보다 작아야 하므로 K보다 한 비트 작은 공간만 쓴다
+    return key.bit_length() - 1
+
+
+def paillier_capacity(public_key) -> int:
+    # 음수 표현과 겹치지 않는 평문 상한(max_int) 안쪽
+    return public_key.max_int.bit_length() - 1
+
+
+def _timed(fn, arg):
+    t0 = time.perf_counter()
+    result = fn(arg)
+    return result, time.perf_counter() - t0
+
+
+def _compare(values, capacity_bits: int, encrypted_sum) -> dict:
+    # encrypted_sum(평문 목록) → (모두 암호화해 더한 뒤 복호화한 값, 암호문 수)
+    values = np.asarray(values, dtype=np.int64)
+    value_max = int(values.max())
+    slot_bits, slots = plan_slots(capacity_bits, value_max, len(values))
+    packer = SlotPacker(slot_bits, slots)
+
+    (plain_total, n_plain_ct), t_plain = _timed(encrypted_sum, values)
+    (packed_raw, n_packed_ct), t_packed = _timed(lambda v: encrypted_sum(packer.pack(v)), values)
+    return {
+        "n": len(values),
+        "slot_bits": slot_bits,
+        "slots": slots,
+        "headroom_bits": slot_bits - value_max.bit_length(),
+        "ciphertexts": (n_plain_ct, n_packed_ct),
+        "sums": (plain_total, packer.sum_slots(packed_raw), int(values.sum())),
+        "seconds": (t_plain, t_packed),
+        "gain": t_plain / max(t_packed, 1e-9),
+    }
+
+
+def compare_paillier(values, public_key, private_key, pool=None) -> dict:
+    """같은 값 배열의 암호문 합을 (값마다 암호문 하나) vs (슬롯 패킹)으로 계산해 시간과 결과를 비교한다."""
+
+    def encrypted_sum(plaintexts):
+        cts = public_key.encrypt_many(np.asarray(plaintexts, dtype=object).tolist(), pool)
+        return private_key.decrypt(public_key.sum(cts)), len(cts)
+
+    return _compare(values, paillier_capacity(public_key), encrypted_sum)
+
+
+def compare_toy(values, key: int) -> dict:
+    """장난감 모형(C = m + rK, 파이썬 큰 정수)에서 같은 비교를 한다."""
+    from toy_he import decrypt_sum, encrypt_batch, sum_encrypted
+
+    def encrypted_sum(plaintexts):
+        cts = encrypt_batch(np.asarray(plaintexts, dtype=object), key)
+        return decrypt_sum(sum_encrypted(cts), key), len(cts)
+
+    return _compare(values, toy_capacity(key), encrypted_sum)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from paillier import RandomnessPool, generate_keypair
+
+    parser = argparse.ArgumentParser(description="슬롯 패킹 전후 암호문 합 처리량 비교")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--value-max", type=int, default=20)
+    parser.add_argument("--bits", type=int, default=1024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, args.value_max + 1, size=args.rows)
+    pk, sk = generate_keypair(args.bits)
+    results = {
+        "paillier": compare_paillier(data, pk, sk, RandomnessPool(pk, private_key=sk)),
+        "toy": compare_toy(data, 1 << args.bits),
+    }
+    for engine, result in results.items():
+        print(engine)
+        for name, value in result.items():
+            print(f"  {name}: {value}")
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# -------------------------------------------------
+# 로컬 암호문 집계 서버 (3탭 "서버는 암호문만 더한다"의 실제 대역)
+#  - asyncio TCP 서버 (127.0.0.1), 요청 · 응답은 한 줄짜리 JSON, 암호문은 16진수 문자열
+#  - 요청 {"op": "submit", "round": 이름, "modulus": n² 또는 null, "ciphertexts": [...]}
+#      → 배치 암호문 합을 돌려주고, 같은 라운드의 누적 합에도 더한다
+#    요청 {"op": "total", "round": 이름} → 라운드 누적 암호문 합
+#  - 합 연산: modulus가 있으면 Paillier 덧셈(곱 mod n²), 없으면 장난감 모형(정수 합)
+#  - 배치마다 프로세스 풀 작업으로 넘겨(16진수 파싱 포함) 동시에 들어온 배치들이 여러 코어에서 함께 줄고,
+#    큰 배치는 코어 수만큼 나눠 토너먼트(트리) 방식으로 줄인 뒤 조각 결과를 다시 트리로 합친다
+#  서버는 키를 모르며 복호화하지 않는다 (복호화는 부하 생성기 쪽 키 보유자가 검산용으로만)
+# -------------------------------------------------
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+PARALLEL_MIN = 4_096
+_LINE_LIMIT = 64 << 20
+
+
+def tree_reduce(values, modulus: int | None = None) -> int:
+    """값들을 짝지어 더하는(곱하는) 과정을 반복해 하나로 줄인다."""
+    values = list(values)
+    if not values:
+        return 1 if modulus else 0
+    while len(values) > 1:
+        if modulus:
+            paired = [a * b % modulus for a, b in zip(values[0::2], values[1::2])]
+        else:
+            paired = [a + b for a, b in zip(values[0::2], values[1::2])]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def reduce_hex(chunk: list, modulus: int | None) -> int:
+    # 프로세스 풀 작업 단위: 16진수 파싱까지 작업 프로세스에서 한다
+    return tree_reduce((int(c, 16) for c in chunk), modulus)
+
+
+class AggregationServer:
+    def __init__(self, workers: int | None = None, parallel_min: int = PARALLEL_MIN):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min = parallel_min
+        self.rounds = {}
+        self.requests = 0
+        self.ciphertexts = 0
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._server = None
+        self._connections = {}
+
+    async def reduce(self, chunk: list, modulus: int | None) -> int:
+        """16진수 암호문 배치를 합친다. 배치 하나는 작업 하나로, 큰 배치는 코어 수만큼 나눠 동시에."""
+        loop = asyncio.get_running_loop()
+        pieces = 1 if len(chunk) < self.parallel_min else self.workers
+        step = -(-len(chunk) // pieces) or 1
+        partials = await asyncio.gather(
+            *(loop.run_in_executor(self._pool, reduce_hex, chunk[i : i + step], modulus) for i in range(0, len(chunk), step))
+        )
+        return tree_reduce(partials, modulus)
+
+    async def _answer(self, request: dict) -> dict:
+        op = request.get("op")
+        name = request.get("round", "default")
+        if op == "submit":
+            modulus = request.get("modulus")
+            modulus = int(modulus, 16) if modulus else None
+            values = request["ciphertexts"]
+            batch_total = await self.reduce(values, modulus)
+            # await 사이에 다른 요청이 끼어들지 않는 구간에서 누적 (이벤트 루프 하나라 잠금 불필요)
+            previous = self.rounds.get(name)
+            self.rounds[name] = batch_total if previous is None else tree_reduce([previous, batch_total], modulus)
+            self.requests += 1
+            self.ciphertexts += len(values)
+            return {"ok": True, "batch_total": format(batch_total, "x"), "count": len(values)}
+        if op == "total":
+            if name not in self.rounds:
+                return {"ok": False, "error": f"라운드가 없습니다: {name}"}
+            return {"ok": True, "total": format(self.rounds[name], "x")}
+        if op == "reset":
+            self.rounds.pop(name, None)
+            return {"ok": True}
+        return {"ok": False, "error": f"알 수 없는 op: {op}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self._answer(json.loads(line))
+                except (ValueError, KeyError, TypeError) as exc:
+                    response = {"ok": False, "error": str(exc)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """서버를 띄우고 실제 포트 번호를 돌려준다 (port=0이면 빈 포트 자동 선택)."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=_LINE_LIMIT)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # 남은 연결을 닫아 처리 중인 핸들러가 EOF를 보고 스스로 끝나게 한 뒤 기다린다
+            tasks = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+        self._pool.shutdown()
+
+
+# -------------------------------------------------
+# 부하 생성기: 동시 클라이언트 여러 개가 암호문 배치를 보낸다
+# -------------------------------------------------
+
+
+async def _client(host, port, batches, modulus_hex, round_name, latencies):
+    reader, writer = await asyncio.open_connection(host, port, limit=_LINE_LIMIT)
+    try:
+        for batch in batches:
+            message = {"op": "submit", "round": round_name, "modulus": modulus_hex, "ciphertexts": batch}
+            t0 = time.perf_counter()
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - t0)
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _request(host, port, message: dict) -> dict:
+    reader, writer = await asyncio.open_connection(host, port, limit=_LINE_LIMIT)
+    try:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _make_ciphertexts(engine: str, count: int, bits: int):
+    # (16진수 암호문 목록, modulus 16진수, 평문 합, 복호화 함수) — 서버 측정과 무관하게 미리 암호화
+    values = np.frombuffer(os.urandom(4 * count), dtype=np.uint32) % 101
+    if engine == "paillier":
+        from paillier import RandomnessPool, generate_keypair
+
+        pk, sk = generate_keypair(bits)
+        pool = RandomnessPool(pk, private_key=sk)
+        cts = pk.encrypt_many(values.tolist(), pool)
+        return [format(c, "x") for c in cts], format(pk.n2, "x"), int(values.sum()), sk.decrypt
+
+    from toy_he import decrypt_sum, encrypt_batch
+
+    key = 1 << bits
+    cts = encrypt_batch(values.astype(object), key)
+    return [format(int(c), "x") for c in cts], None, int(values.sum()), lambda total: decrypt_sum(total, key)
+
+
+async def run_load(
+    host: str,
+    port: int,
+    engine: str = "paillier",
+    clients: int = 32,
+    batches_per_client: int = 10,
+    batch_size: int = 256,
+    bits: int = 1024,
+) -> dict:
+    """clients개 클라이언트가 동시에 batches_per_client번씩 batch_size개 암호문을 보내고, 결과를 검산한다."""
+    total = clients * batches_per_client * batch_size
+    cts, modulus_hex, plain_sum, decrypt = _make_ciphertexts(engine, total, bits)
+    round_name = f"load-{os.getpid()}-{time.time_ns()}"
+
+    batches = [cts[i : i + batch_size] for i in range(0, total, batch_size)]
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(_client(host, port, batches[c::clients], modulus_hex, round_name, latencies) for c in range(clients))
+    )
+    elapsed = time.perf_counter() - t0
+
+    response = await _request(host, port, {"op": "total", "round": round_name})
+    await _request(host, port, {"op": "reset", "round": round_name})
+    ms = np.array(latencies) * 1000
+    return {
+        "engine": engine,
+        "clients": clients,
+        "requests": len(latencies),
+        "ciphertexts": total,
+        "seconds": elapsed,
+        "ciphertexts_per_sec": total / elapsed,
+        "latency_ms": {f"p{q}": float(np.percentile(ms, q)) for q in (50, 95, 99)},
+        "decrypted_total": decrypt(int(response["total"], 16)),
+        "plain_total": plain_sum,
+    }
+
+
+async def run_demo(workers: int | None = None, **load_options) -> dict:
+    """같은 프로세스 안에서 서버를 빈 포트에 띄우고 부하 생성기를 돌린 뒤 서버를 닫는다."""
+    server = AggregationServer(workers)
+    port = await server.start(DEFAULT_HOST, 0)
+    try:
+        return await run_load(DEFAULT_HOST, port, **load_options)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 암호문 집계 서버 / 부하 생성기")
+    parser.add_argument("mode", choices=["serve", "load", "demo"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--engine", choices=["paillier", "toy"], default="paillier")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--bits", type=int, default=1024)
+    args = parser.parse_args()
+
+    options = {
+        "engine": args.engine,
+        "clients": args.clients,
+        "batches_per_client": args.batches,
+        "batch_size": args.batch_size,
+        "bits": args.bits,
+    }
+
+    async def serve():
+        server = AggregationServer(args.workers)
+        port = await server.start(DEFAULT_HOST, args.port)
+        print(f"집계 서버: {DEFAULT_HOST}:{port} (workers={server.workers})")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    if args.mode == "serve":
+        asyncio.run(serve())
+    else:
+        report = asyncio.run(
+            run_load(DEFAULT_HOST, args.port, **options) if args.mode == "load" else run_demo(args.workers, **options)
+        )
+        for key, value in report.items():
+            print(f"{key}: {value}")
@@ -0,0 +1,220 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from pseudonym import arrow_to_frame
+
+# -------------------------------------------------
+# 가명 데이터 결합 (Record Linkage)
+#  같은 salt로 가명처리한 두 데이터셋을 가명 ID로 이어 붙인다.
+#  - 가명 ID가 hex 문자열 / 8·16·32바이트 키 어느 형식이든
+#    앞 8바이트를 uint64 결합 키로 뽑아 정수 조인을 한다
+#  - 양쪽 ID가 모두 8바이트보다 길면 조인 후 공통 폭만큼 바이트로 맞춰 다시 비교해
+#    앞 8바이트만 같은 우연한 충돌 쌍을 걸러 낸다 (형식 · 대소문자가 달라도 됨)
+#  - method="hash": pandas merge(해시 조인), method="sort": NumPy 정렬-병합 조인
+# -------------------------------------------------
+
+LINK_METHODS = ("hash", "sort")
+
+_HEX_NIBBLE = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _HEX_NIBBLE[_c] = _i
+for _i, _c in enumerate(b"ABCDEF"):
+    _HEX_NIBBLE[_c] = 10 + _i
+
+
+def _read(path: str, columns=None) -> pd.DataFrame:
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        return arrow_to_frame(pq.read_table(path, columns=columns))
+    return pd.read_csv(path, usecols=columns, dtype=str, keep_default_na=False)
+
+
+def id_width(ids: pd.Series) -> int:
+    """가명 ID 컬럼이 담고 있는 다이제스트 바이트 수 (hex 문자열은 가장 짧은 값 기준)."""
+    if ids.dtype == np.uint64:
+        return 8
+    if isinstance(ids.dtype, pd.ArrowDtype):
+        return ids.dtype.pyarrow_dtype.byte_width
+    return int(ids.astype(str).str.len().min()) // 2 if len(ids) else 0
+
+
+def id_bytes(ids: pd.Series, width: int) -> np.ndarray:
+    """가명 ID 컬럼(hex 문자열 · uint64 · 고정 폭 바이너리)을 앞 width바이트의 (행 수, width) uint8 배열로 바꾼다.
+
+    세 형식 모두 같은 SHA-256 다이제스트의 앞부분이라, 같은 width로 자르면 형식이 달라도 그대로 비교할 수 있다.
+    """
+    if ids.dtype == np.uint64:
+        if width > 8:
+            raise ValueError("uint64 가명 ID는 8바이트까지만 비교할 수 있습니다.")
+        return ids.to_numpy().astype(">u8").view(np.uint8).reshape(-1, 8)[:, :width]
+
+    if isinstance(ids.dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        arr = pa.array(ids)
+        if isinstance(arr, pa.ChunkedArray):
+            arr = arr.combine_chunks()
+        full = arr.type.byte_width
+        if width > full:
+            raise ValueError(f"{full}바이트 가명 ID는 {full}바이트까지만 비교할 수 있습니다.")
+        raw = np.frombuffer(arr.buffers()[1], dtype=np.uint8)
+        return raw[arr.offset * full : (arr.offset + len(arr)) * full].reshape(-1, full)[:, :width]
+
+    # hex 문자열: 앞 2·width글자를 바이트 배열로 만들고 글자별 16진수 값을 표에서 찾아 두 글자씩 합친다 (대소문자 무관)
+    chars = 2 * width
+    heads = ids.astype(str).str.slice(0, chars)
+    if len(heads) and heads.str.len().min() < chars:
+        raise ValueError(f"{width}바이트보다 짧은 hex 가명 ID가 있습니다.")
+    nibbles = _HEX_NIBBLE[np.array(heads.tolist(), dtype=f"S{chars}").view(np.uint8).reshape(-1, chars)]
+    if (nibbles == 255).any():
+        raise ValueError("가명 ID 컬럼에 16진수가 아닌 값이 있습니다.")
+    return (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+
+
+def join_keys(ids: pd.Series) -> np.ndarray:
+    """가명 ID 컬럼(hex 문자열 · uint64 · 고정 폭 바이너리)에서 앞 8바이트를 uint64로 꺼낸다."""
+    if ids.dtype == np.uint64:
+        return ids.to_numpy()
+    return np.ascontiguousarray(id_bytes(ids, 8)).view(">u8").ravel().astype(np.uint64)
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # [starts[i], starts[i] + counts[i]) 구간들을 이어 붙인 인덱스 배열 (파이썬 반복 없이)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+def _sort_merge(left_keys: np.ndarray, right_keys: np.ndarray):
+    lo = np.argsort(left_keys, kind="stable")
+    ro = np.argsort(right_keys, kind="stable")
+    lu, l_start, l_cnt = np.unique(left_keys[lo], return_index=True, return_counts=True)
+    ru, r_start, r_cnt = np.unique(right_keys[ro], return_index=True, return_counts=True)
+    _, li, ri = np.intersect1d(lu, ru, assume_unique=True, return_indices=True)
+
+    # 같은 키가 양쪽에 여러 번 있으면 (왼쪽 행 수 × 오른쪽 행 수) 쌍을 모두 만든다
+    lc, rc = l_cnt[li], r_cnt[ri]
+    left_pos = np.repeat(_ranges(l_start[li], lc), np.repeat(rc, lc))
+    right_pos = _ranges(np.repeat(r_start[ri], lc), np.repeat(rc, lc))
+    return lo[left_pos], ro[right_pos]
+
+
+def _hash_join(left_keys: np.ndarray, right_keys: np.ndarray):
+    left = pd.DataFrame({"k": left_keys, "l": np.arange(len(left_keys))})
+    right = pd.DataFrame({"k": right_keys, "r": np.arange(len(right_keys))})
+    pairs = left.merge(right, on="k", how="inner", sort=False)
+    return pairs["l"].to_numpy(), pairs["r"].to_numpy()
+
+
+def _with_ids(frame: pd.DataFrame, id_col: str) -> pd.DataFrame:
+    # 가명 ID가 빈 행(원본 주민번호 · 전화번호가 없던 행)은 결합하지 않는다. CSV에서는 빈 문자열로 읽힌다
+    ids = frame[id_col]
+    keep = ids.notna()
+    if ids.dtype == object or isinstance(ids.dtype, pd.StringDtype):
+        keep &= ids.astype(str).str.strip() != ""
+    frame = frame[keep.to_numpy()].reset_index(drop=True)
+    if isinstance(frame[id_col].dtype, pd.UInt64Dtype):
+        frame[id_col] = frame[id_col].to_numpy(dtype=np.uint64)
+    return frame
+
+
+def link_frames(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: str = "가명ID",
+    right_on: str | None = None,
+    method: str = "hash",
+    suffixes=("_왼쪽", "_오른쪽"),
+):
+    """두 DataFrame을 가명 ID로 내부 결합하고 (결합 결과, 통계 dict)를 돌려준다."""
+    if method not in LINK_METHODS:
+        raise ValueError(f"method는 {LINK_METHODS} 중 하나여야 합니다: {method}")
+    right_on = right_on or left_on
+    timings = {}
+
+    t0 = time.perf_counter()
+    left = _with_ids(left, left_on)
+    right = _with_ids(right, right_on)
+    left_keys = join_keys(left[left_on])
+    right_keys = join_keys(right[right_on])
+    timings["키 준비"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    join = _hash_join if method == "hash" else _sort_merge
+    li, ri = join(left_keys, right_keys)
+    timings["조인"] = time.perf_counter() - t0
+
+    # 양쪽이 모두 8바이트보다 긴 ID면 공통 폭만큼 바이트로 맞춰 같은 쌍만 남긴다 (앞 8바이트 충돌 제거)
+    # hex ↔ 바이너리, 16 ↔ 32바이트, 대 ↔ 소문자처럼 형식이 달라도 같은 다이제스트면 같은 바이트가 된다
+    t0 = time.perf_counter()
+    collisions = 0
+    width = min(id_width(left[left_on]), id_width(right[right_on]))
+    if width > 8:
+        same = (id_bytes(left[left_on], width)[li] == id_bytes(right[right_on], width)[ri]).all(axis=1)
+        collisions = int(len(same) - same.sum())
+        li, ri = li[same], ri[same]
+    timings["검증"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    left_part = left.take(li).reset_index(drop=True)
+    right_part = right.drop(columns=[right_on]).take(ri).reset_index(drop=True)
+    overlap = set(left_part.columns) & set(right_part.columns)
+    linked = pd.concat(
+        [
+            left_part.rename(columns={c: c + suffixes[0] for c in overlap}),
+            right_part.rename(columns={c: c + suffixes[1] for c in overlap}),
+        ],
+        axis=1,
+    )
+    timings["결과 구성"] = time.perf_counter() - t0
+
+    stats = {
+        "method": method,
+        "left_rows": len(left),
+        "right_rows": len(right),
+        "matched_pairs": len(li),
+        "matched_left_rows": int(np.unique(li).size),
+        "matched_right_rows": int(np.unique(ri).size),
+        "prefix_collisions": collisions,
+        "seconds": {k: round(v, 4) for k, v in timings.items()},
+    }
+    return linked, stats
+
+
+def link_files(left_path: str, right_path: str, id_col: str = "가명ID", method: str = "hash", columns=None):
+    """두 파일(CSV/Parquet)을 읽어 link_frames를 실행한다. columns를 주면 그 컬럼만 읽는다."""
+    t0 = time.perf_counter()
+    read_cols = None if columns is None else [id_col, *[c for c in columns if c != id_col]]
+    left = _read(left_path, read_cols)
+    right = _read(right_path, read_cols)
+    load_seconds = time.perf_counter() - t0
+
+    linked, stats = link_frames(left, right, id_col, method=method)
+    stats["seconds"] = {"읽기": round(load_seconds, 4), **stats["seconds"]}
+    return linked, stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="같은 salt로 가명처리한 두 파일을 가명 ID로 결합")
+    parser.add_argument("left")
+    parser.add_argument("right")
+    parser.add_argument("--id-col", default="가명ID")
+    parser.add_argument("--method", choices=LINK_METHODS, default="hash")
+    parser.add_argument("--out", help="결합 결과를 저장할 CSV/Parquet 경로")
+    args = parser.parse_args()
+
+    linked_df, link_stats = link_files(args.left, args.right, args.id_col, args.method)
+    for key, value in link_stats.items():
+        print(f"{key}: {value}")
+    if args.out:
+        if args.out.lower().endswith((".parquet", ".pq")):
+            linked_df.to_parquet(args.out, index=False)
+        else:
+            linked_df.to_csv(args.out, index=False, encoding="utf-8-sig")
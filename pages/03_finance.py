@@ -1,14 +1,41 @@
 import streamlit as st
 
-import yfinance as yf
-
 import pandas as pd
 
 import plotly.graph_objs as go
 
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+
+import time
+
+import os
+
+from downsample import downsample_frame
+
+from price_analytics import DEFAULT_WINDOW, analyze
+
+from price_matrix import DEFAULT_DIR as MATRIX_DIR
+
+from price_matrix import DEFAULT_UNIVERSE, PriceMatrix, load_universe
+
+from price_provider import DEFAULT_PROVIDER, fetch_each, make_provider
+
+from price_store import DEFAULT_DIR, PriceStore
+
+# 같은 서버 프로세스의 모든 세션이 결과를 함께 쓴다. TTL이 지나면 로컬 저장소에서 다시 읽고 빠진 며칠치만 받는다
+PRICE_TTL = 60 * 60
+
+# 그리는 점이 이보다 많으면 SVG 대신 WebGL(Scattergl) 선을 쓴다
 
-st.title("글로벌 시가총액 TOP10 기업의 최근 1년간 주가 변화")
+WEBGL_MIN_POINTS = 5_000
+
+# 받는 중에는 차트를 이 간격(초)보다 자주 다시 그리지 않는다 (다 받은 뒤 한 번 더 그림)
+
+# 도착할 때마다 전체 표 · LTTB · 그림을 다시 만들면 종목 수백 개에서 O(n²)이 된다
+
+REDRAW_SECONDS = 0.5
+
+st.title("글로벌 기업의 최근 1년간 주가 변화")
 
 top10 = {
 
@@ -34,92 +61,394 @@ top10 = {
 
 }
 
-st.write("조회 기업:")
+# 종목 유니버스: TICKER_UNIVERSE 파일(ticker, name)이 있으면 그것을, 없으면 시가총액 TOP10
+
+# 종가 행렬: PRICE_MATRIX_DIR에 미리 만든 메모리 맵 행렬이 있으면 그 안의 종목은 다운로드 없이 열만 잘라 쓴다
+
+# (파일 수정 시각을 캐시 키에 넣어 새로 만들면 다시 연다)
+
+@st.cache_resource
+
+def ticker_universe(path: str, mtime: float) -> pd.Series:
+
+    return load_universe(path)
+
+@st.cache_resource
+
+def price_matrix(root: str, mtime: float) -> PriceMatrix:
+
+    return PriceMatrix(root)
+
+if os.path.exists(DEFAULT_UNIVERSE):
+
+    names = ticker_universe(DEFAULT_UNIVERSE, os.path.getmtime(DEFAULT_UNIVERSE))
+
+else:
+
+    names = pd.Series(top10)
+
+selected = st.multiselect(
+
+    f"조회 기업 (전체 {len(names):,}종목 중 검색)",
+
+    names.index,
+
+    default=[t for t in top10 if t in names.index],
+
+    format_func=lambda t: f"{names.get(t, t)} ({t})",
+
+)
+
+if not selected:
+
+    st.info("조회할 기업을 골라 주세요.")
+
+    st.stop()
+
+# 데이터 출처: PRICE_PROVIDER 환경 변수가 기본값 ("yfinance", "synthetic", "local:<디렉터리>")
+
+provider_options = list(dict.fromkeys([DEFAULT_PROVIDER, "yfinance", "synthetic"]))
+
+provider_spec = st.sidebar.selectbox("주가 데이터 출처", provider_options, help="synthetic은 네트워크 없이 만든 가짜 주가(GBM)입니다.")
+
+# 종가 행렬은 만든 공급자가 지금 고른 출처와 같을 때만 쓴다
+
+matrix = None
+
+if PriceMatrix.exists(MATRIX_DIR):
+
+    matrix = price_matrix(MATRIX_DIR, os.path.getmtime(os.path.join(MATRIX_DIR, "index.json")))
+
+    if matrix.provider != provider_spec:
+
+        matrix = None
+
+@st.cache_resource
+
+def price_source(spec: str):
+
+    provider = make_provider(spec)
+
+    if provider.name == "local":
+
+        # 로컬 미러는 이미 파일이라 그대로 읽는다
+
+        return provider
+
+    # 원격 · 합성 공급자는 공급자별 로컬 저장소를 거쳐 빠진 구간만 받는다
+
+    return PriceStore(os.path.join(DEFAULT_DIR, provider.name), provider)
+
+@st.cache_resource
+
+def fetched_prices() -> dict:
+
+    # (출처, 티커, 시작, 끝) → (받은 시각, 표). 모든 세션이 함께 쓰고 PRICE_TTL이 지나면 다시 받는다
+
+    # 캐시 확인 · 저장은 스크립트 스레드에서만 하고, 작업 스레드에는 공급자 fetch만 보낸다 (Streamlit 호출을 스레드 밖으로)
+
+    # 캐시 키가 매 실행 바뀌지 않도록 시각이 아닌 날짜로 받는다. 티커별로 저장해 실패한 티커만 다음에 다시 받는다
+
+    return {}
+
+def close_series(frame):
+
+    # 수정종가(Adj Close)가 있으면 그것을, 없으면 종가(Close)를 쓴다
+
+    for field in ("Adj Close", "Close"):
+
+        if field in frame.columns and frame[field].notna().any():
+
+            return frame[field]
+
+    return None
+
+def line_figure(table, max_points: int, title: str, yaxis_title: str):
+
+    # 종목마다 LTTB로 max_points개까지만 줄여 그린다 → 기간 · 봉 간격과 상관없이 전송량이 거의 일정
+
+    series = downsample_frame(table, max_points)
+
+    drawn = sum(len(s) for s in series.values())
+
+    trace = go.Scattergl if drawn > WEBGL_MIN_POINTS else go.Scatter
+
+    fig = go.Figure()
+
+    for ticker in table.columns:
+
+        fig.add_trace(trace(
+
+            x=series[ticker].index, y=series[ticker].to_numpy(), mode='lines', name=names.get(ticker, ticker)
+
+        ))
+
+    fig.update_layout(
+
+        title=title,
+
+        xaxis_title='날짜',
+
+        yaxis_title=yaxis_title,
+
+        legend_title='기업명',
+
+        height=600
+
+    )
+
+    return fig, drawn
+
+end = date.today() + timedelta(days=1)
 
-st.write(", ".join([f"{v}({k})" for k, v in top10.items()]))
+start = end - timedelta(days=366)
 
-end = datetime.today()
+# 차트 해상도(가로 픽셀 수 ≈ 종목당 점 수)와 확대 구간. 확대하면 그 구간만 다시 줄이므로 좁히면 원본 해상도가 된다
 
-start = end - timedelta(days=365)
+max_points = st.sidebar.slider("차트 가로 해상도 (종목당 점 수)", 200, 3000, 1200, step=100)
 
-with st.spinner("데이터를 가져오고 있습니다..."):
+zoom = st.slider("확대 구간", min_value=start, max_value=end - timedelta(days=1), value=(start, end - timedelta(days=1)), format="YYYY-MM-DD")
 
-    data = yf.download(list(top10.keys()), start=start, end=end, group_by='ticker', auto_adjust=True)
+progress = st.empty()
 
-# 데이터 구조 자동 감지
+chart = st.empty()
 
-if isinstance(data.columns, pd.MultiIndex):
+def draw(closes):
 
-    # 야후파이낸스 종목 여러 개 → MultiIndex
+    adj_close = pd.DataFrame(closes).reindex(columns=[t for t in selected if t in closes]).sort_index().ffill()
 
-    # 구조 확인: 보통 ('AAPL', 'Adj Close'), ...
+    visible = adj_close.loc[pd.Timestamp(zoom[0]) : pd.Timestamp(zoom[1])]
 
-    # level 0: 티커, level 1: 속성
+    fig, drawn = line_figure(visible, max_points, '선택한 기업의 주가 변화 (최근 1년)', '종가(USD)')
 
-    if "Adj Close" in data.columns.get_level_values(1):
+    chart.plotly_chart(fig, use_container_width=True)
 
-        # 각 티커별 "Adj Close"만 추출
+    return visible, drawn
 
-        adj_close = pd.DataFrame({ticker: data[ticker]['Adj Close'] for ticker in top10 if ticker in data.columns.get_level_values(0)})
+# 종가 행렬에 있는 종목은 고른 열만 잘라 바로 그린다 (유니버스 크기와 무관하게 고른 열만 메모리로 읽음)
 
-    elif "Close" in data.columns.get_level_values(1):
+# 행렬은 만든 날의 스냅숏이라, 행렬 마지막 날짜 다음 날부터는 아래에서 다른 종목과 함께 받아 이어 붙인다
 
-        adj_close = pd.DataFrame({ticker: data[ticker]['Close'] for ticker in top10 if ticker in data.columns.get_level_values(0)})
+closes = {}
+
+failed = {}
+
+from_matrix = {}
+
+delta_start = start
+
+last_draw = float("-inf")
+
+pending_draw = False
+
+if matrix is not None:
+
+    in_matrix = matrix.select(selected, start, end)
+
+    from_matrix = {t: in_matrix[t] for t in in_matrix.columns if in_matrix[t].notna().any()}
+
+    closes = dict(from_matrix)
+
+    delta_start = max(start, (matrix.dates[-1] + timedelta(days=1)).date())
+
+    if closes:
+
+        visible, drawn = draw(closes)
+
+        last_draw = time.monotonic()
+
+# 행렬에 없는 종목은 전체 기간, 행렬 종목은 빠진 최근 구간만 티커별로 동시에 받아 도착하는 대로 (간격을 두고) 차트를 다시 그린다
+
+def price_key(ticker):
+
+    return provider_spec, ticker, delta_start if ticker in from_matrix else start, end
+
+price_cache = fetched_prices()
+
+now = time.monotonic()
+
+for key in [k for k, (fetched_at, _) in list(price_cache.items()) if now - fetched_at >= PRICE_TTL]:
+
+    price_cache.pop(key, None)
+
+cached = {}
+
+to_fetch = []
+
+for ticker in selected:
+
+    if ticker in from_matrix and delta_start >= end:
+
+        continue
+
+    if (hit := price_cache.get(price_key(ticker))) is not None:
+
+        cached[ticker] = hit[1]
 
     else:
 
-        st.error("데이터에서 'Adj Close' 또는 'Close' 값을 찾을 수 없습니다.")
+        to_fetch.append(ticker)
 
-        st.write(data.head())
+source = price_source(provider_spec)
 
-        st.stop()
+def fetch_range(ticker, first, last):
 
-else:
+    # 작업 스레드에서 도는 부분: Streamlit을 부르지 않고 공급자(저장소)만 부른다
+
+    return source.fetch(ticker, delta_start if ticker in from_matrix else first, last)
+
+def arrivals():
+
+    yield from ((ticker, frame, None) for ticker, frame in cached.items())
+
+    for ticker, frame, error in fetch_each(fetch_range, to_fetch, start, end):
+
+        if error is None:
 
-    # 단일 컬럼 (종목 1개 등) 혹은 Wide-Format
+            price_cache[price_key(ticker)] = (time.monotonic(), frame)
 
-    if "Adj Close" in data.columns:
+        yield ticker, frame, error
 
-        adj_close = data["Adj Close"].to_frame()
+for ticker, frame, error in arrivals():
 
-    elif "Close" in data.columns:
+    if error is not None:
 
-        adj_close = data["Close"].to_frame()
+        stale = " (종가 행렬 값까지만 표시)" if ticker in from_matrix else ""
+
+        failed[ticker] = f"{type(error).__name__}: {error}{stale}"
+
+    elif ticker in from_matrix:
+
+        # 최근 구간이 비어 있으면(휴장 등) 행렬 값만으로 충분하다
+
+        close = close_series(frame) if not frame.empty else None
+
+        if close is not None:
+
+            closes[ticker] = pd.concat([from_matrix[ticker].astype("float64"), close.loc[close.index > from_matrix[ticker].index[-1]]])
+
+    elif frame.empty:
+
+        failed[ticker] = "요청한 기간의 데이터가 없습니다."
+
+    elif (close := close_series(frame)) is None:
+
+        failed[ticker] = "데이터에서 'Adj Close' 또는 'Close' 값을 찾을 수 없습니다."
 
     else:
 
-        st.error("데이터에서 'Adj Close' 또는 'Close' 값을 찾을 수 없습니다.")
+        closes[ticker] = close
 
-        st.write(data.head())
+    progress.caption(f"데이터를 가져오고 있습니다... {len(set(closes) | set(failed))}/{len(selected)}")
 
-        st.stop()
+    pending_draw = pending_draw or ticker in closes
 
-adj_close = adj_close.fillna(method="ffill")
+    # 첫 종목은 바로, 그다음부터는 REDRAW_SECONDS마다 모아서 다시 그린다
 
-fig = go.Figure()
+    if pending_draw and time.monotonic() - last_draw >= REDRAW_SECONDS:
 
-for ticker, name in top10.items():
+        visible, drawn = draw(closes)
 
-    if ticker in adj_close.columns:
+        last_draw, pending_draw = time.monotonic(), False
 
-        fig.add_trace(go.Scatter(
+if pending_draw:
 
-            x=adj_close.index, y=adj_close[ticker], mode='lines', name=name
+    visible, drawn = draw(closes)
 
-        ))
+progress.empty()
 
-fig.update_layout(
+if closes:
 
-    title='글로벌 시가총액 TOP10 기업 주가 변화 (최근 1년)',
+    st.caption(f"원본 {visible.notna().sum().sum():,}점 → 그린 점 {drawn:,}점 ({'WebGL' if drawn > WEBGL_MIN_POINTS else 'SVG'})")
 
-    xaxis_title='날짜',
+if failed:
 
-    yaxis_title='종가(USD)',
+    st.warning("가져오지 못한 데이터가 있는 종목: " + ", ".join(f"{names.get(t, t)}({t})" for t in failed))
 
-    legend_title='기업명',
+    with st.expander("실패 사유"):
 
-    height=600
+        st.table(pd.DataFrame({"티커": list(failed), "사유": list(failed.values())}))
 
-)
+if not closes:
+
+    st.error("표시할 주가 데이터가 없습니다.")
+
+    st.stop()
+
+# 확대 구간에 거래일이 2일 미만이면(예: 토·일만 고른 경우) 수익률을 낼 수 없으므로 분석 패널을 건너뛴다
+
+if len(visible) < 2:
+
+    st.info("분석 지표는 확대 구간에 거래일이 2일 이상 있어야 계산됩니다. 구간을 넓혀 주세요.")
+
+    st.stop()
+
+# ---- 분석 패널 ----
+
+@st.cache_data(ttl=PRICE_TTL, show_spinner=False, max_entries=32)
+
+def cached_analytics(spec: str, matrix_version, tickers: tuple, first: date, last: date, window: int, _closes: pd.DataFrame) -> dict:
+
+    # (출처, 종가 행렬 버전, 종목 묶음, 기간, 변동성 창)마다 한 번만 계산하고, 보기를 바꿀 때는 캐시에서 꺼내 그리기만 한다
+
+    return analyze(_closes, window)
+
+st.subheader("분석")
+
+ANALYTICS_VIEWS = {
+
+    "100 기준 수익률": ("rebased", "첫날 종가 = 100"),
+
+    "로그수익률": ("log_returns", "일간 로그수익률"),
+
+    "이동 변동성": ("volatility", "연환산 변동성"),
+
+    "낙폭": ("drawdown", "최고가 대비 하락률"),
+
+    "상관관계": ("correlation", None),
+
+}
+
+col_view, col_window = st.columns([3, 1])
+
+with col_view:
+
+    view = st.radio("보기", list(ANALYTICS_VIEWS), horizontal=True)
+
+with col_window:
+
+    vol_window = st.number_input("변동성 창 (거래일)", 5, 250, DEFAULT_WINDOW, step=5)
+
+analytics = cached_analytics(provider_spec, matrix.version if matrix is not None else None, tuple(visible.columns), zoom[0], zoom[1], int(vol_window), visible)
+
+key, yaxis_title = ANALYTICS_VIEWS[view]
+
+if key == "correlation":
+
+    corr = analytics["correlation"]
+
+    labels = [names.get(t, t) for t in corr.columns]
+
+    heatmap = go.Figure(go.Heatmap(
+
+        z=corr.to_numpy(), x=labels, y=labels, zmin=-1, zmax=1, colorscale='RdBu', text=corr.round(2).to_numpy(), texttemplate='%{text}'
+
+    ))
+
+    heatmap.update_layout(title='일간 로그수익률 상관계수', height=600)
+
+    st.plotly_chart(heatmap, use_container_width=True)
+
+else:
+
+    fig, _ = line_figure(analytics[key], max_points, view, yaxis_title)
+
+    if key in ("volatility", "drawdown"):
+
+        fig.update_yaxes(tickformat='.0%')
+
+    st.plotly_chart(fig, use_container_width=True)
+
+summary = analytics["summary"].rename(index=lambda t: f"{names.get(t, t)}({t})")
 
-st.plotly_chart(fig, use_container_width=True)
+st.dataframe(summary.round(2), use_container_width=True)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 주가 분석 (finance 페이지 분석 패널)
+#  날짜 × 종목 종가 표를 NumPy 행렬로 한 번 바꿔 모든 지표를 열 단위로 한꺼번에 계산한다
+#  - 100 기준 수익률: 종목마다 첫 유효 종가를 100으로 맞춘 값 → 가격대가 다른 종목 비교용
+#  - 로그수익률: log(P_t / P_{t-1})
+#  - 이동 변동성: 로그수익률의 window일 이동 표준편차 × √252 (연환산), 누적합으로 계산
+#  - 낙폭: 지금까지의 최고가 대비 하락률, 최대 낙폭은 그 최솟값
+#  - 상관관계: 로그수익률끼리의 상관계수 행렬 (결측은 짝마다 빼고, 행렬 곱으로 한꺼번에)
+# -------------------------------------------------
+
+TRADING_DAYS = 252
+DEFAULT_WINDOW = 20
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    # 결측을 뺀 이동 표본표준편차 (누적합 · 제곱 누적합의 차로 창 하나당 O(1))
+    # 열 평균을 먼저 빼 두면 제곱 누적합의 자릿수 손실이 줄어든다 (표준편차는 그대로)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    s1 = np.vstack([zeros, np.cumsum(x, axis=0)])
+    s2 = np.vstack([zeros, np.cumsum(x * x, axis=0)])
+    cnt = np.vstack([zeros, np.cumsum(valid, axis=0)])
+    n = cnt[window:] - cnt[:-window]
+    mean = (s1[window:] - s1[:-window]) / np.maximum(n, 1)
+    var = ((s2[window:] - s2[:-window]) - n * mean * mean) / np.maximum(n - 1, 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    std[n < max(window // 2, 2)] = np.nan
+    return np.vstack([np.full((window - 1, values.shape[1]), np.nan), std])
+
+
+def _pairwise_corr(values: np.ndarray) -> np.ndarray:
+    # 결측을 짝마다 뺀 상관계수 (pandas DataFrame.corr와 같은 값)를 행렬 곱 몇 번으로 계산한다
+    valid = ~np.isnan(values)
+    m = valid.astype(np.float64)
+    x = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+    n = m.T @ m
+    sx = x.T @ m  # (i, j): i, j가 모두 있는 행에서 i의 합
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (n * sxy - sx * sx.T) / np.sqrt((n * sxx - sx * sx) * (n * sxx.T - sx.T * sx.T))
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def analyze(prices: pd.DataFrame, window: int = DEFAULT_WINDOW) -> dict:
+    """종가 표에서 분석 지표를 모두 계산해 {이름: 표}로 돌려준다."""
+    p = prices.to_numpy(dtype=np.float64)
+    index, columns = prices.index, prices.columns
+
+    def frame(values):
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    if len(p) == 0:
+        # 행이 없으면 (예: 주말만 남은 확대 구간) 같은 열의 빈 결과
+        summary = pd.DataFrame(np.nan, index=columns, columns=["기간 수익률(%)", "연환산 변동성(%)", "최대 낙폭(%)"])
+        corr = pd.DataFrame(np.nan, index=columns, columns=columns)
+        return {
+            "rebased": frame(p),
+            "log_returns": frame(p),
+            "volatility": frame(p),
+            "drawdown": frame(p),
+            "correlation": corr,
+            "summary": summary,
+        }
+
+    # 종목마다 첫 유효 종가 (상장 전 구간은 결측)
+    first_row = np.argmax(~np.isnan(p), axis=0)
+    base = p[first_row, np.arange(p.shape[1])]
+    rebased = p / base * 100
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_p = np.log(p)
+    log_ret = np.vstack([np.full((1, p.shape[1]), np.nan), np.diff(log_p, axis=0)])
+    vol = _rolling_std(log_ret, window) * np.sqrt(TRADING_DAYS) if len(p) >= window else np.full_like(p, np.nan)
+
+    peak = np.fmax.accumulate(p, axis=0)
+    drawdown = p / peak - 1
+
+    # 종목마다 마지막 유효 종가
+    last_row = len(p) - 1 - np.argmax(~np.isnan(p[::-1]), axis=0)
+    last = p[last_row, np.arange(p.shape[1])]
+    log_returns = frame(log_ret)
+    summary = pd.DataFrame(
+        {
+            "기간 수익률(%)": (last / base - 1) * 100,
+            "연환산 변동성(%)": np.nanstd(log_ret, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100,
+            "최대 낙폭(%)": np.nanmin(drawdown, axis=0) * 100,
+        },
+        index=columns,
+    )
+    return {
+        "rebased": frame(rebased),
+        "log_returns": log_returns,
+        "volatility": frame(vol),
+        "drawdown": frame(drawdown),
+        "correlation": pd.DataFrame(_pairwise_corr(log_ret), index=columns, columns=columns),
+        "summary": summary,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="분석 지표 계산 시간 측정 (랜덤워크 종가)")
+    parser.add_argument("--rows", type=int, default=2_520)
+    parser.add_argument("--cols", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    closes = pd.DataFrame(
+        100 * np.exp(rng.normal(0, 0.02, (args.rows, args.cols)).cumsum(axis=0)),
+        index=pd.bdate_range("2015-01-01", periods=args.rows),
+    )
+    t0 = time.perf_counter()
+    result = analyze(closes)
+    print(f"{args.rows:,}일 × {args.cols}종목: {time.perf_counter() - t0:.3f}초")
+    print(result["summary"].head().round(2))
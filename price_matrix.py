@@ -0,0 +1,192 @@
+import json
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 종목 유니버스 + 메모리 맵 종가 행렬 (finance 페이지 대규모 종목용)
+#  - 유니버스: CSV/Parquet 파일 (ticker, name 컬럼. name은 없어도 됨)
+#  - 종가 행렬: 날짜 × 종목 float32 행렬 하나를 디스크 파일로 두고 np.memmap으로 연다
+#    · 열 우선(Fortran) 순서로 저장해 종목 하나의 시계열이 파일에서 연속 구간 → 기간 자르기 · 이어진 종목 선택은 복사 없는 뷰
+#      (떨어진 종목을 고르면 그 열만 한 번 복사된다)
+#    · 페이지가 실제로 건드리는 것은 고른 종목 열의 페이지뿐이라 유니버스가 수천 종목이어도 메모리가 늘지 않는다
+#  - 디렉터리 구성: index.json (종목 목록 · 모양 · 행렬 파일 이름) + dates-<버전>.npy + closes-<버전>.f32
+#    새로 만들 때는 새 버전 파일을 다 쓴 뒤 index.json만 바꿔치기해, 열려 있는 이전 행렬을 읽는 쪽이 깨지지 않는다
+#  - 날짜 축은 영업일 달력 (휴장일은 결측, 그릴 때 ffill)
+#  - index.json에 만든 공급자와 끝 날짜를 남긴다. 행렬은 만든 시점의 스냅숏이라,
+#    읽는 쪽은 같은 공급자일 때만 쓰고 마지막 날짜 이후는 따로 받아 이어 붙여야 한다
+# -------------------------------------------------
+
+DEFAULT_DIR = os.environ.get("PRICE_MATRIX_DIR", ".price_matrix")
+DEFAULT_UNIVERSE = os.environ.get("TICKER_UNIVERSE", "universe.csv")
+_INDEX = "index.json"
+_KEEP_VERSIONS = 2
+
+
+def load_universe(path: str = DEFAULT_UNIVERSE) -> pd.Series:
+    """유니버스 파일을 읽어 티커 → 이름 Series로 돌려준다 (이름이 없으면 티커)."""
+    if path.lower().endswith((".parquet", ".pq")):
+        table = pd.read_parquet(path)
+    else:
+        table = pd.read_csv(path, dtype=str)
+    table.columns = [str(c).strip().lower() for c in table.columns]
+    tickers = table["ticker"].str.strip().str.upper()
+    names = table["name"].fillna(tickers) if "name" in table.columns else tickers
+    universe = pd.Series(names.to_numpy(), index=tickers.to_numpy(), name="name")
+    return universe[~universe.index.duplicated()]
+
+
+class PriceMatrix:
+    def __init__(self, root: str = DEFAULT_DIR):
+        self.root = root
+        with open(os.path.join(root, _INDEX), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.version = meta["version"]
+        self.provider = meta.get("provider")
+        self.end = date.fromisoformat(meta["end"]) if meta.get("end") else None
+        self.tickers = pd.Index(meta["tickers"])
+        self.dates = pd.DatetimeIndex(np.load(os.path.join(root, meta["dates"])))
+        self.closes = np.memmap(
+            os.path.join(root, meta["closes"]),
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self.dates), len(self.tickers)),
+            order="F",
+        )
+
+    @staticmethod
+    def exists(root: str = DEFAULT_DIR) -> bool:
+        return os.path.exists(os.path.join(root, _INDEX))
+
+    @property
+    def nbytes(self) -> int:
+        return self.closes.size * self.closes.itemsize
+
+    def _rows(self, start: date | None, end: date | None) -> slice:
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start))
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end))
+        return slice(lo, hi)
+
+    def columns(self, tickers, start: date | None = None, end: date | None = None) -> dict:
+        """고른 종목 · 기간([start, end))의 종가를 {티커: 행렬 뷰(복사 없음)}로 돌려준다. 없는 티커는 빠진다."""
+        rows = self._rows(start, end)
+        positions = self.tickers.get_indexer(tickers)
+        return {t: self.closes[rows, j] for t, j in zip(tickers, positions) if j >= 0}
+
+    def select(self, tickers, start: date | None = None, end: date | None = None) -> pd.DataFrame:
+        """고른 종목 · 기간의 날짜 × 종목 종가 표 (읽기 전용). 없는 티커는 빠진다.
+
+        고른 종목이 행렬에서 이어진 열이면 메모리 맵 뷰 그대로(복사 없음), 아니면 고른 열만 한 번 복사한다.
+        """
+        rows = self._rows(start, end)
+        positions = self.tickers.get_indexer(tickers)
+        found = positions >= 0
+        positions = positions[found]
+        if len(positions) and (np.diff(positions) == 1).all():
+            block = self.closes[rows, positions[0] : positions[-1] + 1]
+        else:
+            block = self.closes[rows][:, positions]
+        return pd.DataFrame(
+            block, index=self.dates[rows], columns=pd.Index(tickers)[found], dtype=np.float32, copy=False
+        )
+
+
+def build(root: str, tickers, fetch, start: date, end: date, provider: str, on_progress=None) -> PriceMatrix:
+    """fetch(티커, 시작, 끝)로 받은 종가를 [start, end) 영업일 × 종목 float32 행렬 파일로 만든다.
+
+    provider는 fetch가 쓰는 공급자 이름("yfinance", "synthetic", "local:<디렉터리>")으로, index.json에 남는다.
+
+    종목 하나씩 받아 바로 행렬 파일에 써서, 만드는 동안에도 메모리에는 종목 하나만 올라간다.
+    받지 못한 종목은 전부 결측인 열로 남는다.
+    """
+    from price_provider import fetch_each
+
+    os.makedirs(root, exist_ok=True)
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    dates = pd.bdate_range(start, pd.Timestamp(end) - timedelta(days=1))
+    version = str(time.time_ns())
+    closes_name, dates_name = f"closes-{version}.f32", f"dates-{version}.npy"
+
+    matrix = np.memmap(
+        os.path.join(root, closes_name), dtype=np.float32, mode="w+", shape=(len(dates), len(tickers)), order="F"
+    )
+    matrix[:] = np.nan
+    column = {t: j for j, t in enumerate(tickers)}
+    failed = []
+    for done, (ticker, frame, error) in enumerate(fetch_each(fetch, tickers, start, end), start=1):
+        if error is None and not frame.empty:
+            field = "Adj Close" if "Adj Close" in frame.columns else "Close"
+            close = frame[field]
+            close.index = pd.DatetimeIndex(close.index).normalize()
+            matrix[:, column[ticker]] = close[~close.index.duplicated(keep="last")].reindex(dates).to_numpy()
+        else:
+            failed.append(ticker)
+        if on_progress is not None:
+            on_progress(done, len(tickers))
+    matrix.flush()
+    del matrix
+    np.save(os.path.join(root, dates_name), dates.to_numpy())
+
+    meta = {
+        "version": version,
+        "provider": provider,
+        "start": pd.Timestamp(start).date().isoformat(),
+        "end": pd.Timestamp(end).date().isoformat(),
+        "tickers": tickers,
+        "closes": closes_name,
+        "dates": dates_name,
+        "failed": failed,
+    }
+    tmp = os.path.join(root, f"{_INDEX}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(root, _INDEX))
+    _prune(root)
+    return PriceMatrix(root)
+
+
+def _prune(root: str) -> None:
+    # 최근 _KEEP_VERSIONS개 버전만 남긴다 (바로 이전 버전은 아직 열려 있을 수 있음)
+    versions = sorted({name.split("-", 1)[1].split(".")[0] for name in os.listdir(root) if name.startswith("closes-")})
+    for old in versions[:-_KEEP_VERSIONS]:
+        for name in (f"closes-{old}.f32", f"dates-{old}.npy"):
+            path = os.path.join(root, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from price_provider import make_provider
+    from price_store import DEFAULT_DIR as STORE_DIR
+    from price_store import PriceStore
+
+    parser = argparse.ArgumentParser(description="종목 유니버스의 종가 행렬(메모리 맵) 만들기")
+    parser.add_argument("--universe", default=DEFAULT_UNIVERSE)
+    parser.add_argument("--provider", default="yfinance", help='"yfinance", "synthetic", "local:<디렉터리>"')
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--out", default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    universe = load_universe(args.universe)
+    provider = make_provider(args.provider)
+    source = provider if provider.name == "local" else PriceStore(os.path.join(STORE_DIR, provider.name), provider)
+    end = date.today() + timedelta(days=1)
+    t0 = time.perf_counter()
+    built = build(
+        args.out,
+        universe.index,
+        source.fetch,
+        end - timedelta(days=args.days + 1),
+        end,
+        args.provider,
+        on_progress=lambda n, total: print(f"\r{n:,}/{total:,}", end="", flush=True),
+    )
+    print(
+        f"\n{len(built.dates):,}일 × {len(built.tickers):,}종목, "
+        f"{built.nbytes / 1e6:.1f}MB, {time.perf_counter() - t0:.1f}초"
+    )
@@ -0,0 +1,231 @@
+import heapq
+import itertools
+import os
+import random
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 주가 데이터 공급자 (finance 페이지 · 주가 저장소용)
+#  모든 공급자는 같은 모양을 돌려준다
+#  - fetch(티커, 시작, 끝)      → 날짜 인덱스 × Open/High/Low/Close/Volume 표 ([시작, 끝) 구간)
+#  - download(티커들, 시작, 끝) → yf.download(group_by='ticker')와 같은 (티커, 속성) 두 단계 컬럼 표
+#  - yfinance : 야후파이낸스 (네트워크 필요)
+#  - local    : 디렉터리의 <티커>.parquet / <티커>.csv 를 읽는 로컬 미러 (주가 저장소 디렉터리를 그대로 가리켜도 됨)
+#  - synthetic: 티커 이름으로 seed를 정하는 기하 브라운 운동(GBM) 가짜 주가, 네트워크 없이 테스트 · 벤치마크용
+#               기준일(2000-01-03)부터 경로를 만들고 잘라 쓰므로 구간을 어떻게 나눠 받아도 같은 값이 나온다
+#  fetch_each: 티커마다 따로 동시에 받아(스레드 풀) 끝나는 순서대로 내보낸다
+#   - 시도마다 제한 시간, 실패 · 시간 초과는 지수 백오프(+지터) 후 재시도, 끝내 실패한 티커는 오류와 함께 알려 준다
+#   - 느린 티커 하나가 나머지를 기다리게 하지 않는다 (시간 초과된 시도는 버리고 스레드는 알아서 끝나게 둔다)
+#   - 버린 시도가 아직 돌고 있는 티커는 재시도를 새로 띄우지 않고 (시도 횟수만 쓰고) 기다린다. 그사이 끝나면 그 결과를 쓴다
+#   - 한 번에 스레드 수만큼만 띄우고, 제한 시간은 시도가 실제로 시작될 때부터 잰다
+#  PRICE_PROVIDER 환경 변수("yfinance", "synthetic", "local:<디렉터리>")로 기본 공급자를 고른다
+# -------------------------------------------------
+
+PROVIDERS = ("yfinance", "local", "synthetic")
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+DEFAULT_PROVIDER = os.environ.get("PRICE_PROVIDER", "yfinance")
+FETCH_TIMEOUT = 15.0
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 0.5
+
+
+class PriceProvider:
+    name = "base"
+
+    def fetch(self, ticker: str, start: date, end: date) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def download(self, tickers, start: date, end: date) -> pd.DataFrame:
+        """티커마다 fetch해 (티커, 속성) 두 단계 컬럼 표로 합친다. 데이터가 없는 티커는 빠진다."""
+        frames = {}
+        for ticker in tickers:
+            frame = self.fetch(ticker, start, end)
+            if not frame.empty:
+                frames[ticker] = frame
+        if not frames:
+            return pd.DataFrame(columns=pd.MultiIndex.from_product([[], FIELDS]))
+        return pd.concat(frames, axis=1)
+
+
+class YFinanceProvider(PriceProvider):
+    name = "yfinance"
+
+    def fetch(self, ticker: str, start: date, end: date) -> pd.DataFrame:
+        import yfinance as yf
+
+        data = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
+        if isinstance(data.columns, pd.MultiIndex):
+            # 버전에 따라 티커 하나여도 (속성, 티커) 두 단계 컬럼으로 온다
+            level = 0 if data.columns.get_level_values(0).isin(FIELDS).any() else 1
+            data.columns = data.columns.get_level_values(level)
+        return data
+
+
+class LocalFileProvider(PriceProvider):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def fetch(self, ticker: str, start: date, end: date) -> pd.DataFrame:
+        base = os.path.join(self.root, ticker.upper())
+        if os.path.exists(base + ".parquet"):
+            frame = pd.read_parquet(base + ".parquet")
+        elif os.path.exists(base + ".csv"):
+            frame = pd.read_csv(base + ".csv", index_col=0, parse_dates=True)
+        else:
+            return pd.DataFrame(columns=FIELDS)
+        frame.index = pd.DatetimeIndex(frame.index)
+        return frame.sort_index().loc[pd.Timestamp(start) : pd.Timestamp(end) - timedelta(days=1)]
+
+
+class SyntheticProvider(PriceProvider):
+    name = "synthetic"
+    ANCHOR = pd.Timestamp("2000-01-03")
+
+    def __init__(self, seed: int = 0, drift: float = 0.08, volatility: float = 0.30):
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+
+    def fetch(self, ticker: str, start: date, end: date) -> pd.DataFrame:
+        days = pd.bdate_range(self.ANCHOR, pd.Timestamp(end) - timedelta(days=1))
+        if len(days) == 0:
+            return pd.DataFrame(columns=FIELDS)
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode())])
+        # 종목마다 시작가 · 변동성을 조금씩 다르게
+        start_price = rng.uniform(20, 500)
+        sigma = self.volatility * rng.uniform(0.5, 1.5)
+        dt = 1 / 252
+        shocks = rng.standard_normal((len(days), 5))
+        log_ret = (self.drift - sigma**2 / 2) * dt + sigma * np.sqrt(dt) * shocks[:, 0]
+        close = start_price * np.exp(np.cumsum(log_ret))
+        open_ = close * np.exp(sigma * np.sqrt(dt) * 0.3 * shocks[:, 1])
+        spread = np.abs(sigma * np.sqrt(dt) * shocks[:, 2:4])
+        frame = pd.DataFrame(
+            {
+                "Open": open_,
+                "High": np.maximum(open_, close) * np.exp(spread[:, 0]),
+                "Low": np.minimum(open_, close) * np.exp(-spread[:, 1]),
+                "Close": close,
+                "Volume": np.round(np.exp(16 + 0.4 * shocks[:, 4])),
+            },
+            index=days.rename("Date"),
+        )
+        return frame.loc[pd.Timestamp(start) :]
+
+
+def make_provider(spec: str = DEFAULT_PROVIDER) -> PriceProvider:
+    """공급자 이름("yfinance", "synthetic", "local:<디렉터리>")으로 공급자를 만든다."""
+    name, _, option = spec.partition(":")
+    if name not in PROVIDERS:
+        raise ValueError(f"공급자는 {PROVIDERS} 중 하나여야 합니다: {spec}")
+    if name == "local":
+        if not option:
+            raise ValueError("local 공급자는 디렉터리가 필요합니다 (예: local:./prices).")
+        return LocalFileProvider(option)
+    if name == "synthetic":
+        return SyntheticProvider(int(option) if option else 0)
+    return YFinanceProvider()
+
+
+def fetch_each(
+    fetch,
+    tickers,
+    start: date,
+    end: date,
+    timeout: float = FETCH_TIMEOUT,
+    retries: int = FETCH_RETRIES,
+    backoff: float = FETCH_BACKOFF,
+    workers: int = 8,
+):
+    """fetch(티커, 시작, 끝)을 티커마다 동시에 부르고, 끝나는 순서대로 (티커, 표 또는 None, 오류 또는 None)를 내보낸다."""
+    pool = ThreadPoolExecutor(max_workers=workers)
+    running = {}  # future → (티커, 시도 번호, 마감 시각)
+    abandoned = {}  # 티커 → 시간 초과로 버렸지만 아직 도는 시도
+    waiting = [(0.0, i, ticker, 0) for i, ticker in enumerate(tickers)]  # (재시도 시각, 순번, 티커, 시도 번호) 힙
+    heapq.heapify(waiting)
+    order = itertools.count(len(waiting))
+
+    def retry_or_fail(ticker, attempt, error, now):
+        if attempt < retries:
+            delay = backoff * 2**attempt + random.uniform(0, backoff)
+            heapq.heappush(waiting, (now + delay, next(order), ticker, attempt + 1))
+            return None
+        return ticker, None, error
+
+    try:
+        while running or waiting:
+            now = time.monotonic()
+            # 스레드 수만큼만 띄워 제한 시간이 큐에서 기다리는 동안이 아니라 실제로 돌기 시작할 때부터 흐르게 한다
+            # (시간 초과로 버렸지만 아직 도는 시도도 스레드를 차지한다)
+            busy = len(running) + sum(not f.done() for f in abandoned.values())
+            while waiting and waiting[0][0] <= now and busy < workers:
+                _, _, ticker, attempt = heapq.heappop(waiting)
+                previous = abandoned.pop(ticker, None)
+                if previous is not None and previous.done() and previous.exception() is None:
+                    # 버린 시도가 그사이 끝났으면 그 결과를 쓴다
+                    yield ticker, previous.result(), None
+                    continue
+                if previous is not None and not previous.done():
+                    # 앞 시도가 아직 돌고 있으면 (저장소의 티커 잠금을 쥐고 있을 수 있어) 새 시도도 그 뒤에서
+                    # 기다리다 시간 초과될 뿐이므로 이번 재시도는 띄우지 않고 넘긴다
+                    abandoned[ticker] = previous
+                    failure = retry_or_fail(ticker, attempt, TimeoutError(f"{timeout:g}초 안에 응답이 없습니다."), now)
+                    if failure is not None:
+                        yield failure
+                    continue
+                running[pool.submit(fetch, ticker, start, end)] = (ticker, attempt, now + timeout)
+                busy += 1
+
+            if not running and not waiting:
+                break
+            # 빈 스레드가 없으면 대기 중인 재시도 시각 대신 도는 시도나 버린 시도가 끝나기를 기다린다
+            stragglers = [f for f in abandoned.values() if not f.done()]
+            wake = [deadline for _, _, deadline in running.values()]
+            if busy < workers:
+                wake += [w[0] for w in waiting[:1]]
+            timeout_left = max(min(wake) - now, 0) if wake else None
+            done, _ = wait([*running, *stragglers], timeout=timeout_left, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for future in list(running):
+                ticker, attempt, deadline = running[future]
+                if future in done:
+                    error = future.exception()
+                elif deadline <= now:
+                    error = TimeoutError(f"{timeout:g}초 안에 응답이 없습니다.")
+                    abandoned[ticker] = future
+                else:
+                    continue
+                del running[future]
+                if error is None:
+                    yield ticker, future.result(), None
+                elif (failure := retry_or_fail(ticker, attempt, error, now)) is not None:
+                    yield failure
+    finally:
+        # 시간 초과로 버린 시도는 기다리지 않는다
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주가 공급자에서 데이터를 받아 모양과 시간을 확인")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--provider", default=DEFAULT_PROVIDER)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    provider = make_provider(args.provider)
+    end = date.today() + timedelta(days=1)
+    t0 = time.perf_counter()
+    for ticker, frame, error in fetch_each(provider.fetch, args.tickers, end - timedelta(days=args.days + 1), end):
+        status = f"{len(frame)}일" if error is None else f"실패 ({error})"
+        print(f"{time.perf_counter() - t0:7.3f}초  {ticker}: {status}")
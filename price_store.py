@@ -0,0 +1,127 @@
+import os
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+from price_provider import FIELDS, PriceProvider, make_provider
+
+# -------------------------------------------------
+# 주가 로컬 저장소 (finance 페이지용)
+#  - 공급자(price_provider)에서 받은 일봉을 티커마다 Parquet 파일 하나로 저장 (날짜 인덱스 × Open/High/Low/Close/Volume, 수정주가)
+#  - 요청 구간 중 저장돼 있지 않은 앞/뒤 구간만 내려받아 이어 붙인다 (delta fetch)
+#    → 두 번째 방문부터는 로컬 읽기 + 마지막 저장일 이후 며칠치만 다운로드
+#  - 마지막 저장 봉은 장중에 받은 미완성 값일 수 있어 뒤 구간은 마지막 저장일부터 다시 받아 덮어쓴다
+#  - 이미 받아 본 가장 이른 날짜(상장 전이라 데이터가 없던 구간 포함)를 파일 메타데이터에 남겨
+#    같은 빈 구간을 매번 다시 요청하지 않는다
+#  - 저장소 자체도 공급자라 download()가 같은 (티커, 속성) 두 단계 컬럼 표를 돌려준다
+#  - 쓰기는 임시 파일 → os.replace로 바꿔치기해 읽는 쪽이 반쯤 쓴 파일을 보지 않게 한다
+# -------------------------------------------------
+
+DEFAULT_DIR = os.environ.get("PRICE_CACHE_DIR", ".price_cache")
+_META_KEY = b"covered_start"
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.reindex(columns=FIELDS).dropna(how="all")
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize().rename("Date")
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame.astype({field: "float64" for field in FIELDS})
+
+
+def _has_business_day(first: pd.Timestamp, last: pd.Timestamp) -> bool:
+    return first <= last and len(pd.bdate_range(first, last)) > 0
+
+
+class PriceStore(PriceProvider):
+    name = "store"
+
+    def __init__(self, root: str = DEFAULT_DIR, provider: PriceProvider | None = None):
+        self.root = root
+        self.provider = provider or make_provider()
+        self.downloads = 0
+        self._lock = threading.Lock()
+        self._ticker_locks = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        # 같은 티커 파일만 한 번에 하나씩 갱신하고, 다른 티커는 동시에 받는다
+        with self._lock:
+            return self._ticker_locks.setdefault(ticker.upper(), threading.Lock())
+
+    def path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.parquet")
+
+    # ---- 파일 읽기/쓰기 ----
+    def read(self, ticker: str):
+        """저장된 (가격 표, 이미 받아 본 가장 이른 날짜)를 돌려준다. 파일이 없으면 (빈 표, None)."""
+        import pyarrow.parquet as pq
+
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return _normalize(pd.DataFrame(columns=FIELDS)), None
+        table = pq.read_table(path)
+        covered = (table.schema.metadata or {}).get(_META_KEY)
+        return _normalize(table.to_pandas()), pd.Timestamp(covered.decode()) if covered else None
+
+    def _write(self, ticker: str, frame: pd.DataFrame, covered_start: pd.Timestamp) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        metadata = {**(table.schema.metadata or {}), _META_KEY: covered_start.date().isoformat().encode()}
+        tmp = f"{self.path(ticker)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table.replace_schema_metadata(metadata), tmp)
+        os.replace(tmp, self.path(ticker))
+
+    # ---- 공개 API ----
+    def missing_ranges(self, stored: pd.DataFrame, covered_start, start: date, end: date) -> list:
+        """[start, end) 중 새로 받아야 하는 구간 목록 [(시작, 끝), ...] (끝은 포함하지 않음)."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if stored.empty:
+            return [(start, end)] if covered_start is None or covered_start > start else []
+        ranges = []
+        first, last = stored.index[0], stored.index[-1]
+        head_from = min(first, covered_start) if covered_start is not None else first
+        if _has_business_day(start, head_from - timedelta(days=1)):
+            ranges.append((start, head_from))
+        # 마지막 저장 봉 다음 영업일이 있거나 마지막 봉이 오늘(장중일 수 있음)이면 마지막 저장일부터 다시 받는다
+        today = pd.Timestamp(date.today())
+        if _has_business_day(last + timedelta(days=1), end - timedelta(days=1)) or last >= today:
+            ranges.append((last, end))
+        return ranges
+
+    def fetch(self, ticker: str, start: date, end: date) -> pd.DataFrame:
+        """빠진 구간만 내려받아 저장하고 [start, end) 구간 표를 돌려준다."""
+        with self._ticker_lock(ticker):
+            stored, covered_start = self.read(ticker)
+            ranges = self.missing_ranges(stored, covered_start, start, end)
+            if ranges:
+                fetched = [_normalize(self.provider.fetch(ticker, a.date(), b.date())) for a, b in ranges]
+                with self._lock:
+                    self.downloads += len(ranges)
+                merged = _normalize(pd.concat([stored, *fetched]))
+                covered = min(pd.Timestamp(start), covered_start or pd.Timestamp(start))
+                if not merged.empty:
+                    self._write(ticker, merged, covered)
+                stored = merged
+        return stored.loc[pd.Timestamp(start) : pd.Timestamp(end) - timedelta(days=1)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주가 로컬 저장소 갱신 (빠진 구간만 다운로드)")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--dir", default=DEFAULT_DIR)
+    parser.add_argument("--provider", default="yfinance", help='"yfinance", "synthetic", "local:<디렉터리>"')
+    args = parser.parse_args()
+
+    store = PriceStore(args.dir, make_provider(args.provider))
+    end = date.today() + timedelta(days=1)
+    prices = store.download(args.tickers, end - timedelta(days=args.days + 1), end)
+    print(f"다운로드 {store.downloads}회, {len(prices)}일 × {prices.columns.get_level_values(0).nunique()}종목")
@@ -0,0 +1,371 @@
+import hashlib
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 가명처리 함수 (1탭 학습 화면 · 대량 처리 공용)
+# -------------------------------------------------
+
+
+def mask_name(n: str) -> str:
+    if len(n) <= 1:
+        return "*"
+    return n[0] + "*" * (len(n) - 1)
+
+
+def mask_rrn(r: str) -> str:
+    if len(r) >= 8:
+        return r[:8] + "******"
+    return r
+
+
+def mask_phone(p: str) -> str:
+    if "-" in p:
+        parts = p.split("-")
+        if len(parts) == 3:
+            return f"{parts[0]}-****-{parts[2]}"
+    if len(p) > 4:
+        return "*" * (len(p) - 4) + p[-4:]
+    return p
+
+
+def make_pseudo_id(text: str, salt_value: str = "") -> str:
+    base = (text + salt_value).encode("utf-8")
+    return hashlib.sha256(base).hexdigest()
+
+
+# -------------------------------------------------
+# 대량(컬럼 단위) 마스킹
+#  - 위 스칼라 함수와 결과가 한 글자도 다르지 않도록 같은 규칙을
+#    pandas 문자열 연산 + NumPy 인덱싱으로 옮겨 놓은 것
+#  - 행마다 파이썬 함수를 부르지 않으므로 수백만 행도 수 초 안에 처리
+# -------------------------------------------------
+
+
+def _string_dtype():
+    # pyarrow가 있으면 Arrow 기반 문자열(벡터 연산이 C++에서 수행됨)을 사용
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype()
+    return pd.StringDtype("pyarrow")
+
+
+def _as_str(s: pd.Series) -> pd.Series:
+    return s.astype(_string_dtype())
+
+
+def _stars(counts: pd.Series) -> pd.Series:
+    # "*" * n 을 행마다 만들지 않고, 길이별 문자열 표를 한 번 만든 뒤 인덱싱
+    n = counts.fillna(0).clip(lower=0).astype(np.int64).to_numpy()
+    table = np.array(["*" * i for i in range(int(n.max(initial=0)) + 1)], dtype=object)
+    return pd.Series(table[n], index=counts.index, dtype=_string_dtype())
+
+
+def mask_name_series(s: pd.Series) -> pd.Series:
+    s = _as_str(s)
+    length = s.str.len()
+    masked = s.str.slice(0, 1) + _stars(length - 1)
+    return masked.mask((length <= 1).fillna(False), "*").mask(s.isna())
+
+
+def mask_rrn_series(s: pd.Series) -> pd.Series:
+    s = _as_str(s)
+    return s.mask((s.str.len() >= 8).fillna(False), s.str.slice(0, 8) + "******")
+
+
+def mask_phone_series(s: pd.Series) -> pd.Series:
+    s = _as_str(s)
+    length = s.str.len()
+
+    # 하이픈이 정확히 두 개(3조각)이면 가운데 조각만 가림
+    three_parts = s.str.contains(r"^[^-]*-[^-]*-[^-]*$", regex=True).fillna(False)
+    dashed = s.str.replace(r"^([^-]*)-[^-]*-", r"\1-****-", regex=True)
+
+    # 그 외에는 뒤 4자리만 남기고 가림
+    tail = _stars(length - 4) + s.str.slice(-4)
+
+    out = s.mask((length > 4).fillna(False), tail)
+    return out.mask(three_parts, dashed)
+
+
+def mask_frame(
+    df: pd.DataFrame,
+    name_col: str | None = None,
+    rrn_col: str | None = None,
+    phone_col: str | None = None,
+) -> pd.DataFrame:
+    """지정한 컬럼(이름/주민번호/전화번호)을 한 번에 마스킹한 새 DataFrame을 돌려준다."""
+    out = df.copy()
+    if name_col is not None:
+        out[name_col] = mask_name_series(df[name_col])
+    if rrn_col is not None:
+        out[rrn_col] = mask_rrn_series(df[rrn_col])
+    if phone_col is not None:
+        out[phone_col] = mask_phone_series(df[phone_col])
+    return out
+
+
+# -------------------------------------------------
+# 대량 가명 ID 해시 (멀티코어)
+#  - 주민번호+전화번호처럼 짧은 입력은 hashlib이 GIL을 놓지 않으므로
+#    (2KB 이상 버퍼에서만 해제) 기본값은 프로세스 풀을 사용
+#  - 긴 입력(문서 본문 등)을 해시할 때는 executor="thread"가 더 가볍다
+# -------------------------------------------------
+
+
+def _hash_chunk(texts: list, salt_value: str) -> list:
+    # (text + salt).encode() == text.encode() + salt.encode() 이므로 salt는 한 번만 인코딩
+    salt_bytes = salt_value.encode("utf-8")
+    sha256 = hashlib.sha256
+    return [sha256(t.encode("utf-8") + salt_bytes).hexdigest() for t in texts]
+
+
+def _digest_chunk(texts: list, salt_value: str, width: int) -> bytes:
+    # 행마다 파이썬 문자열을 만들지 않고 앞 width바이트를 이어 붙인 bytes 하나로 돌려준다
+    salt_bytes = salt_value.encode("utf-8")
+    sha256 = hashlib.sha256
+    return b"".join([sha256(t.encode("utf-8") + salt_bytes).digest()[:width] for t in texts])
+
+
+def _map_chunks(fn, values: list, args: tuple, workers: int | None, chunk_size: int, executor) -> list:
+    # values를 chunk_size씩 잘라 fn(chunk, *args)를 풀에서 실행하고, 청크별 결과를 순서대로 모은다
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(values) <= chunk_size:
+        return [fn(values, *args)]
+
+    chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+    arg_iters = [repeat(a) for a in args]
+    if isinstance(executor, Executor):
+        return list(executor.map(fn, chunks, *arg_iters))
+    pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        return list(pool.map(fn, chunks, *arg_iters))
+
+
+def make_pseudo_ids(
+    texts,
+    salt_value: str = "",
+    workers: int | None = None,
+    chunk_size: int = 50_000,
+    executor="process",
+):
+    """make_pseudo_id를 여러 값에 한 번에 적용한다.
+
+    입력 컬럼을 chunk_size 단위로 잘라 workers개의 프로세스(또는 스레드)에 나눠 준다.
+    executor에 이미 만들어 둔 Executor를 넘기면 풀을 새로 띄우지 않고 재사용한다.
+    Series를 넣으면 같은 인덱스의 Series를, 그 외에는 list를 돌려준다.
+    """
+    index = texts.index if isinstance(texts, pd.Series) else None
+    values = [str(t) for t in texts]
+    parts = _map_chunks(_hash_chunk, values, (salt_value,), workers, chunk_size, executor)
+    digests = [d for part in parts for d in part]
+
+    if index is not None:
+        return pd.Series(digests, index=index, dtype=_string_dtype())
+    return digests
+
+
+# -------------------------------------------------
+# 압축(바이너리) 가명 키
+#  hexdigest() 64자 문자열은 행당 약 121바이트(object str + 포인터),
+#  Arrow 문자열로 담아도 약 72바이트를 쓴다.
+#  같은 SHA-256 결과를 앞 width바이트만 고정 폭 바이너리로 보관하면
+#    - width=8  → uint64 (8바이트/행), 정수 해시 조인이라 가장 빠름
+#    - width=16 → 16바이트 고정 폭 (Arrow fixed_size_binary / NumPy "S16")
+#    - width=32 → 다이제스트 전체 (잘라내지 않음)
+#  8바이트 키의 16진수 표기는 hexdigest()의 앞 16글자와 같다 (화면의 "가명 ID(해시)"와 동일).
+#
+#  충돌 확률(생일 문제 근사): p ≈ 1 - exp(-n² / 2^(8·width + 1))
+#    width=8 : n=1천만 → 약 2.7e-6,  n=1억 → 약 2.7e-4,  n=10억 → 약 2.7e-2
+#    width=16: n=1조에서도 약 1.5e-15 → 사실상 0
+#  수억 명 이상을 한 키 공간에서 연결하거나 충돌이 치명적이면 16바이트 이상을 쓴다.
+# -------------------------------------------------
+
+PSEUDO_KEY_WIDTHS = (8, 16, 32)
+
+
+def collision_probability(n_rows: int, width: int) -> float:
+    """n_rows개의 서로 다른 식별자를 width바이트 키로 줄였을 때 한 쌍이라도 충돌할 확률(근사)."""
+    return -math.expm1(-n_rows * (n_rows - 1) / 2 ** (8 * width + 1))
+
+
+def make_pseudo_keys(
+    texts,
+    salt_value: str = "",
+    width: int = 8,
+    workers: int | None = None,
+    chunk_size: int = 50_000,
+    executor="process",
+) -> np.ndarray:
+    """make_pseudo_ids와 같은 해시를 고정 폭 바이너리 키 배열로 돌려준다.
+
+    width=8이면 uint64 배열, 16/32면 NumPy 고정 폭 bytes("S16"/"S32") 배열.
+    """
+    if width not in PSEUDO_KEY_WIDTHS:
+        raise ValueError(f"width는 {PSEUDO_KEY_WIDTHS} 중 하나여야 합니다: {width}")
+    values = [str(t) for t in texts]
+    parts = _map_chunks(_digest_chunk, values, (salt_value, width), workers, chunk_size, executor)
+    return _keys_from_bytes(b"".join(parts), width)
+
+
+def _keys_from_bytes(buf: bytes, width: int) -> np.ndarray:
+    if width == 8:
+        # 빅엔디안으로 읽어야 16진수 표기가 hexdigest() 앞부분과 같아진다
+        return np.frombuffer(buf, dtype=">u8").astype(np.uint64)
+    return np.frombuffer(buf, dtype=f"S{width}").copy()
+
+
+def hex_to_pseudo_keys(hex_ids, width: int = 8) -> np.ndarray:
+    """hexdigest 문자열(예: 금고에 저장된 가명 ID)을 같은 값의 압축 키로 바꾼다."""
+    return _keys_from_bytes(b"".join(bytes.fromhex(h[: 2 * width]) for h in hex_ids), width)
+
+
+def pseudo_keys_to_hex(keys: np.ndarray) -> list:
+    if keys.dtype == np.uint64:
+        return [f"{k:016x}" for k in keys.tolist()]
+    width = keys.dtype.itemsize
+    return [k.ljust(width, b"\0").hex() for k in keys.tolist()]
+
+
+def pseudo_key_column_to_hex(s: pd.Series) -> pd.Series:
+    """압축 키 컬럼을 화면 표시용 16진수 문자열로 바꾼다 (hex 컬럼은 그대로)."""
+    if s.dtype == np.uint64:
+        return pd.Series(pseudo_keys_to_hex(s.to_numpy()), index=s.index)
+    if isinstance(s.dtype, pd.UInt64Dtype):
+        # 결측이 있는 8바이트 키 (결측은 결측 그대로)
+        present = s.notna().to_numpy()
+        out = pd.Series(pd.NA, index=s.index, dtype=_string_dtype())
+        out[present] = pseudo_keys_to_hex(s[present].to_numpy(dtype=np.uint64))
+        return out
+    if isinstance(s.dtype, pd.ArrowDtype):
+        return s.map(bytes.hex, na_action="ignore")
+    return s
+
+
+def pseudo_keys_to_series(keys: np.ndarray, index=None, valid: np.ndarray | None = None) -> pd.Series:
+    """압축 키를 DataFrame 컬럼으로 만든다 (uint64 또는 Arrow fixed_size_binary).
+
+    valid(행마다 True/False)를 주면 keys는 True인 행의 키만 담고, False인 행은 결측으로 둔다.
+    이때 8바이트 키는 결측을 담을 수 있는 nullable UInt64 컬럼이 된다.
+    """
+    if valid is not None and valid.all():
+        valid = None
+    if keys.dtype == np.uint64:
+        if valid is None:
+            return pd.Series(keys, index=index)
+        values = np.zeros(len(valid), dtype=np.uint64)
+        values[valid] = keys
+        return pd.Series(pd.arrays.IntegerArray(values, ~valid), index=index)
+    import pyarrow as pa
+
+    # NumPy "S" 배열은 꺼낼 때 끝의 0바이트를 잘라내므로, 버퍼를 그대로 Arrow 배열로 감싼다
+    width = keys.dtype.itemsize
+    if valid is None:
+        buffers, n = [None, pa.py_buffer(keys.tobytes())], len(keys)
+    else:
+        raw = np.zeros((len(valid), width), dtype=np.uint8)
+        raw[valid] = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(-1, width)
+        bitmap = np.packbits(valid, bitorder="little")
+        buffers, n = [pa.py_buffer(bitmap.tobytes()), pa.py_buffer(raw.tobytes())], len(valid)
+    arr = pa.FixedSizeBinaryArray.from_buffers(pa.binary(width), n, buffers)
+    return pd.Series(arr, index=index, dtype=pd.ArrowDtype(pa.binary(width)))
+
+
+def arrow_to_frame(table) -> pd.DataFrame:
+    """Arrow Table/RecordBatch를 DataFrame으로 바꾼다. 고정 폭 바이너리 키 컬럼은 그대로 유지."""
+    import pyarrow as pa
+
+    # pandas 메타데이터에 적힌 "fixed_size_binary[16]" 문자열은 pandas가 다시 해석하지 못하므로
+    # 메타데이터 대신 Arrow 타입을 보고 직접 dtype을 정한다
+    def types_mapper(arrow_type):
+        if pa.types.is_fixed_size_binary(arrow_type):
+            return pd.ArrowDtype(arrow_type)
+        return None
+
+    frame = table.to_pandas(ignore_metadata=True, types_mapper=types_mapper)
+    # 결측이 있는 uint64 컬럼(가명 ID를 비워 둔 8바이트 키)은 float64로 바뀌면 값이 뭉개지므로 nullable UInt64로 읽는다
+    for i, field in enumerate(table.schema):
+        if pa.types.is_uint64(field.type) and table.column(i).null_count:
+            frame[field.name] = table.column(i).to_pandas(types_mapper={pa.uint64(): pd.UInt64Dtype()}.get).array
+    return frame
+
+
+def pseudonymize_frame(
+    df: pd.DataFrame,
+    name_col: str | None = None,
+    rrn_col: str | None = None,
+    phone_col: str | None = None,
+    salt_value: str = "",
+    id_col: str | None = "가명ID",
+    id_width: int | None = None,
+    vault=None,
+    executor="process",
+) -> pd.DataFrame:
+    """mask_frame 결과에 (주민번호 + 전화번호 + salt) 해시 가명 ID 컬럼을 붙인다.
+
+    주민번호나 전화번호가 비어 있는 행은 가명 ID가 결측이다.
+    id_width를 주면 64자 hex 문자열 대신 압축 바이너리 키(make_pseudo_keys)로 저장한다.
+    vault(PseudonymVault)를 넘기면 해시 대신 금고 조회를 거친다.
+    """
+    out = mask_frame(df, name_col=name_col, rrn_col=rrn_col, phone_col=phone_col)
+    if id_col is not None and rrn_col is not None and phone_col is not None:
+        rrn, phone = _as_str(df[rrn_col]), _as_str(df[phone_col])
+        # 주민번호 · 전화번호 중 하나라도 비어 있으면 가명 ID도 비워 둔다
+        # ("<NA>"나 salt만 해시하면 그런 행이 모두 같은 ID가 되어 결합 때 서로 엮인다)
+        valid = ((rrn.str.strip().fillna("") != "") & (phone.str.strip().fillna("") != "")).to_numpy()
+        id_source = (rrn + phone)[valid]
+        if vault is not None:
+            hex_ids = vault.pseudonymize(id_source)
+            if id_width is None:
+                out[id_col] = hex_ids.reindex(df.index)
+            else:
+                out[id_col] = pseudo_keys_to_series(hex_to_pseudo_keys(hex_ids, id_width), index=df.index, valid=valid)
+        elif id_width is None:
+            out[id_col] = make_pseudo_ids(id_source, salt_value, executor=executor).reindex(df.index)
+        else:
+            keys = make_pseudo_keys(id_source, salt_value, width=id_width, executor=executor)
+            out[id_col] = pseudo_keys_to_series(keys, index=df.index, valid=valid)
+    return out
+
+
+def benchmark_pseudo_ids(
+    n_rows: int = 1_000_000,
+    worker_counts=(1, 2, 4, 8),
+    executor: str = "process",
+) -> pd.DataFrame:
+    """워커 수별 해시 처리량(rows/sec)을 측정해 표로 돌려준다."""
+    texts = [f"{i % 1_000_000:06d}-3{i % 999_999:06d}010-{i % 10_000:04d}-{i % 9_999:04d}" for i in range(n_rows)]
+    rows = []
+    for w in worker_counts:
+        t0 = time.perf_counter()
+        make_pseudo_ids(texts, "my_secret_key", workers=w, executor=executor)
+        elapsed = time.perf_counter() - t0
+        rows.append(
+            {
+                "workers": w,
+                "seconds": round(elapsed, 3),
+                "rows/sec": int(n_rows / elapsed),
+                "rows/sec/worker": int(n_rows / elapsed / w),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="가명 ID 대량 해시 처리량 측정")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    args = parser.parse_args()
+
+    print(f"CPU 코어 수: {os.cpu_count()}")
+    print(benchmark_pseudo_ids(args.rows, args.workers, args.executor).to_string(index=False))
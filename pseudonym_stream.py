@@ -0,0 +1,145 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pseudonym import arrow_to_frame, pseudo_key_column_to_hex, pseudonymize_frame
+
+# -------------------------------------------------
+# 스트리밍 가명처리 파이프라인 (메모리보다 큰 파일용)
+#  읽기(청크) → 마스킹 + 가명 ID → 쓰기(청크)
+#  각 단계가 제너레이터라서 한 번에 메모리에 올라가는 것은 청크 하나뿐이다.
+#  → 입력 파일 크기와 상관없이 최대 메모리 사용량이 일정하게 유지된다.
+# -------------------------------------------------
+
+DEFAULT_CHUNK_ROWS = 200_000
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """입력 파일을 (청크 DataFrame, 진행률 0~1) 쌍으로 하나씩 돌려준다."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        total = pf.metadata.num_rows or 1
+        done = 0
+        for batch in pf.iter_batches(batch_size=chunk_rows):
+            done += batch.num_rows
+            yield arrow_to_frame(batch), done / total
+    else:
+        total = os.path.getsize(path) or 1
+        with open(path, "rb") as f:
+            reader = pd.read_csv(f, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+            for chunk in reader:
+                yield chunk, min(f.tell() / total, 1.0)
+
+
+def pseudonymize_chunks(chunks, executor="process", **options):
+    """(청크, 진행률) 스트림에 pseudonymize_frame을 적용한다."""
+    for chunk, progress in chunks:
+        yield pseudonymize_frame(chunk, executor=executor, **options), progress
+
+
+def write_chunks(chunks, out_path: str, id_col: str = "가명ID"):
+    """처리된 청크를 CSV/Parquet 파일에 이어 쓰면서 (누적 행 수, 진행률)을 돌려준다."""
+    rows = 0
+    if _is_parquet(out_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk, progress in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                rows += len(chunk)
+                yield rows, progress
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+            for chunk, progress in chunks:
+                # CSV에는 바이너리를 그대로 쓸 수 없으므로 압축 키 컬럼은 16진수로 풀어 쓴다
+                # uint64 키(id_width=8)도 10진수로 쓰면 결합할 때 16진수로 읽혀 값이 달라지므로 같이 푼다
+                for col in chunk.columns:
+                    if isinstance(chunk[col].dtype, pd.ArrowDtype) or (col == id_col and pd.api.types.is_unsigned_integer_dtype(chunk[col].dtype)):
+                        chunk[col] = pseudo_key_column_to_hex(chunk[col])
+                chunk.to_csv(f, index=False, header=rows == 0)
+                rows += len(chunk)
+                yield rows, progress
+
+
+def run_pipeline(
+    in_path: str,
+    out_path: str,
+    name_col: str | None = None,
+    rrn_col: str | None = None,
+    phone_col: str | None = None,
+    salt_value: str = "",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int | None = None,
+    id_width: int | None = None,
+    vault=None,
+    on_progress=None,
+) -> int:
+    """입력 파일 전체를 청크 단위로 가명처리해 out_path에 쓰고, 처리한 행 수를 돌려준다.
+
+    on_progress(누적 행 수, 진행률)를 넘기면 청크마다 호출된다 (Streamlit 진행 막대 등).
+    """
+    rows = 0
+    # 해시용 프로세스 풀은 청크마다 새로 띄우지 않고 파이프라인 전체에서 하나만 사용
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        stream = iter_chunks(in_path, chunk_rows)
+        stream = pseudonymize_chunks(
+            stream,
+            executor=pool,
+            name_col=name_col,
+            rrn_col=rrn_col,
+            phone_col=phone_col,
+            salt_value=salt_value,
+            id_width=id_width,
+            vault=vault,
+        )
+        for rows, progress in write_chunks(stream, out_path):
+            if on_progress is not None:
+                on_progress(rows, progress)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="CSV/Parquet 파일 스트리밍 가명처리")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--name-col")
+    parser.add_argument("--rrn-col")
+    parser.add_argument("--phone-col")
+    parser.add_argument("--salt", default="")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--id-width", type=int, choices=[8, 16, 32], help="가명 ID를 압축 바이너리 키로 저장 (Parquet 권장)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    total_rows = run_pipeline(
+        args.input,
+        args.output,
+        name_col=args.name_col,
+        rrn_col=args.rrn_col,
+        phone_col=args.phone_col,
+        salt_value=args.salt,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        id_width=args.id_width,
+        on_progress=lambda n, p: print(f"\r{p:6.1%}  {n:,}행", end="", flush=True),
+    )
+    print(f"\n완료: {total_rows:,}행, {time.perf_counter() - t0:.1f}초")
@@ -0,0 +1,145 @@
+import hashlib
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+
+import pandas as pd
+
+from pseudonym import make_pseudo_ids
+
+# -------------------------------------------------
+# 가명 ID 금고 (Pseudonym Vault)
+#  - 1단계: 메모리 LRU 캐시 (원본 식별자 → 가명 ID), 적중하면 해시 계산 없음
+#  - 2단계: SQLite 파일 (salt 버전별), 매일 들어오는 데이터에서
+#           "이미 본 사람"을 같은 가명 ID로 이어 준다
+#  - 디스크에는 주민번호 같은 원본을 남기지 않는다.
+#    조회 키는 salt로 키를 건 BLAKE2b 다이제스트(16바이트)만 저장
+# -------------------------------------------------
+
+_SQL_BATCH = 500
+
+
+class PseudonymVault:
+    def __init__(self, path: str, salt_value: str, salt_version: str = "v1", cache_size: int = 100_000):
+        self.path = path
+        self.salt_value = salt_value
+        self.salt_version = salt_version
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # BLAKE2b 키는 64바이트까지라 salt를 그대로 자르면 앞 64바이트가 같은 salt끼리 키가 같아진다 → 해시로 줄인다
+        self._lookup_key = hashlib.blake2b(salt_value.encode("utf-8"), digest_size=64).digest()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pseudonyms (
+                salt_version TEXT NOT NULL,
+                ident_key    BLOB NOT NULL,
+                pseudo_id    TEXT NOT NULL,
+                PRIMARY KEY (salt_version, ident_key)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    # ---- 내부 도우미 ----
+    def _disk_key(self, text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16, key=self._lookup_key).digest()
+
+    def _remember(self, text: str, pseudo_id: str) -> None:
+        self._cache[text] = pseudo_id
+        self._cache.move_to_end(text)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _load_from_disk(self, keys: list) -> dict:
+        found = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            batch = keys[i : i + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT ident_key, pseudo_id FROM pseudonyms "
+                f"WHERE salt_version = ? AND ident_key IN ({placeholders})",
+                [self.salt_version, *batch],
+            )
+            found.update(rows.fetchall())
+        return found
+
+    # ---- 공개 API ----
+    def get(self, text: str) -> str:
+        return self.get_many([text])[0]
+
+    def get_many(self, texts) -> list:
+        """여러 식별자의 가명 ID를 캐시 → 디스크 → 해시 순서로 찾아 돌려준다.
+
+        적중/미스 통계는 행 단위로 센다 (같은 배치 안의 중복 행도 각각 1건).
+        """
+        values = [str(t) for t in texts]
+        counts = Counter(values)
+        with self._lock:
+            resolved = {}
+            pending = []
+            for t, n in counts.items():
+                if t in self._cache:
+                    self._cache.move_to_end(t)
+                    resolved[t] = self._cache[t]
+                    self.hits += n
+                else:
+                    pending.append(t)
+
+            if pending:
+                keys = [self._disk_key(t) for t in pending]
+                on_disk = self._load_from_disk(keys)
+
+                new_texts, new_keys = [], []
+                for t, k in zip(pending, keys):
+                    if k in on_disk:
+                        resolved[t] = on_disk[k]
+                        self.disk_hits += counts[t]
+                    else:
+                        new_texts.append(t)
+                        new_keys.append(k)
+
+                if new_texts:
+                    new_ids = make_pseudo_ids(new_texts, self.salt_value)
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO pseudonyms (salt_version, ident_key, pseudo_id) VALUES (?, ?, ?)",
+                        [(self.salt_version, k, p) for k, p in zip(new_keys, new_ids)],
+                    )
+                    self._conn.commit()
+                    resolved.update(zip(new_texts, new_ids))
+                    self.misses += sum(counts[t] for t in new_texts)
+
+                for t in pending:
+                    self._remember(t, resolved[t])
+
+        return [resolved[t] for t in values]
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, disk_hits, misses = self.hits, self.disk_hits, self.misses
+            cache_size, evictions = len(self._cache), self.evictions
+        lookups = hits + disk_hits + misses
+        return {
+            "salt_version": self.salt_version,
+            "cache_size": cache_size,
+            "cache_hits": hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": (hits + disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def pseudonymize(self, s: pd.Series) -> pd.Series:
+        return pd.Series(self.get_many(s), index=s.index, dtype="string")
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,251 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from anonymize import generalize_age_series, generalize_zip_series
+
+# -------------------------------------------------
+# 스트리밍 재식별 위험 추정 (정확한 groupby 전에 거대 파일을 미리 점검)
+#  - Count-Min 스케치: 일반화된 (나이 구간, 우편번호) 조합의 크기를 고정 크기 표 하나로 근사
+#    추정값은 항상 실제 값 이상이므로, 추정값이 k보다 작은 집합은 "확실히 k 미만"이다
+#    (보수적 갱신: 이미 큰 칸은 더 키우지 않아 과대추정이 크게 줄어든다)
+#  - 하위 해시 표본(bottom-k): 해시값이 가장 작은 집합 몇천 개만 라벨과 함께 남겨
+#    전체 집합 수와 "k 미만 집합 비율"을 추정한다
+#  - 두 구조 모두 청크 · 파일 · 프로세스별로 따로 만든 뒤 merge로 합칠 수 있고,
+#    메모리는 입력 크기와 상관없이 width × depth + sample_size로 고정된다
+# -------------------------------------------------
+
+DEFAULT_WIDTH = 1 << 18
+DEFAULT_DEPTH = 4
+DEFAULT_SAMPLE = 4_096
+DEFAULT_BATCH_ROWS = 500_000
+
+_MASK64 = (1 << 64) - 1
+
+
+def class_keys(ages: pd.Series, zips: pd.Series, group_size: int, keep: int):
+    """일반화 라벨과, 라벨 문자열에서 만든 64비트 집합 키를 돌려준다 (청크·프로세스가 달라도 같은 키)."""
+    labels = pd.DataFrame(
+        {
+            "나이_구간": generalize_age_series(ages, group_size),
+            "우편번호_일반화": generalize_zip_series(zips, keep),
+        }
+    )
+    keys = pd.util.hash_pandas_object(labels, index=False).to_numpy()
+    return labels, keys
+
+
+class RiskSketch:
+    def __init__(
+        self,
+        group_size: int,
+        keep: int,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        sample_size: int = DEFAULT_SAMPLE,
+        seed: int = 0,
+    ):
+        if width & (width - 1):
+            raise ValueError("width는 2의 거듭제곱이어야 합니다.")
+        self.group_size = group_size
+        self.keep = keep
+        self.width = width
+        self.depth = depth
+        self.sample_size = sample_size
+        self.seed = seed
+
+        # 행마다 다른 홀수 곱셈 해시 (multiply-shift): 상위 log2(width) 비트를 칸 번호로 사용
+        rng = np.random.default_rng(seed)
+        self._mult = rng.integers(0, 1 << 63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._shift = np.uint64(64 - int(math.log2(width)))
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.rows = 0
+
+        self.sample_keys = np.empty(0, dtype=np.uint64)
+        self.sample_labels = pd.DataFrame({"나이_구간": [], "우편번호_일반화": []}, dtype=object)
+
+    # ---- 내부 도우미 ----
+    def _cells(self, keys: np.ndarray) -> np.ndarray:
+        return (keys[None, :] * self._mult[:, None]) >> self._shift
+
+    def _compatible(self, other: "RiskSketch") -> bool:
+        return (self.group_size, self.keep, self.width, self.depth, self.seed) == (
+            other.group_size,
+            other.keep,
+            other.width,
+            other.depth,
+            other.seed,
+        )
+
+    def _keep_smallest(self, keys: np.ndarray, labels: pd.DataFrame) -> None:
+        keys = np.concatenate([self.sample_keys, keys])
+        labels = pd.concat([self.sample_labels, labels.astype(object)], ignore_index=True)
+        uniq, first = np.unique(keys, return_index=True)
+        self.sample_keys = uniq[: self.sample_size]
+        self.sample_labels = labels.iloc[first[: self.sample_size]].reset_index(drop=True)
+
+    def _add_unique(self, uniq: np.ndarray, totals: np.ndarray) -> None:
+        # 보수적 갱신: 각 키의 칸을 (현재 추정값 + 이번 인원)까지만 끌어올린다
+        cells = self._cells(uniq)
+        target = self.table[np.arange(self.depth)[:, None], cells].min(axis=0) + totals
+        for d in range(self.depth):
+            np.maximum.at(self.table[d], cells[d], target)
+        self.rows += int(totals.sum())
+
+    # ---- 공개 API ----
+    def add_keys(self, keys: np.ndarray, counts=None) -> None:
+        """집합 키(와 키별 인원)를 스케치에 더한다. 같은 청크 안 중복 키는 먼저 합쳐서 한 번만 갱신한다."""
+        counts = np.ones(len(keys), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        uniq, inv = np.unique(keys, return_inverse=True)
+        self._add_unique(uniq, np.bincount(inv, weights=counts, minlength=len(uniq)).astype(np.int64))
+
+    def update(self, df: pd.DataFrame, age_col: str = "나이", zip_col: str = "우편번호", count_col: str | None = None):
+        """원본 행(또는 count_col이 있는 집계표) 청크 하나를 반영한다."""
+        labels, keys = class_keys(df[age_col], df[zip_col], self.group_size, self.keep)
+        counts = np.ones(len(keys)) if count_col is None else df[count_col].to_numpy(dtype=np.float64)
+        uniq, first, inv = np.unique(keys, return_index=True, return_inverse=True)
+        self._add_unique(uniq, np.bincount(inv, weights=counts, minlength=len(uniq)).astype(np.int64))
+        # 표본 후보는 이 청크에서 해시가 작은 키들만 (청크 전체 라벨을 쌓지 않는다)
+        first = first[: self.sample_size]
+        self._keep_smallest(uniq[: self.sample_size], labels.iloc[first])
+        return self
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        """집합 크기 추정값 (항상 실제 크기 이상)."""
+        cells = self._cells(np.asarray(keys, dtype=np.uint64))
+        return self.table[np.arange(self.depth)[:, None], cells].min(axis=0)
+
+    def merge(self, other: "RiskSketch") -> "RiskSketch":
+        """다른 청크·프로세스에서 만든 같은 설정의 스케치를 합친다."""
+        if not self._compatible(other):
+            raise ValueError("일반화 설정 · width · depth · seed가 같은 스케치만 합칠 수 있습니다.")
+        self.table += other.table
+        self.rows += other.rows
+        self._keep_smallest(other.sample_keys, other.sample_labels)
+        return self
+
+    def error_bound(self) -> float:
+        """확률 1 - e^-depth 이상으로 추정값이 실제 값보다 최대 이만큼 크다 (e·N/width)."""
+        return math.e * self.rows / self.width
+
+    def distinct_classes(self) -> float:
+        """하위 해시 표본으로 추정한 서로 다른 집합 수."""
+        n = len(self.sample_keys)
+        if n < self.sample_size:
+            return float(n)
+        return (n - 1) / ((float(self.sample_keys[-1]) + 1) / (_MASK64 + 1))
+
+    def report(self, k: int):
+        """(요약 dict, 표본 집합별 추정 표)를 돌려준다.
+
+        상태 "k 미만 확실"은 추정값 < k (과대추정만 하므로 오탐 없음),
+        "k 미만 가능"은 추정값 - 오차 한계 < k 인 집합이다.
+        """
+        est = self.estimate(self.sample_keys)
+        bound = self.error_bound()
+        status = np.select([est < k, est - bound < k], ["k 미만 확실", "k 미만 가능"], "k 이상")
+        table = self.sample_labels.assign(추정_k=est, 상태=status).sort_values("추정_k", ignore_index=True)
+
+        sampled = max(len(est), 1)
+        n_classes = self.distinct_classes()
+        below = int((est < k).sum())
+        maybe = int((est - bound < k).sum())
+        summary = {
+            "rows": self.rows,
+            "classes_est": round(n_classes),
+            "sampled_classes": len(est),
+            "below_k_share": below / sampled,
+            "below_k_classes_est": round(below / sampled * n_classes),
+            "maybe_below_k_share": maybe / sampled,
+            "error_bound": bound,
+            "confidence": 1 - math.exp(-self.depth),
+            # 집합 수가 칸 수에 가까우면 칸마다 여러 집합이 겹쳐 작은 집합을 구분하지 못한다
+            "saturated": n_classes > self.width / 4,
+            "memory_bytes": self.table.nbytes + self.sample_keys.nbytes,
+        }
+        return summary, table
+
+
+# -------------------------------------------------
+# 파일 한 번 훑기
+# -------------------------------------------------
+
+
+def _iter_frames(path: str, columns: list, zip_col: str, batch_rows: int = DEFAULT_BATCH_ROWS):
+    # 필요한 두 컬럼만 열 단위로 조금씩 읽는다 (우편번호는 앞자리 0을 지키도록 문자열)
+    import pyarrow as pa
+
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pyarrow.csv as pacsv
+
+        convert = pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types={zip_col: pa.dictionary(pa.int32(), pa.string())},
+        )
+        with pacsv.open_csv(path, convert_options=convert) as reader:
+            for batch in reader:
+                yield batch.to_pandas()
+
+
+def screen_file(
+    path: str,
+    group_size: int,
+    keep: int,
+    age_col: str = "나이",
+    zip_col: str = "우편번호",
+    width: int = DEFAULT_WIDTH,
+    depth: int = DEFAULT_DEPTH,
+    sample_size: int = DEFAULT_SAMPLE,
+) -> RiskSketch:
+    """CSV/Parquet 파일을 한 번 훑어 RiskSketch를 만든다."""
+    sketch = RiskSketch(group_size, keep, width, depth, sample_size)
+    for frame in _iter_frames(path, [age_col, zip_col], zip_col):
+        sketch.update(frame, age_col, zip_col)
+    return sketch
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    parser = argparse.ArgumentParser(description="Count-Min 스케치로 거대 파일의 k-익명성 위험을 한 번에 훑어 점검")
+    parser.add_argument("inputs", nargs="+", help="CSV/Parquet 파일 (여러 개면 파일마다 프로세스 하나로 훑은 뒤 합침)")
+    parser.add_argument("--age-col", default="나이")
+    parser.add_argument("--zip-col", default="우편번호")
+    parser.add_argument("--group-size", type=int, default=10)
+    parser.add_argument("--keep", type=int, default=3)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    scan = partial(
+        screen_file,
+        group_size=args.group_size,
+        keep=args.keep,
+        age_col=args.age_col,
+        zip_col=args.zip_col,
+        width=args.width,
+        depth=args.depth,
+    )
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        sketches = list(pool.map(scan, args.inputs))
+    merged = sketches[0]
+    for other in sketches[1:]:
+        merged.merge(other)
+
+    result, flagged = merged.report(args.k)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    print(flagged[flagged["상태"] != "k 이상"].head(20).to_string(index=False))
+    print(f"{time.perf_counter() - t0:.1f}초")
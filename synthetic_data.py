@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# 합성 의료 데이터 생성기 (부하 테스트용)
+#  2탭 예시(10행)와 같은 컬럼(나이 · 우편번호 · 질병)을 수백만~수억 행으로 만든다.
+#  - 나이: 5살 구간별 인구 비율(인구 피라미드) → 구간 안에서는 균등
+#  - 우편번호: 시·도(앞 두 자리)별 인구 비중 + 그 안에서 Zipf 분포
+#    → 일부 동네에 사람이 몰리고, 한두 명뿐인 드문 우편번호가 많이 생긴다
+#  - 질병: 나이대별 분포(고령일수록 고혈압·당뇨·암 증가) + 아주 드문 희귀질환
+#  - 블록(기본 100만 행)마다 seed에서 갈라낸 독립 난수열을 쓰고, 블록 안에서도 뽑는 값 종류마다 난수열을 따로 둔다
+#    → 마지막 블록을 남은 행 수만큼만 만들어도 같은 seed · block_rows면 n행 데이터는 언제나
+#      더 큰 데이터의 앞 n행과 같다 (스트리밍 여부와도 무관)
+# -------------------------------------------------
+
+DEFAULT_BLOCK_ROWS = 1_000_000
+
+# 0~4세, 5~9세, ..., 95~99세 인구 비율 (대략적인 국내 인구 피라미드 모양)
+AGE_BAND_WEIGHTS = np.array(
+    [3.0, 4.0, 4.5, 4.6, 5.0, 6.2, 6.0, 6.6, 7.6, 8.0, 8.4, 8.6, 7.6, 6.2, 4.4, 3.4, 2.6, 1.4, 0.5, 0.1]
+)
+
+# 우편번호 앞 두 자리(01~63) → 시·도, 인구 비중
+REGION_WEIGHTS = {
+    range(1, 10): 18.5,  # 서울
+    range(10, 21): 26.5,  # 경기
+    range(21, 24): 5.8,  # 인천
+    range(24, 27): 3.0,  # 강원
+    range(27, 30): 3.1,  # 충북
+    range(30, 31): 0.8,  # 세종
+    range(31, 34): 4.2,  # 충남
+    range(34, 36): 2.8,  # 대전
+    range(36, 41): 5.0,  # 경북
+    range(41, 44): 4.6,  # 대구
+    range(44, 46): 2.2,  # 울산
+    range(46, 50): 6.4,  # 부산
+    range(50, 54): 6.4,  # 경남
+    range(54, 57): 3.4,  # 전북
+    range(57, 61): 3.5,  # 전남
+    range(61, 63): 2.8,  # 광주
+    range(63, 64): 1.3,  # 제주
+}
+
+DISEASES = [
+    "감기", "독감", "위염", "고혈압", "당뇨", "우울증", "천식", "관절염", "암", "치매",
+    "루게릭병", "헌팅턴병", "크론병", "베체트병",
+]
+
+# 나이대(0~19, 20~49, 50~69, 70세 이상)별 질병 상대 빈도. 뒤 네 개는 희귀질환
+DISEASE_WEIGHTS = np.array(
+    [
+        [40, 20, 8, 0.2, 0.5, 3, 12, 0.3, 0.3, 0.01, 0.002, 0.002, 0.02, 0.01],
+        [25, 12, 15, 6, 4, 12, 5, 4, 2, 0.05, 0.005, 0.005, 0.05, 0.03],
+        [12, 8, 12, 25, 18, 6, 4, 12, 6, 1.5, 0.01, 0.005, 0.02, 0.02],
+        [10, 9, 8, 28, 20, 5, 5, 15, 9, 12, 0.01, 0.005, 0.01, 0.01],
+    ]
+)
+_DISEASE_AGE_EDGES = np.array([20, 50, 70])
+
+_ZIP_LOW, _ZIP_HIGH = 1_000, 64_000
+ZIP_CATEGORIES = pd.Index([f"{z:05d}" for z in range(_ZIP_LOW, _ZIP_HIGH)])
+# 뒤 세 자리의 인기 순위 → 실제 번호 (seed와 무관하게 고정)
+_ZIP_SUFFIX_ORDER = np.random.default_rng(20240101).permutation(1000)
+
+
+def _region_probs() -> np.ndarray:
+    probs = np.zeros(64)
+    for regions, weight in REGION_WEIGHTS.items():
+        probs[list(regions)] = weight / len(regions)
+    return probs / probs.sum()
+
+
+def _block(seq: np.random.SeedSequence, n: int, zipf_a: float) -> pd.DataFrame:
+    # 값 종류마다 난수열을 따로 써서, n이 작아도 각 값은 n을 크게 했을 때의 앞부분과 같다
+    band_rng, offset_rng, region_rng, rank_rng, disease_rng = map(np.random.default_rng, seq.spawn(5))
+
+    # 나이: 5살 구간을 먼저 고르고 구간 안에서 균등하게
+    band = band_rng.choice(len(AGE_BAND_WEIGHTS), size=n, p=AGE_BAND_WEIGHTS / AGE_BAND_WEIGHTS.sum())
+    ages = (band * 5 + offset_rng.integers(0, 5, size=n)).astype(np.uint8)
+
+    # 우편번호: 시·도 앞 두 자리 + 뒤 세 자리 Zipf 순위 (순위→번호 대응은 고정 순열로 섞음)
+    region = region_rng.choice(64, size=n, p=_region_probs())
+    rank = (rank_rng.zipf(zipf_a, size=n) - 1) % 1000
+    zips = region * 1000 + _ZIP_SUFFIX_ORDER[rank]
+
+    # 질병: 나이대별 분포에서 역 CDF로 한꺼번에 뽑는다
+    cdf = np.cumsum(DISEASE_WEIGHTS, axis=1)
+    cdf /= cdf[:, -1:]
+    cdf[:, -1] = 1.0
+    age_group = np.searchsorted(_DISEASE_AGE_EDGES, ages, side="right")
+    u = disease_rng.random(n)
+    disease = np.empty(n, dtype=np.int8)
+    for g in range(len(cdf)):
+        in_group = age_group == g
+        disease[in_group] = np.searchsorted(cdf[g], u[in_group])
+
+    return pd.DataFrame(
+        {
+            "나이": ages,
+            "우편번호": pd.Categorical.from_codes(zips - _ZIP_LOW, categories=ZIP_CATEGORIES),
+            "질병": pd.Categorical.from_codes(disease, categories=DISEASES),
+        }
+    )
+
+
+def iter_synthetic(n_rows: int, seed: int = 0, block_rows: int = DEFAULT_BLOCK_ROWS, zipf_a: float = 1.6):
+    """합성 데이터를 block_rows 행씩 DataFrame으로 돌려준다 (마지막 블록은 더 짧을 수 있음, 0행이면 블록 없음)."""
+    if n_rows < 0:
+        raise ValueError(f"n_rows는 0 이상이어야 합니다: {n_rows}")
+    blocks = -(-n_rows // block_rows)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(blocks)):
+        yield _block(child, min(block_rows, n_rows - i * block_rows), zipf_a)
+
+
+def generate(n_rows: int, seed: int = 0, block_rows: int = DEFAULT_BLOCK_ROWS, zipf_a: float = 1.6) -> pd.DataFrame:
+    """합성 데이터 n_rows 행을 한 DataFrame으로 만든다. 0행이면 같은 컬럼 · dtype의 빈 표."""
+    blocks = list(iter_synthetic(n_rows, seed, block_rows, zipf_a))
+    if not blocks:
+        return _block(np.random.SeedSequence(seed), 0, zipf_a)
+    return pd.concat(blocks, ignore_index=True)
+
+
+def write_parquet(
+    path: str,
+    n_rows: int,
+    seed: int = 0,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    zipf_a: float = 1.6,
+    on_progress=None,
+) -> int:
+    """합성 데이터를 블록 단위로 Parquet 파일에 이어 쓴다. 메모리에는 블록 하나만 올라간다."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for block in iter_synthetic(n_rows, seed, block_rows, zipf_a):
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(block)
+            if on_progress is not None:
+                on_progress(rows, rows / n_rows)
+        if writer is None:
+            # 0행이어도 스키마만 있는 파일은 남긴다
+            empty = _block(np.random.SeedSequence(seed), 0, zipf_a)
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="부하 테스트용 합성 의료 데이터(나이·우편번호·질병) 생성")
+    parser.add_argument("output", help="저장할 Parquet 경로")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS)
+    parser.add_argument("--zipf-a", type=float, default=1.6, help="우편번호 쏠림 정도 (클수록 소수 동네에 집중)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    total_rows = write_parquet(
+        args.output,
+        args.rows,
+        seed=args.seed,
+        block_rows=args.block_rows,
+        zipf_a=args.zipf_a,
+        on_progress=lambda n, p: print(f"\r{p:6.1%}  {n:,}행", end="", flush=True),
+    )
+    print(f"\n완료: {total_rows:,}행, {time.perf_counter() - t0:.1f}초")
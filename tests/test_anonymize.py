@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from anonymize import (
+    AGE_LEVELS,
+    ZIP_LEVELS,
+    _weighted_median,
+    build_count_cube,
+    generalize_age_series,
+    generalize_zip_series,
+    global_recoding_summary,
+    group_sizes,
+    mondrian_partition,
+    rollup_group_sizes,
+    rollup_privacy_metrics,
+    search_generalization,
+)
+
+
+def _people():
+    rng = np.random.default_rng(0)
+    n = 400
+    ages = rng.integers(20, 70, n).astype(np.float64)
+    zips = rng.choice(["06236", "06237", "13494", "48058"], n).astype(object)
+    ages[:7] = np.nan
+    zips[5:12] = None
+    return pd.DataFrame({"나이": ages, "우편번호": zips, "질병": rng.choice(["감기", "위염", "당뇨"], n)})
+
+
+def test_rollups_count_missing_quasi_identifiers_as_a_group():
+    df = _people()
+    cube = build_count_cube(df, sensitive_col="질병")
+    sizes = rollup_group_sizes(cube, 10, 2)
+    metrics = rollup_privacy_metrics(cube, 10, 2)
+
+    assert sizes["k"].sum() == len(df)
+    assert metrics["k"].sum() == len(df)
+    assert sorted(sizes["k"]) == sorted(metrics["k"])
+    assert sizes["나이_구간"].isna().any() and sizes["우편번호_일반화"].isna().any()
+
+
+def test_rollup_min_k_agrees_with_search():
+    df = _people()
+    cube = build_count_cube(df)
+    found = search_generalization(cube, 2, count_col="n")
+    sizes = rollup_group_sizes(cube, found["age_group_size"], found["zip_keep"])
+    assert sizes["k"].min() == found["min_k"]
+
+
+def _exhaustive_min_k(df):
+    # 격자의 모든 (나이 단계, 우편번호 단계)를 groupby로 직접 센다 (결측도 한 그룹)
+    min_k = {}
+    for ai, age in enumerate(AGE_LEVELS):
+        for zi, keep in enumerate(ZIP_LEVELS):
+            keys = [generalize_age_series(df["나이"], age), generalize_zip_series(df["우편번호"], keep)]
+            min_k[(ai, zi)] = int(df.groupby(keys, observed=True, dropna=False).size().min())
+    return min_k
+
+
+def _lattice_people(seed):
+    rng = np.random.default_rng(seed)
+    n = 3000
+    prefixes = rng.choice(["06", "13", "48", "63"], n, p=[0.5, 0.3, 0.15, 0.05])
+    zips = [p + f"{z:03d}" for p, z in zip(prefixes, rng.zipf(1.6, n) % 1000)]
+    ages = np.clip(rng.normal(45, 18, n).round(), 0, 99)
+    return pd.DataFrame({"나이": ages, "우편번호": zips})
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("target_k", [1, 2, 5, 20, 60, 150, 3001])
+def test_search_matches_exhaustive_lattice(seed, target_k):
+    df = _lattice_people(seed)
+    min_k = _exhaustive_min_k(df)
+    ok = {node for node, k in min_k.items() if k >= target_k}
+    found = search_generalization(df, target_k)
+
+    if not ok:
+        assert found is None
+        return
+    # 경계 = 만족하는 설정 중 두 축 모두 더 세밀한 만족 설정이 없는 것
+    pareto = [(a, z) for a, z in ok if not any((a2, z2) != (a, z) and a2 <= a and z2 <= z for a2, z2 in ok)]
+    assert sorted(found["frontier"]) == sorted((AGE_LEVELS[a], ZIP_LEVELS[z]) for a, z in pareto)
+    best = min(a / (len(AGE_LEVELS) - 1) + z / (len(ZIP_LEVELS) - 1) for a, z in ok)
+    chosen = (AGE_LEVELS.index(found["age_group_size"]), ZIP_LEVELS.index(found["zip_keep"]))
+    assert chosen[0] / (len(AGE_LEVELS) - 1) + chosen[1] / (len(ZIP_LEVELS) - 1) == best
+    assert found["min_k"] == min_k[chosen]
+    assert found["evaluations"] <= len(AGE_LEVELS) + len(ZIP_LEVELS)
+
+
+def test_group_sizes_keeps_missing_rows():
+    df = _people()
+    assert group_sizes(df, ["나이", "우편번호"])["k"].sum() == len(df)
+
+
+def test_weighted_median_matches_sorted_reference():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        vals = rng.integers(0, 30, rng.integers(1, 60)).astype(np.float64)
+        weights = rng.integers(1, 10, len(vals))
+        order = np.argsort(vals, kind="stable")
+        cw = np.cumsum(weights[order])
+        expected = vals[order][np.searchsorted(cw, cw[-1] / 2)]
+        assert _weighted_median(vals, weights) == expected
+
+
+def test_mondrian_keeps_missing_quasi_identifiers_as_their_own_classes():
+    df = pd.DataFrame({"나이": [30, 31, np.nan, np.nan, 45], "우편번호": ["12345", "12346", "12345", None, None]})
+    cube = build_count_cube(df)
+    table, summary = mondrian_partition(cube, 2)
+    recoded = global_recoding_summary(cube, 10, 3)
+
+    assert table["k"].sum() == len(df)
+    assert summary["min_k"] == recoded["min_k"] == rollup_group_sizes(cube, 10, 3)["k"].min() == 1
+    assert summary["missing_rows"] == recoded["missing_rows"] == 3
+    assert (table["나이_범위"] == "결측").sum() == 2
+
+
+def test_mondrian_meets_k_on_complete_data():
+    df = _people().dropna()
+    table, summary = mondrian_partition(build_count_cube(df), 5)
+    assert summary["min_k"] >= 5
+    assert table["k"].sum() == len(df)
+
+
+def test_global_recoding_ncp_uses_published_interval_width():
+    # 나이 10살 구간 · 우편번호 그대로: 각 구간에 한 나이만 있어도 공개 범위는 10살 폭
+    df = pd.DataFrame({"나이": [20, 20, 40, 40], "우편번호": ["11111"] * 4})
+    cube = build_count_cube(df)
+    assert global_recoding_summary(cube, 10, 5)["ncp"] == pytest.approx((9 / 20 + 0) / 2)
+    assert global_recoding_summary(cube, 1, 5)["ncp"] == 0
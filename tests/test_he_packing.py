@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from he_packing import SlotPacker, compare_paillier, compare_toy, plan_slots
+from paillier import generate_keypair
+
+
+@pytest.mark.parametrize("slot_bits", [1, 5, 8, 13, 64])
+def test_pack_unpack_round_trip(slot_bits):
+    rng = np.random.default_rng(slot_bits)
+    values = rng.integers(0, 1 << min(slot_bits, 63), 101, dtype=np.uint64)
+    if slot_bits == 64:
+        values[0] = np.iinfo(np.uint64).max
+    packer = SlotPacker(slot_bits, 7)
+    packed = packer.pack(values)
+
+    assert len(packed) == 15
+    assert all(p.bit_length() <= packer.capacity_bits for p in packed)
+    assert (packer.unpack(packed, len(values)) == values).all()
+
+
+def test_pack_rejects_values_wider_than_slot():
+    with pytest.raises(ValueError):
+        SlotPacker(4, 3).pack([1, 16, 2])
+
+
+@pytest.mark.parametrize("n_values", [1, 10, 999, 5000])
+def test_planned_slots_hold_the_worst_case_sum(n_values):
+    # 모든 값이 최댓값이어도 어느 슬롯도 옆 슬롯으로 올림이 넘어가지 않아야 한다
+    value_max = 20
+    slot_bits, slots = plan_slots(256, value_max, n_values)
+    packer = SlotPacker(slot_bits, slots)
+    total = sum(packer.pack(np.full(n_values, value_max)))
+
+    assert total.bit_length() <= packer.capacity_bits
+    assert packer.sum_slots(total) == value_max * n_values
+
+
+def test_too_narrow_slots_overflow_into_neighbours():
+    # 여유 비트 없이 값 폭에 딱 맞춘 슬롯은 두 번만 더해도 깨진다 (plan_slots가 막는 상황)
+    packer = SlotPacker(5, 4)
+    total = sum(packer.pack(np.full(8, 20)))
+    assert packer.sum_slots(total) != 20 * 8
+
+
+def test_plan_slots_rejects_tiny_capacity():
+    with pytest.raises(ValueError):
+        plan_slots(4, 20, 100)
+
+
+def test_packed_sums_match_plain_sums():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 21, 300)
+    pk, sk = generate_keypair(512)
+
+    for result in (compare_toy(values, 1 << 512), compare_paillier(values, pk, sk)):
+        plain, packed, expected = result["sums"]
+        assert plain == packed == expected
+        assert result["ciphertexts"][1] < result["ciphertexts"][0]
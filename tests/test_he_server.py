@@ -0,0 +1,37 @@
+import asyncio
+import math
+
+import pytest
+
+from he_server import DEFAULT_HOST, AggregationServer, _request, run_load, tree_reduce
+
+
+def test_tree_reduce_matches_sum_and_product():
+    values = list(range(1, 38))
+    modulus = 1_000_003
+    assert tree_reduce(values) == sum(values)
+    assert tree_reduce(values, modulus) == math.prod(values) % modulus
+    assert tree_reduce([]) == 0 and tree_reduce([], modulus) == 1
+
+
+async def _load_and_probe(engine, **load_options):
+    # parallel_min을 작게 해 배치를 작업 프로세스 여러 개로 나누는 경로도 지나게 한다
+    server = AggregationServer(workers=2, parallel_min=8)
+    port = await server.start(DEFAULT_HOST, 0)
+    try:
+        report = await run_load(DEFAULT_HOST, port, engine=engine, **load_options)
+        missing = await _request(DEFAULT_HOST, port, {"op": "total", "round": "없는 라운드"})
+        broken = await _request(DEFAULT_HOST, port, {"op": "submit"})
+        return report, missing, broken
+    finally:
+        await server.close()
+
+
+@pytest.mark.parametrize("engine", ["toy", "paillier"])
+def test_server_total_decrypts_to_plain_sum(engine):
+    report, missing, broken = asyncio.run(
+        _load_and_probe(engine, clients=4, batches_per_client=3, batch_size=16, bits=512)
+    )
+    assert report["requests"] == 12
+    assert report["decrypted_total"] == report["plain_total"]
+    assert not missing["ok"] and not broken["ok"]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from linkage import join_keys, link_frames
+from pseudonym import make_pseudo_ids, make_pseudo_keys, pseudo_keys_to_series
+
+N = 1000
+TEXTS = [f"person-{i}" for i in range(N)]
+SALT = "salt"
+
+
+def _ids(fmt: str) -> pd.Series:
+    if fmt == "hex":
+        return pd.Series(make_pseudo_ids(TEXTS, SALT, workers=1))
+    if fmt == "HEX":
+        return pd.Series(make_pseudo_ids(TEXTS, SALT, workers=1)).str.upper()
+    width = int(fmt)
+    return pseudo_keys_to_series(make_pseudo_keys(TEXTS, SALT, width=width, workers=1))
+
+
+FORMATS = ["hex", "HEX", "8", "16", "32"]
+
+
+@pytest.mark.parametrize("method", ["hash", "sort"])
+@pytest.mark.parametrize("left_fmt", FORMATS)
+@pytest.mark.parametrize("right_fmt", FORMATS)
+def test_cross_format_link_matches_every_row(left_fmt, right_fmt, method):
+    left = pd.DataFrame({"가명ID": _ids(left_fmt), "a": np.arange(N)})
+    # 순서를 섞은 오른쪽 절반만 남겨 실제 결합처럼 만든다
+    order = np.random.default_rng(0).permutation(N)[: N // 2]
+    right = pd.DataFrame({"가명ID": _ids(right_fmt).iloc[order].reset_index(drop=True), "b": order})
+
+    linked, stats = link_frames(left, right, method=method)
+
+    assert stats["matched_pairs"] == N // 2
+    assert stats["prefix_collisions"] == 0
+    assert (linked["a"].to_numpy() == linked["b"].to_numpy()).all()
+
+
+def test_prefix_collision_is_rejected():
+    ids = make_pseudo_ids(TEXTS[:2], SALT, workers=1)
+    # 앞 8바이트는 같고 뒤가 다른 가짜 ID
+    forged = ids[0][:16] + ids[1][16:]
+    left = pd.DataFrame({"가명ID": [ids[0]]})
+    right = pd.DataFrame({"가명ID": [forged]})
+
+    _, stats = link_frames(left, right)
+
+    assert stats["matched_pairs"] == 0
+    assert stats["prefix_collisions"] == 1
+
+
+def test_join_keys_agree_across_formats():
+    keys = {fmt: join_keys(_ids(fmt)) for fmt in FORMATS}
+    for fmt in FORMATS[1:]:
+        assert (keys[fmt] == keys["hex"]).all()
@@ -0,0 +1,48 @@
+import pytest
+
+from paillier import RandomnessPool, generate_keypair
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return generate_keypair(512)
+
+
+@pytest.fixture(scope="module")
+def pool(keys):
+    pk, sk = keys
+    return RandomnessPool(pk, private_key=sk)
+
+
+@pytest.mark.parametrize("use_pool", [False, True])
+def test_round_trip(keys, pool, use_pool):
+    pk, sk = keys
+    values = [0, 1, -1, 12345, -98765, pk.max_int, -pk.max_int]
+    cts = pk.encrypt_many(values, pool if use_pool else None)
+    assert [sk.decrypt(c) for c in cts] == values
+    assert [sk.decrypt_textbook(c) for c in cts] == values
+
+
+def test_homomorphic_add_and_scalar(keys, pool):
+    pk, sk = keys
+    values = list(range(-50, 150, 7))
+    cts = pk.encrypt_many(values, pool)
+    assert sk.decrypt(pk.sum(cts)) == sum(values)
+    assert sk.decrypt(pk.add(cts[0], cts[1])) == values[0] + values[1]
+    assert sk.decrypt(pk.add_plain(cts[2], 1000)) == values[2] + 1000
+    assert sk.decrypt(pk.mul_plain(cts[3], -7)) == -7 * values[3]
+
+
+def test_pool_factors_are_fresh_like_direct_encryption(keys, pool):
+    # c mod n = (난수 인자) mod n 이라, 인자를 다시 쓰면 바깥에서도 같은 값으로 보인다
+    pk, _ = keys
+    pooled = [pk.encrypt(7, pool) % pk.n for _ in range(2000)]
+    fresh = [pk.encrypt(7) % pk.n for _ in range(200)]
+    assert len(set(pooled)) == len(pooled)
+    assert len(set(fresh)) == len(fresh)
+
+
+def test_pool_factor_is_an_nth_residue(keys, pool):
+    # 난수 인자는 n제곱 잉여여야 복호화 때 사라진다: E(0)이 0으로 풀린다
+    pk, sk = keys
+    assert all(sk.decrypt(pool.next()) == 0 for _ in range(50))
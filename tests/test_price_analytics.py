@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from price_analytics import analyze
+
+
+def test_empty_range_returns_empty_results():
+    prices = pd.DataFrame(columns=["A", "B"], index=pd.DatetimeIndex([]), dtype=np.float64)
+    result = analyze(prices)
+
+    for key in ("rebased", "log_returns", "volatility", "drawdown"):
+        assert result[key].shape == (0, 2)
+    assert result["correlation"].shape == (2, 2)
+    assert list(result["summary"].index) == ["A", "B"]
+    assert result["summary"].isna().all().all()
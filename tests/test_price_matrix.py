@@ -0,0 +1,35 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from price_matrix import build
+
+TICKERS = ["A", "B", "C", "D"]
+START, END = date(2024, 1, 1), date(2024, 3, 1)
+
+
+def _fetch(ticker, start, end):
+    dates = pd.bdate_range(start, end, inclusive="left")
+    base = TICKERS.index(ticker) * 1000
+    return pd.DataFrame({"Close": base + np.arange(len(dates), dtype=np.float64)}, index=dates)
+
+
+def test_select_matches_fetched_closes(tmp_path):
+    matrix = build(str(tmp_path), TICKERS, _fetch, START, END, "test")
+    selected = matrix.select(["D", "ZZZ", "A"], date(2024, 2, 1), END)
+
+    assert list(selected.columns) == ["D", "A"]
+    for ticker in selected.columns:
+        expected = _fetch(ticker, START, END)["Close"].loc["2024-02-01":]
+        assert (selected[ticker].to_numpy() == expected.to_numpy(np.float32)).all()
+
+
+def test_select_adjacent_columns_is_a_view(tmp_path):
+    matrix = build(str(tmp_path), TICKERS, _fetch, START, END, "test")
+    adjacent = matrix.select(["B", "C"], START, END)
+    scattered = matrix.select(["A", "C"], START, END)
+
+    assert np.shares_memory(adjacent.to_numpy(), matrix.closes)
+    assert not np.shares_memory(scattered.to_numpy(), matrix.closes)
+    assert (scattered["C"] == adjacent["C"]).all()
@@ -0,0 +1,77 @@
+import time
+from collections import Counter
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from price_provider import FIELDS, LocalFileProvider, SyntheticProvider, fetch_each, make_provider
+from price_store import PriceStore
+
+
+def test_synthetic_prices_do_not_depend_on_how_ranges_are_split():
+    provider = SyntheticProvider(seed=3)
+    whole = provider.fetch("AAA", date(2024, 1, 1), date(2024, 4, 1))
+    parts = pd.concat(
+        [
+            provider.fetch("AAA", date(2024, 1, 1), date(2024, 2, 10)).loc[:"2024-02-09"],
+            provider.fetch("AAA", date(2024, 2, 10), date(2024, 4, 1)),
+        ]
+    )
+
+    assert list(whole.columns) == FIELDS
+    assert whole.index.min() >= pd.Timestamp("2024-01-01") and whole.index.max() < pd.Timestamp("2024-04-01")
+    pd.testing.assert_frame_equal(whole, parts, check_freq=False)
+    assert not whole.equals(provider.fetch("BBB", date(2024, 1, 1), date(2024, 4, 1)))
+
+
+def test_local_provider_reads_a_store_directory(tmp_path):
+    store = PriceStore(str(tmp_path), SyntheticProvider())
+    stored = store.fetch("AAA", date(2024, 1, 1), date(2024, 3, 1))
+    local = LocalFileProvider(str(tmp_path))
+
+    got = local.fetch("aaa", date(2024, 2, 1), date(2024, 3, 1))
+    assert (got.to_numpy() == stored.loc["2024-02-01":].to_numpy()).all()
+    assert local.fetch("ZZZ", date(2024, 1, 1), date(2024, 3, 1)).empty
+
+
+def test_make_provider_parses_specs(tmp_path):
+    assert isinstance(make_provider("synthetic"), SyntheticProvider)
+    assert make_provider("synthetic:7").seed == 7
+    assert make_provider(f"local:{tmp_path}").root == str(tmp_path)
+    for spec in ("local", "nope"):
+        with pytest.raises(ValueError):
+            make_provider(spec)
+
+
+def _run(fetch, tickers, **options):
+    return {t: (frame, error) for t, frame, error in fetch_each(fetch, tickers, date(2024, 1, 1), date(2024, 2, 1), **options)}
+
+
+def test_fetch_each_deadline_starts_when_the_attempt_runs():
+    # 티커 20개를 스레드 2개로 받으면 전체는 제한 시간보다 오래 걸리지만, 시도 하나하나는 제한 시간 안에 끝난다
+    def fetch(ticker, start, end):
+        time.sleep(0.05)
+        return ticker
+
+    results = _run(fetch, [f"T{i}" for i in range(20)], timeout=0.2, retries=0, workers=2)
+    assert {t: r for t, (r, _) in results.items()} == {f"T{i}": f"T{i}" for i in range(20)}
+
+
+def test_fetch_each_retries_then_reports_failures():
+    calls = Counter()
+
+    def fetch(ticker, start, end):
+        calls[ticker] += 1
+        if ticker == "SLOW":
+            time.sleep(0.3)
+        if ticker == "BAD" or (ticker == "FLAKY" and calls[ticker] == 1):
+            raise ConnectionError(ticker)
+        return ticker
+
+    results = _run(fetch, ["OK", "FLAKY", "BAD", "SLOW"], timeout=0.1, retries=2, backoff=0.01, workers=4)
+    assert results["OK"] == ("OK", None) and results["FLAKY"] == ("FLAKY", None)
+    assert calls["FLAKY"] == 2 and calls["BAD"] == 3
+    assert isinstance(results["BAD"][1], ConnectionError)
+    # 느린 시도가 아직 도는 동안에는 새 시도를 띄우지 않는다
+    assert isinstance(results["SLOW"][1], TimeoutError) and calls["SLOW"] == 1
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pandas as pd
+
+from price_provider import PriceProvider, SyntheticProvider
+from price_store import PriceStore
+
+
+class CountingProvider(PriceProvider):
+    name = "counting"
+
+    def __init__(self, listed: date | None = None):
+        self.source = SyntheticProvider()
+        self.listed = pd.Timestamp(listed) if listed else None
+        self.calls = []
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((ticker, pd.Timestamp(start), pd.Timestamp(end)))
+        frame = self.source.fetch(ticker, start, end).loc[: pd.Timestamp(end) - pd.Timedelta(days=1)]
+        return frame if self.listed is None else frame.loc[self.listed :]
+
+
+def _ts(*days):
+    return tuple(pd.Timestamp(d) for d in days)
+
+
+def test_delta_fetch_requests_only_missing_head_and_tail(tmp_path):
+    provider = CountingProvider()
+    store = PriceStore(str(tmp_path), provider)
+
+    first = store.fetch("AAA", date(2024, 1, 1), date(2024, 3, 1))
+    assert [c[1:] for c in provider.calls] == [_ts("2024-01-01", "2024-03-01")]
+
+    # 같은 구간 · 안쪽 구간은 저장소에서만 읽는다
+    provider.calls.clear()
+    store.fetch("AAA", date(2024, 1, 1), date(2024, 3, 1))
+    inner = store.fetch("AAA", date(2024, 1, 15), date(2024, 2, 15))
+    assert provider.calls == []
+    assert inner.equals(first.loc["2024-01-15":"2024-02-14"])
+
+    # 앞으로 늘리면 앞 구간만, 뒤로 늘리면 마지막 저장일부터 뒤 구간만 받는다
+    store.fetch("AAA", date(2023, 12, 1), date(2024, 3, 1))
+    store.fetch("AAA", date(2023, 12, 1), date(2024, 4, 1))
+    assert [c[1:] for c in provider.calls] == [
+        _ts("2023-12-01", "2024-01-01"),
+        _ts("2024-02-29", "2024-04-01"),
+    ]
+    assert store.downloads == 3
+
+    whole = store.fetch("AAA", date(2023, 12, 1), date(2024, 4, 1))
+    expected = SyntheticProvider().fetch("AAA", date(2023, 12, 1), date(2024, 4, 1)).loc[:"2024-03-31"]
+    assert whole.index.equals(expected.index)
+    assert (whole.to_numpy() == expected.to_numpy()).all()
+
+
+def test_range_before_listing_is_not_requested_again(tmp_path):
+    provider = CountingProvider(listed=date(2024, 2, 1))
+    store = PriceStore(str(tmp_path), provider)
+
+    store.fetch("NEW", date(2024, 1, 1), date(2024, 3, 1))
+    store.fetch("NEW", date(2024, 1, 1), date(2024, 3, 1))
+    assert len(provider.calls) == 1
+
+
+def test_download_uses_ticker_field_columns(tmp_path):
+    store = PriceStore(str(tmp_path), CountingProvider())
+    prices = store.download(["AAA", "BBB"], date(2024, 1, 1), date(2024, 2, 1))
+
+    assert list(prices.columns.get_level_values(0).unique()) == ["AAA", "BBB"]
+    assert list(prices["AAA"].columns) == ["Open", "High", "Low", "Close", "Volume"]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from linkage import link_frames
+from pseudonym import pseudo_key_column_to_hex, pseudonymize_frame
+
+RECORDS = pd.DataFrame(
+    {
+        "주민번호": ["900101-1234567", "", None, "850505-2345678", "850505-2345678", "  "],
+        "전화번호": ["010-1111-2222", "010-3333-4444", "010-5555-6666", None, "010-7777-8888", "010-0000-0000"],
+    }
+)
+MISSING = [False, True, True, True, False, True]
+
+
+def _pseudonymize(id_width):
+    return pseudonymize_frame(
+        RECORDS, rrn_col="주민번호", phone_col="전화번호", salt_value="s", id_width=id_width, executor="thread"
+    )
+
+
+@pytest.mark.parametrize("id_width", [None, 8, 16, 32])
+def test_missing_source_fields_leave_id_null(id_width):
+    out = _pseudonymize(id_width)
+    assert out["가명ID"].isna().tolist() == MISSING
+    hex_ids = pseudo_key_column_to_hex(out["가명ID"])
+    assert hex_ids[~np.array(MISSING)].nunique() == 2
+
+
+@pytest.mark.parametrize("id_width", [None, 8, 16, 32])
+def test_rows_without_id_are_not_linked(id_width):
+    out = _pseudonymize(id_width)
+    linked, stats = link_frames(out, out.rename(columns={"주민번호": "r", "전화번호": "p"}))
+    assert stats["left_rows"] == stats["right_rows"] == 2
+    assert stats["matched_pairs"] == 2
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from linkage import join_keys, link_files
+from pseudonym import make_pseudo_ids
+from pseudonym_stream import run_pipeline
+
+N = 500
+SALT = "salt"
+
+
+@pytest.fixture
+def customers(tmp_path):
+    path = tmp_path / "customers.csv"
+    pd.DataFrame(
+        {
+            "주민번호": [f"900101-{i:07d}" for i in range(N)],
+            "전화번호": [f"010-0000-{i:04d}" for i in range(N)],
+            "a": range(N),
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("id_width", [8, 16, 32])
+def test_csv_output_keeps_digest_prefix(customers, tmp_path, id_width):
+    out = tmp_path / f"pseudo_{id_width}.csv"
+    run_pipeline(
+        str(customers),
+        str(out),
+        rrn_col="주민번호",
+        phone_col="전화번호",
+        salt_value=SALT,
+        chunk_rows=128,
+        workers=1,
+        id_width=id_width,
+    )
+
+    written = pd.read_csv(out, dtype=str)["가명ID"]
+    source = pd.read_csv(customers, dtype=str)
+    full = make_pseudo_ids(source["주민번호"] + source["전화번호"], SALT, workers=1)
+    assert list(written) == [h[: id_width * 2] for h in full]
+
+
+def test_width8_csv_links_with_hex_output(customers, tmp_path):
+    hex_out, key_out = tmp_path / "hex.csv", tmp_path / "keys.csv"
+    options = dict(rrn_col="주민번호", phone_col="전화번호", salt_value=SALT, workers=1)
+    run_pipeline(str(customers), str(hex_out), **options)
+    run_pipeline(str(customers), str(key_out), id_width=8, **options)
+
+    left, right = pd.read_csv(hex_out, dtype=str), pd.read_csv(key_out, dtype=str)
+    assert (join_keys(left["가명ID"]) == join_keys(right["가명ID"])).all()
+    _, stats = link_files(str(hex_out), str(key_out), "가명ID", "hash")
+    assert stats["matched_pairs"] == N
+
+
+@pytest.mark.parametrize("out_name", ["pseudo.csv", "pseudo.parquet"])
+@pytest.mark.parametrize("id_width", [None, 8, 16])
+def test_rows_missing_rrn_or_phone_get_no_id(tmp_path, out_name, id_width):
+    source = tmp_path / "source.csv"
+    frame = pd.DataFrame(
+        {
+            "주민번호": [f"900101-{i:07d}" for i in range(N)],
+            "전화번호": [f"010-0000-{i:04d}" for i in range(N)],
+        }
+    )
+    # 첫 청크는 빈 값 없이, 뒤 청크에만 빈 값을 둔다 (Parquet 스키마가 첫 청크 기준이어도 이어 써져야 함)
+    frame.loc[300:319, "주민번호"] = ""
+    frame.loc[320:339, "전화번호"] = ""
+    frame.to_csv(source, index=False)
+    out = tmp_path / out_name
+    options = dict(rrn_col="주민번호", phone_col="전화번호", salt_value=SALT, chunk_rows=128, workers=1)
+    run_pipeline(str(source), str(out), id_width=id_width, **options)
+
+    _, stats = link_files(str(out), str(out), "가명ID", "hash")
+    assert stats["left_rows"] == N - 40
+    assert stats["matched_pairs"] == N - 40
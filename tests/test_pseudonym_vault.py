@@ -0,0 +1,35 @@
+from pseudonym import make_pseudo_ids
+from pseudonym_vault import PseudonymVault
+
+TEXTS = [f"900101-{i:07d}010-0000-{i:04d}" for i in range(50)]
+
+
+def test_long_salts_sharing_a_prefix_get_different_lookup_keys(tmp_path):
+    prefix = "s" * 64
+    a = PseudonymVault(str(tmp_path / "vault.db"), prefix + "A")
+    b = PseudonymVault(str(tmp_path / "vault.db"), prefix + "B")
+    try:
+        assert a._disk_key(TEXTS[0]) != b._disk_key(TEXTS[0])
+        assert a.get_many(TEXTS) == make_pseudo_ids(TEXTS, prefix + "A", workers=1)
+        # 같은 파일 · 같은 salt 버전이어도 다른 salt의 행을 가져다 쓰지 않는다
+        assert b.get_many(TEXTS) == make_pseudo_ids(TEXTS, prefix + "B", workers=1)
+        assert b.stats()["disk_hits"] == 0
+    finally:
+        a.close()
+        b.close()
+
+
+def test_reopened_vault_finds_ids_on_disk(tmp_path):
+    path = str(tmp_path / "vault.db")
+    first = PseudonymVault(path, "salt")
+    ids = first.get_many(TEXTS)
+    first.close()
+
+    second = PseudonymVault(path, "salt")
+    try:
+        assert second.get_many(TEXTS) == ids
+        assert second.get_many(TEXTS[:10]) == ids[:10]
+        stats = second.stats()
+        assert (stats["disk_hits"], stats["cache_hits"], stats["misses"]) == (50, 10, 0)
+    finally:
+        second.close()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_sketch import RiskSketch, class_keys
+
+
+def _people(seed, n=20_000):
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(0, 100, n)
+    zips = [f"{z:05d}" for z in rng.zipf(1.3, n) % 100_000]
+    return pd.DataFrame({"나이": ages, "우편번호": zips})
+
+
+def _true_counts(df, group_size=5, keep=4):
+    _, keys = class_keys(df["나이"], df["우편번호"], group_size, keep)
+    uniq, counts = np.unique(keys, return_counts=True)
+    return uniq, counts
+
+
+@pytest.mark.parametrize("width", [1 << 8, 1 << 12])
+def test_estimate_never_undercounts(width):
+    df = _people(0)
+    sketch = RiskSketch(5, 4, width=width, sample_size=256)
+    for start in range(0, len(df), 3_000):
+        sketch.update(df.iloc[start : start + 3_000])
+
+    keys, counts = _true_counts(df)
+    est = sketch.estimate(keys)
+    assert (est >= counts).all()
+    assert sketch.rows == len(df)
+    if width == 1 << 8:
+        # 칸보다 집합이 많으면 실제로 겹쳐 과대추정이 생겨야 검사가 의미 있다
+        assert (est > counts).any()
+
+
+def test_merge_matches_one_pass_over_combined_stream():
+    left, right = _people(1), _people(2)
+    both = pd.concat([left, right], ignore_index=True)
+    # 칸이 충분하면 겹침이 없어 합친 스케치 · 한 번에 센 스케치 · 정확한 값이 모두 같다
+    options = dict(width=1 << 20, sample_size=512)
+    merged = RiskSketch(5, 4, **options).update(left).merge(RiskSketch(5, 4, **options).update(right))
+    combined = RiskSketch(5, 4, **options).update(both)
+
+    keys, counts = _true_counts(both)
+    assert merged.rows == combined.rows == len(both)
+    assert (merged.estimate(keys) == counts).all()
+    assert (combined.estimate(keys) == counts).all()
+    assert (merged.sample_keys == combined.sample_keys).all()
+    pd.testing.assert_frame_equal(merged.sample_labels, combined.sample_labels)
+    assert merged.distinct_classes() == combined.distinct_classes()
+
+
+def test_merged_estimate_never_undercounts_with_collisions():
+    left, right = _people(3), _people(4)
+    options = dict(width=1 << 8, sample_size=256)
+    merged = RiskSketch(5, 4, **options).update(left).merge(RiskSketch(5, 4, **options).update(right))
+
+    keys, counts = _true_counts(pd.concat([left, right], ignore_index=True))
+    assert (merged.estimate(keys) >= counts).all()
+
+
+def test_merge_rejects_different_settings():
+    with pytest.raises(ValueError):
+        RiskSketch(5, 4, width=1 << 8).merge(RiskSketch(10, 4, width=1 << 8))
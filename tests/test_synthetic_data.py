@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import synthetic_data
+from synthetic_data import generate, write_parquet
+
+
+def test_zero_rows_keeps_schema(tmp_path):
+    empty, sample = generate(0), generate(10)
+    assert empty.empty
+    assert list(empty.columns) == list(sample.columns)
+    assert (empty.dtypes == sample.dtypes).all()
+
+    path = tmp_path / "empty.parquet"
+    assert write_parquet(str(path), 0) == 0
+    assert list(pd.read_parquet(path).columns) == list(sample.columns)
+
+
+def test_row_count_spans_blocks():
+    assert len(generate(25, block_rows=10)) == 25
+
+
+def test_last_block_is_sized_to_remaining_rows(monkeypatch):
+    sizes = []
+    block = synthetic_data._block
+    monkeypatch.setattr(synthetic_data, "_block", lambda seq, n, zipf_a: sizes.append(n) or block(seq, n, zipf_a))
+    generate(25, block_rows=10)
+    assert sizes == [10, 10, 5]
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, 10, 23])
+def test_smaller_data_is_prefix_of_larger(n_rows):
+    larger = generate(40, seed=5, block_rows=10)
+    assert generate(n_rows, seed=5, block_rows=10).equals(larger.head(n_rows))
+
+
+def test_negative_rows_rejected():
+    with pytest.raises(ValueError):
+        generate(-1)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from toy_he import INT64_MAX, decrypt_batch, decrypt_sum, encrypt_batch, sum_encrypted
+
+
+@pytest.mark.parametrize("key", [20_001, 1 << 80])
+def test_round_trip_and_encrypted_sum(key):
+    rng = np.random.default_rng(0)
+    m = rng.integers(0, 21, 1000)
+    c = encrypt_batch(m, key)
+
+    assert (c.dtype == object) == (key > INT64_MAX // 10)
+    assert (decrypt_batch(c, key) == m).all()
+    assert decrypt_sum(sum_encrypted(c), key) == int(m.sum())
+
+
+def test_int64_sum_does_not_overflow():
+    # 암호문이 int64 상한 가까이라 한꺼번에 더하면 넘친다
+    key = INT64_MAX // 11
+    m = np.arange(1000) % 21
+    c = encrypt_batch(m, key)
+
+    assert c.dtype == np.int64
+    assert sum_encrypted(c) == sum(int(v) for v in c)
+    assert decrypt_sum(sum_encrypted(c), key) == int(m.sum())
+
+
+def test_encryption_is_randomized():
+    c = encrypt_batch(np.zeros(1000, dtype=np.int64), 1 << 20, r_max=1 << 30)
+    assert len(np.unique(c)) > 990
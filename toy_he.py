@@ -0,0 +1,122 @@
+import os
+import random
+import time
+
+import numpy as np
+
+# -------------------------------------------------
+# 장난감 동형암호 (3탭) 배치 버전
+#  암호화 C = m + r·K, 복호화 C mod K, 덧셈 동형: Σ C mod K = Σ m (Σ m < K일 때)
+#  - 평문 배열 전체를 한 번의 NumPy 연산으로 암·복호화한다
+#  - r은 os.urandom(운영체제 CSPRNG)에서 한꺼번에 뽑는다 (random.randint 반복 X)
+#  - 암호문이 int64에 들어가면 int64 배열, 넘치면 파이썬 정수(object) 배열로 계산
+#  ※ 교육용 모형일 뿐 안전한 암호가 아니다 (K를 알면 누구나 풀 수 있음)
+# -------------------------------------------------
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def random_r(n: int, r_max: int) -> np.ndarray:
+    """1 ~ r_max 범위의 r을 n개 CSPRNG로 뽑는다 (uint64 난수를 범위로 나눈 나머지, r_max ≪ 2^64라 치우침 무시)."""
+    raw = np.frombuffer(os.urandom(8 * n), dtype=np.uint64)
+    return (raw % np.uint64(r_max)).astype(np.int64) + 1
+
+
+def fits_int64(m_max: int, key: int, r_max: int) -> bool:
+    """가장 큰 암호문 m + r·K가 int64 범위 안인지."""
+    return m_max + r_max * key <= INT64_MAX
+
+
+def encrypt_batch(m, key: int, r_max: int = 10) -> np.ndarray:
+    """평문 배열을 한 번에 암호화한다. int64로 넘치면 파이썬 정수 배열(dtype=object)을 돌려준다."""
+    m = np.asarray(m)
+    r = random_r(len(m), r_max)
+    m_max = int(m.max()) if len(m) else 0
+    if fits_int64(m_max, key, r_max):
+        return m.astype(np.int64) + r * np.int64(key)
+    return m.astype(object) + r.astype(object) * key
+
+
+def decrypt_batch(c, key: int) -> np.ndarray:
+    """암호문 배열을 한 번에 복호화한다 (C mod K)."""
+    c = np.asarray(c)
+    if c.dtype == object:
+        return (c % key).astype(np.int64)
+    return c % np.int64(key)
+
+
+def sum_encrypted(c) -> int:
+    """암호문 컬럼 전체를 더한다 (복호화 없이). 결과는 파이썬 정수.
+
+    int64 배열은 합이 넘치지 않을 만큼씩 잘라 NumPy로 더하고, 조각 합만 파이썬 정수로 모은다.
+    """
+    c = np.asarray(c)
+    if len(c) == 0:
+        return 0
+    if c.dtype == object:
+        return int(np.sum(c))
+    step = max(1, INT64_MAX // max(int(c.max()), 1))
+    return sum(int(c[i : i + step].sum()) for i in range(0, len(c), step))
+
+
+def decrypt_sum(c_sum: int, key: int) -> int:
+    return c_sum % key
+
+
+def benchmark(n: int, key: int | None = None, m_max: int = 20, r_max: int = 10, loop_rows: int = 100_000) -> dict:
+    """n개 평문을 배치로 암호화 → 암호문 합 → 복호화하고, 기존 한 개씩 반복 방식과 시간을 비교한다.
+
+    key를 주지 않으면 평문 합이 넘치지 않도록 n·m_max보다 큰 K를 쓴다.
+    반복 방식은 loop_rows행만 재고 n행으로 환산한다.
+    """
+    key = key or n * m_max + 1
+    m = np.frombuffer(os.urandom(4 * n), dtype=np.uint32) % np.uint32(m_max + 1)
+
+    t0 = time.perf_counter()
+    c = encrypt_batch(m, key, r_max)
+    t_enc = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    c_sum = sum_encrypted(c)
+    t_sum = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    decrypted = decrypt_batch(c, key)
+    t_dec = time.perf_counter() - t0
+
+    # 비교용: 예전 화면처럼 random.randint로 한 개씩 암호화해 더하기
+    loop_n = min(n, loop_rows)
+    plain = m[:loop_n].tolist()
+    t0 = time.perf_counter()
+    loop_sum = 0
+    for v in plain:
+        loop_sum += v + random.randint(1, r_max) * key
+    t_loop = (time.perf_counter() - t0) * n / loop_n
+
+    return {
+        "n": n,
+        "key": key,
+        "int64": c.dtype != object,
+        "plain_sum": int(m.sum(dtype=np.int64)),
+        "encrypted_sum": c_sum,
+        "decrypted_sum": decrypt_sum(c_sum, key),
+        "roundtrip_ok": bool(np.array_equal(decrypted, m)),
+        "seconds": {
+            "암호화": t_enc,
+            "암호문 합": t_sum,
+            "복호화": t_dec,
+            "반복문 암호화+합(환산)": t_loop,
+        },
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="장난감 동형암호 배치 암호화 · 암호문 합 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--key", type=int, help="암호 키 K (생략하면 평문 합보다 큰 값)")
+    args = parser.parse_args()
+
+    for name, value in benchmark(args.rows, args.key).items():
+        print(f"{name}: {value}")